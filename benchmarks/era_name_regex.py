@@ -0,0 +1,51 @@
+"""
+Compare the flat alternation and the prefix-factored trie of era name directives.
+
+    python benchmarks/era_name_regex.py
+"""
+import re
+import sys
+import timeit
+from os import path
+
+sys.path.insert(0, path.dirname(path.dirname(path.abspath(__file__))))
+
+from japanera import parser  # noqa: E402
+
+
+def flat_pattern(names):
+    # what `TimeRE.__seqToRE` builds
+    return "|".join(re.escape(name) for name in sorted(names, key=len, reverse=True))
+
+
+def bench(label, flat, trie, inputs, method, number):
+    flat_time = timeit.timeit(lambda: [getattr(flat, method)(s) for s in inputs], number=number)
+    trie_time = timeit.timeit(lambda: [getattr(trie, method)(s) for s in inputs], number=number)
+    per_call = number * len(inputs)
+    print("{:<32} flat {:>8.3f}us  trie {:>8.3f}us  x{:.2f}".format(
+        label, flat_time / per_call * 1e6, trie_time / per_call * 1e6, flat_time / trie_time))
+
+
+def main():
+    time_re = parser._get_time_re()
+    kanji = list(parser._era_kanji_dict)
+    english = list(parser._era_alphabet_dict)
+    cases = [("-K", kanji, [name + "05年03月07日" for name in kanji]),
+             ("-E", english, [name + " 5/03/07" for name in english]),
+             ("-E", english, [name.upper() + " 5/03/07" for name in english])]
+    for directive, names, inputs in cases:
+        flat = re.compile("(?:%s)" % flat_pattern(names), re.IGNORECASE)
+        trie = re.compile(time_re[directive], re.IGNORECASE)
+        label = "%{} {}".format(directive, "upper" if inputs[0].isupper() else "")
+        bench(label + " match", flat, trie, inputs, "match", 200)
+        misses = ["x" + s for s in inputs]
+        bench(label + " match (miss)", flat, trie, misses, "match", 200)
+
+    text = "本契約は令和5年3月7日に締結され、平成31年4月30日付けの覚書を置き換える。" * 20
+    flat = re.compile(flat_pattern(kanji), re.IGNORECASE)
+    trie = re.compile(time_re["-K"], re.IGNORECASE)
+    bench("%-K free text findall", flat, trie, [text], "findall", 2000)
+
+
+if __name__ == "__main__":
+    main()
@@ -15,8 +15,16 @@
 
 from .__about__ import __version__
 from .japanera import (Era, EraDate, EraDateTime, ERA_DATA_COMMON, ERA_DATA_DAIKAKUJI, ERA_DATA_JIMYOUIN,
-                       ERA_DATA_GENERAL)
+                       ERA_DATA_GENERAL, JST, CompiledFormats, compile_formats)
 from .era_data import (EraType)
+from .parser import (ParseFailure, normalize_date_string, set_max_input_length, get_max_input_length)
+from .bulk import (epoch_seconds_to_wareki, epoch_millis_to_wareki, ordinals_to_wareki, excel_serials_to_wareki)
+from .era_array import (EraDateArray)
+from .day_table import (DayTable)
+from .cursor import (WarekiCursor)
+from .resolver import (Resolver)
+from .ranges import (wareki_range_bounds)
+from .cache import (CacheInfo, enable_parse_cache, disable_parse_cache, parse_cache_info)
 
 __all__ = [
     __version__,
@@ -24,8 +32,28 @@ __all__ = [
     "EraDate",
     "EraDateTime",
     "EraType",
+    "ParseFailure",
+    "normalize_date_string",
+    "set_max_input_length",
+    "get_max_input_length",
+    "EraDateArray",
+    "DayTable",
+    "WarekiCursor",
+    "Resolver",
+    "wareki_range_bounds",
     "ERA_DATA_COMMON",
     "ERA_DATA_DAIKAKUJI",
     "ERA_DATA_JIMYOUIN",
     "ERA_DATA_GENERAL",
+    "JST",
+    "CompiledFormats",
+    "compile_formats",
+    "epoch_seconds_to_wareki",
+    "epoch_millis_to_wareki",
+    "ordinals_to_wareki",
+    "excel_serials_to_wareki",
+    "CacheInfo",
+    "enable_parse_cache",
+    "disable_parse_cache",
+    "parse_cache_info",
 ]
@@ -0,0 +1,135 @@
+"""
+Apache Arrow extension type of `EraDate`.
+
+Importing this module registers `EraDateType`, so Arrow IPC streams and Parquet files written with it are read back
+as `EraDateType` columns by any process which imported this module.
+
+The storage of `EraDateType` is `struct<date: date32, era: int16>`. `era` is a dictionary index into the era table,
+which is serialized in the type metadata together with the type, so readers don't need the same era data version.
+Conversion from and to `EraDateArray` runs on Arrow buffers, without building Python object for each row.
+"""
+import datetime
+import json
+from typing import Iterable, List, Optional, Sequence, Union
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError as e:  # pragma: no cover
+    raise ImportError("japanera.arrow requires pyarrow. Install it with `pip install japanera[arrow]`") from e
+
+from . import era_array
+from .era_array import EraDateArray, _serialize_era, _deserialize_era
+from .japanera import (Era, EraDate, ERA_DATA_COMMON, ERA_DATA_GENERAL, ERA_DATA_DAIKAKUJI, ERA_DATA_JIMYOUIN)
+
+EXTENSION_NAME = "japanera.era_date"
+
+_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+_STORAGE_TYPE = pa.struct([("date", pa.date32()), ("era", pa.int16())])
+
+
+class EraDateScalar(pa.ExtensionScalar):
+    def as_py(self, **kwargs) -> Optional[EraDate]:
+        if not self.is_valid:
+            return None
+        date = self.value["date"].as_py()
+        return EraDate._from_trusted(date.year, date.month, date.day, self.type.eras[self.value["era"].as_py()])
+
+
+class EraDateType(pa.ExtensionType):
+    def __init__(self, eras: Optional[Sequence[Era]] = None):
+        """
+        Args:
+            eras: era table which `era` of storage indexes into.
+                All of `ERA_DATA_COMMON`, `ERA_DATA_GENERAL`, `ERA_DATA_DAIKAKUJI` and `ERA_DATA_JIMYOUIN` by default
+        """
+        if eras is None:
+            eras = ERA_DATA_COMMON + ERA_DATA_GENERAL + ERA_DATA_DAIKAKUJI + ERA_DATA_JIMYOUIN
+        self.eras: List[Era] = list(eras)
+        self._era_index = {era: i for i, era in enumerate(self.eras)}
+        super().__init__(_STORAGE_TYPE, EXTENSION_NAME)
+
+    def __arrow_ext_serialize__(self) -> bytes:
+        return json.dumps([_serialize_era(era) for era in self.eras], ensure_ascii=False).encode()
+
+    @classmethod
+    def __arrow_ext_deserialize__(cls, storage_type, serialized: bytes) -> "EraDateType":
+        return cls([_deserialize_era(values) for values in json.loads(serialized.decode())])
+
+    def __arrow_ext_scalar_class__(self):
+        return EraDateScalar
+
+    def __reduce__(self):
+        return type(self), (self.eras,)
+
+
+pa.register_extension_type(EraDateType())
+
+
+def to_arrow(era_dates: Union[EraDateArray, Iterable[EraDate]],
+             era_date_type: Optional[EraDateType] = None) -> pa.ExtensionArray:
+    """
+    Convert `EraDateArray`, or `EraDate`s, into Arrow array of `EraDateType`.
+    Ordinals are handed to Arrow without copying, and shifted and cast by Arrow compute functions.
+    Args:
+        era_dates: dates to convert
+        era_date_type: `EraDateType` whose era table has all eras of `era_dates`. `EraDateType()` by default
+
+    Returns: `pyarrow.ExtensionArray` of `era_date_type`
+    """
+    if not isinstance(era_dates, EraDateArray):
+        era_dates = EraDateArray(era_dates)
+    if era_date_type is None:
+        era_date_type = EraDateType()
+    length = len(era_dates)
+
+    ordinals = pa.Array.from_buffers(pa.int32(), length, [None, pa.py_buffer(era_dates._ordinals)])
+    dates = pc.subtract(ordinals, pa.scalar(_EPOCH_ORDINAL, pa.int32())).cast(pa.date32())
+
+    # era ids of `EraDateArray` are local to the process, so map them to the indices of the era table
+    used_ids = set(era_dates._era_ids)
+    table = [-1] * (max(used_ids) + 1 if used_ids else 0)
+    for era_id in used_ids:
+        era = era_array._eras[era_id]
+        if era not in era_date_type._era_index:
+            raise ValueError("{!r} is not in the era table".format(era))
+        table[era_id] = era_date_type._era_index[era]
+    era_ids = pa.Array.from_buffers(pa.uint16(), length, [None, pa.py_buffer(era_dates._era_ids)])
+    eras = pc.take(pa.array(table, pa.int16()), era_ids)
+
+    storage = pa.StructArray.from_arrays([dates, eras], fields=list(_STORAGE_TYPE))
+    return pa.ExtensionArray.from_storage(era_date_type, storage)
+
+
+def from_arrow(array_: Union[pa.ExtensionArray, pa.ChunkedArray]) -> EraDateArray:
+    """
+    Convert Arrow array of `EraDateType` into `EraDateArray`. Nulls are not allowed.
+    Args:
+        array_: `pyarrow.ExtensionArray` or `pyarrow.ChunkedArray` of `EraDateType`
+
+    Returns: `EraDateArray`
+    """
+    if not isinstance(array_.type, EraDateType):
+        raise TypeError("array of EraDateType is expected, not {}".format(array_.type))
+    if array_.null_count:
+        raise ValueError("EraDateArray can't have null")
+    storage = array_.storage if isinstance(array_, pa.ExtensionArray) else \
+        pa.chunked_array([chunk.storage for chunk in array_.chunks], _STORAGE_TYPE)
+
+    dates = pc.struct_field(storage, "date").cast(pa.int32())
+    ordinals = pc.add(dates, pa.scalar(_EPOCH_ORDINAL, pa.int32()))
+
+    table = pa.array([era_array._era_id(era) for era in array_.type.eras], pa.uint16())
+    era_ids = pc.take(table, pc.struct_field(storage, "era"))
+
+    result = EraDateArray()
+    for chunk in (ordinals.chunks if isinstance(ordinals, pa.ChunkedArray) else [ordinals]):
+        result._ordinals.frombytes(_values_buffer(chunk))
+    for chunk in (era_ids.chunks if isinstance(era_ids, pa.ChunkedArray) else [era_ids]):
+        result._era_ids.frombytes(_values_buffer(chunk))
+    return result
+
+
+def _values_buffer(chunk: pa.Array) -> memoryview:
+    item_size = chunk.type.bit_width // 8
+    return memoryview(chunk.buffers()[1])[chunk.offset * item_size:(chunk.offset + len(chunk)) * item_size]
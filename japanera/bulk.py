@@ -0,0 +1,148 @@
+"""
+Bulk conversion into era fields.
+
+Every function here returns a list of `(era, relative_year, month, day)` tuples, one for each input,
+resolved against the precomputed era interval index without building `EraDate` objects.
+The era is the one `EraDate.from_date` picks.
+"""
+import datetime
+from bisect import bisect_right
+from typing import Iterable, List, Tuple, Union
+
+from . import parser
+from .japanera import Era, JST
+
+EraFields = Tuple[Era, int, int, int]
+
+JST_OFFSET = int(JST.utcoffset(None).total_seconds())
+
+_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+_SECONDS_PER_DAY = 24 * 60 * 60
+_MILLISECONDS_PER_DAY = _SECONDS_PER_DAY * 1000
+
+# Excel's 1900 date system counts 1900-01-01 as 1 and has the nonexistent 1900-02-29 as 60
+_EXCEL_1900_BASE_ORDINAL = datetime.date(1899, 12, 31).toordinal()
+_EXCEL_1900_LEAP_BUG_SERIAL = 60
+_EXCEL_1904_BASE_ORDINAL = datetime.date(1904, 1, 1).toordinal()
+_MAX_ORDINAL = datetime.date.max.toordinal()
+
+
+def _month_days(leap: bool) -> List[Tuple[int, int]]:
+    """(month, day) of each day of a year, indexed by days since new year's day."""
+    year = 2000 if leap else 2001
+    return [(day.month, day.day) for day in
+            (datetime.date(year, 1, 1) + datetime.timedelta(days) for days in range(366 if leap else 365))]
+
+
+_MONTH_DAYS = (_month_days(False), _month_days(True))
+
+
+# ordinal of new year's day of each year, and of the day after the last day at the end
+_YEAR_STARTS = [0] + [datetime.date(year, 1, 1).toordinal() for year in range(1, datetime.MAXYEAR + 1)] + \
+               [_MAX_ORDINAL + 1]
+
+
+def _ordinals_to_fields(ordinals: Iterable[int]) -> List[EraFields]:
+    """
+    Year, month and day are derived from the ordinal with a table of days of the year, without `datetime.date`.
+    """
+    starts, era_tuples = parser._era_index_starts, parser._era_index_eras
+    year_starts = _YEAR_STARTS
+    result = []
+    append = result.append
+
+    # sorted or repetitive inputs stay in the same day, year or interval, so remember the last ones
+    last_ordinal = fields = None
+    lower = upper = 0
+    year_start = year_end = 0  # [year_start, year_end) is the last year, and year_start is its new year's day
+    year = 0
+    month_days = _MONTH_DAYS[0]
+    era = None
+    since_year = 0
+    for ordinal in ordinals:
+        if ordinal != last_ordinal:
+            if not year_start <= ordinal < year_end:
+                if not 0 < ordinal <= _MAX_ORDINAL:
+                    raise ValueError("ordinal must be in 1..%d, not %r" % (_MAX_ORDINAL, ordinal))
+                # 400 years are 146097 days, so this is off by at most one year
+                year = (ordinal - 1) * 400 // 146097 + 1
+                if year_starts[year] > ordinal:
+                    year -= 1
+                elif year_starts[year + 1] <= ordinal:
+                    year += 1
+                year_start, year_end = year_starts[year], year_starts[year + 1]
+                month_days = _MONTH_DAYS[year_end - year_start == 366]
+            month, day = month_days[ordinal - year_start]
+            if not lower <= ordinal < upper:
+                index = bisect_right(starts, ordinal) - 1
+                lower = starts[index]
+                upper = starts[index + 1] if index + 1 < len(starts) else _MAX_ORDINAL + 1
+                era = era_tuples[index][-1]
+                since_year = era.since.year
+            fields = (era, year - since_year + 1, month, day)
+            last_ordinal = ordinal
+        append(fields)
+    return result
+
+
+def epoch_seconds_to_wareki(seconds: Iterable[float], utc_offset: int = JST_OFFSET) -> List[EraFields]:
+    """
+    Convert POSIX timestamps in seconds into era fields of the date at `utc_offset`.
+    Args:
+        seconds: POSIX timestamps in seconds
+        utc_offset: offset from UTC in seconds of the calendar used to resolve the date. JST(+09:00) by default
+
+    Returns: list of (era, relative_year, month, day)
+    """
+    return _ordinals_to_fields(int((second + utc_offset) // _SECONDS_PER_DAY) + _EPOCH_ORDINAL
+                               for second in seconds)
+
+
+def epoch_millis_to_wareki(millis: Iterable[int], utc_offset: int = JST_OFFSET) -> List[EraFields]:
+    """
+    Convert POSIX timestamps in milliseconds into era fields of the date at `utc_offset`.
+    Args:
+        millis: POSIX timestamps in milliseconds
+        utc_offset: offset from UTC in seconds of the calendar used to resolve the date. JST(+09:00) by default
+
+    Returns: list of (era, relative_year, month, day)
+    """
+    offset = utc_offset * 1000
+    return _ordinals_to_fields(int((milli + offset) // _MILLISECONDS_PER_DAY) + _EPOCH_ORDINAL
+                               for milli in millis)
+
+
+def ordinals_to_wareki(ordinals: Iterable[int]) -> List[EraFields]:
+    """
+    Convert proleptic Gregorian ordinals, same as `datetime.date.toordinal()`, into era fields.
+    Args:
+        ordinals: ordinals of dates
+
+    Returns: list of (era, relative_year, month, day)
+    """
+    return _ordinals_to_fields(ordinals)
+
+
+def _excel_serial_to_ordinal(serial: Union[int, float], date1904: bool) -> int:
+    day = int(serial // 1)  # time of day is in the fraction
+    if date1904:
+        return _EXCEL_1904_BASE_ORDINAL + day
+    if day < 1 or day == _EXCEL_1900_LEAP_BUG_SERIAL:
+        raise ValueError("Excel serial %r is not a date" % serial)
+    if day > _EXCEL_1900_LEAP_BUG_SERIAL:
+        day -= 1
+    return _EXCEL_1900_BASE_ORDINAL + day
+
+
+def excel_serials_to_wareki(serials: Iterable[Union[int, float]], date1904: bool = False) -> List[EraFields]:
+    """
+    Convert Excel serial day numbers into era fields. Fraction of serial, time of the day, is ignored.
+    Args:
+        serials: Excel serial day numbers
+        date1904: If True, serials are in the 1904 date system, which counts 1904-01-01 as 0.
+            Otherwise in the default 1900 date system, which counts 1900-01-01 as 1 and the nonexistent
+            1900-02-29 as 60. Serial 60 and serials before 1 raise ValueError.
+
+    Returns: list of (era, relative_year, month, day)
+    """
+    return _ordinals_to_fields(_excel_serial_to_ordinal(serial, date1904) for serial in serials)
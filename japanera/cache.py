@@ -0,0 +1,109 @@
+"""
+Opt-in memo caches.
+
+Caches are off by default. Every cache here depends on era data, so `japanera.parser._set_era_data` clears all of them,
+and memo caches of other modules registered with `register_clear`.
+"""
+import threading
+from collections import OrderedDict, namedtuple
+from typing import Any, Callable, Hashable, List, Optional
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "evictions", "maxsize", "currsize"])
+
+# resolved result of parsing a date string.
+# candidates: tuple of (era, ordinal) in the order `strptime` returns
+# time: (hour, minute, second, microsecond, tzinfo)
+ParseResult = namedtuple("ParseResult", ["candidates", "time"])
+
+
+class LRUCache:
+    """
+    Bounded mapping which evicts the least recently used entry, and counts hits, misses and evictions.
+    """
+
+    def __init__(self, maxsize: int):
+        if maxsize < 1:
+            raise ValueError("maxsize must be positive, not {}".format(maxsize))
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop all entries. Statistics are kept."""
+        with self._lock:
+            self._data.clear()
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self._data))
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# (date_string, format, allow_date_after_end_of_era, prefer) -> ParseResult. Used by `strptime` and `iter_strptime`
+_parse_cache: Optional[LRUCache] = None
+
+
+def enable_parse_cache(maxsize: int = 4096):
+    """
+    Memoize resolved results of `EraDate.strptime`, `EraDateTime.strptime` and their `iter_strptime`,
+    keyed on the date string, format and options. Calling it again replaces the cache with new empty one.
+    While it is enabled, all candidates are resolved at the first parse of each key, even with `limit`.
+    Args:
+        maxsize: max number of results to keep
+    """
+    global _parse_cache
+    _parse_cache = LRUCache(maxsize)
+
+
+def disable_parse_cache():
+    global _parse_cache
+    _parse_cache = None
+
+
+def parse_cache_info() -> Optional[CacheInfo]:
+    """
+    Returns: statistics of the parse cache, or None if it is not enabled
+    """
+    return _parse_cache.info() if _parse_cache is not None else None
+
+
+# `cache_clear` of memo caches outside this module, such as `functools.lru_cache` of `japanera.sqlite`
+_registered_clears: List[Callable[[], None]] = []
+
+
+def register_clear(clear: Callable[[], None]):
+    """
+    Register a function which drops entries of a memo cache depending on era data, so `clear_caches` calls it too.
+    Args:
+        clear: function without arguments, such as `cache_clear` of `functools.lru_cache`
+    """
+    _registered_clears.append(clear)
+
+
+def clear_caches():
+    """Drop entries of all caches. Called whenever era data is set."""
+    if _parse_cache is not None:
+        _parse_cache.clear()
+    for clear in _registered_clears:
+        clear()
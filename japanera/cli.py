@@ -0,0 +1,184 @@
+"""
+Command line interface.
+
+    python -m japanera convert [-h] -c COLUMN [-c COLUMN ...] -f FROM_FORMAT -t TO_FORMAT [options] [input]
+
+`convert` streams CSV/TSV, and rewrites the named columns from `FROM_FORMAT` into `TO_FORMAT`.
+Either of them can be wareki or Gregorian format, so it converts in both direction::
+
+    python -m japanera convert -c birthday -f "%Y-%m-%d" -t "%-K%-y年%m月%d日" people.csv
+    python -m japanera convert -c 生年月日 -f "%-K%-y年%m月%d日" -t "%Y-%m-%d" --encoding cp932 people.csv
+
+Rows are read and converted in chunks, so memory usage doesn't depend on the size of input.
+"""
+import argparse
+import csv
+import io
+import sys
+import time
+from collections import deque
+from itertools import islice
+from typing import List, Optional, Sequence, Tuple
+
+from . import cache
+from .era_data import EraType
+from .japanera import EraDateTime
+
+_PREFER_CHOICES = {"latest": "latest", "earliest": None, **{era_type.value: era_type for era_type in EraType}}
+
+
+def _convert_value(value: str, from_format: str, to_format: str, prefer) -> str:
+    return EraDateTime.strptime(value, from_format, prefer=prefer, limit=1)[0].strftime(to_format)
+
+
+def _convert_chunk(task) -> Tuple[List[List[str]], int, Optional[str]]:
+    """
+    Convert columns of rows in a chunk. Runs in worker processes too, so everything it needs is in `task`.
+    Returns: converted rows, number of errors and the message of the first error.
+        With `errors="strict"`, only the rows before the first error
+    """
+    rows, column_indices, from_format, to_format, prefer, errors = task
+    if cache._parse_cache is None:
+        # input of this kind is very repetitive, such as birth dates and contract dates
+        cache.enable_parse_cache()
+    error_count = 0
+    first_error = None
+    for position, (line, row) in enumerate(rows):
+        for index in column_indices:
+            if index >= len(row) or row[index] == "":
+                continue
+            try:
+                row[index] = _convert_value(row[index], from_format, to_format, prefer)
+            except ValueError as e:
+                error_count += 1
+                if first_error is None:
+                    first_error = "line {}: {!r}: {}".format(line, row[index], e)
+                if errors == "strict":
+                    return [row for _, row in rows[:position]], error_count, first_error
+                if errors == "blank":
+                    row[index] = ""
+    return [row for _, row in rows], error_count, first_error
+
+
+def _chunks(reader, size: int):
+    rows = enumerate(reader, start=reader.line_num + 1)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _convert(args, input_file, output_file, error_file) -> int:
+    delimiter = "\t" if args.tsv else args.delimiter
+    reader = csv.reader(input_file, delimiter=delimiter)
+    writer = csv.writer(output_file, delimiter=delimiter, lineterminator="\n")
+
+    header = next(reader, None)
+    if header is None:
+        return 0
+    missing = [column for column in args.column if column not in header]
+    if missing:
+        print("column not found: {}".format(", ".join(missing)), file=error_file)
+        return 2
+    writer.writerow(header)
+    column_indices = [header.index(column) for column in args.column]
+    prefer = _PREFER_CHOICES[args.prefer]
+
+    started = time.perf_counter()
+    row_count = error_count = 0
+    first_error = None
+    tasks = ((chunk, column_indices, args.from_format, args.to_format, prefer, args.errors)
+             for chunk in _chunks(reader, args.chunk_size))
+
+    def write(result) -> bool:
+        nonlocal row_count, error_count, first_error
+        rows, errors, error = result
+        writer.writerows(rows)
+        row_count += len(rows)
+        error_count += errors
+        first_error = first_error or error
+        return not (errors and args.errors == "strict")
+
+    if args.workers > 1:
+        import multiprocessing
+        with multiprocessing.Pool(args.workers) as pool:
+            # keep only a few chunks in flight, so memory usage stays constant and output keeps the order of input
+            pending = deque()
+            for task in tasks:
+                pending.append(pool.apply_async(_convert_chunk, (task,)))
+                if len(pending) >= args.workers * 2 and not write(pending.popleft().get()):
+                    break
+            else:
+                while pending and write(pending.popleft().get()):
+                    pass
+    else:
+        for task in tasks:
+            if not write(_convert_chunk(task)):
+                break
+
+    elapsed = time.perf_counter() - started
+    if first_error:
+        print("first error at {}".format(first_error), file=error_file)
+    print("rows: {}, errors: {}, elapsed: {:.3f}s, throughput: {:.0f} rows/s".format(
+        row_count, error_count, elapsed, row_count / elapsed if elapsed else 0), file=error_file)
+    return 1 if error_count and args.errors == "strict" else 0
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m japanera", description="Easy japanese era tool")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    convert = subparsers.add_parser("convert", help="convert date columns of CSV/TSV between Gregorian and wareki",
+                                    description="Convert date columns of CSV/TSV between Gregorian and wareki. "
+                                                "Formats are the ones of `EraDate.strptime` and `EraDate.strftime`.")
+    convert.add_argument("input", nargs="?", default="-", help="input file. stdin if omitted or -")
+    convert.add_argument("-o", "--output", default="-", help="output file. stdout if omitted or -")
+    convert.add_argument("-c", "--column", action="append", required=True,
+                         help="name of column to convert. Can be given more than once")
+    convert.add_argument("-f", "--from-format", required=True, help="format of values in input")
+    convert.add_argument("-t", "--to-format", required=True, help="format of values in output")
+    convert.add_argument("-d", "--delimiter", default=",", help="field delimiter. ',' by default")
+    convert.add_argument("--tsv", action="store_true", help="same as --delimiter '\\t'")
+    convert.add_argument("--encoding", default="utf-8", help="encoding of input and output. utf-8 by default")
+    convert.add_argument("--prefer", choices=list(_PREFER_CHOICES), default="latest",
+                         help="which era to take when a value has several candidates. "
+                              "'latest' by default, which is the era `EraDate.from_date` picks")
+    convert.add_argument("--errors", choices=["keep", "blank", "strict"], default="keep",
+                         help="what to do with values not converted: keep them as they are (default), "
+                              "make them blank, or stop")
+    convert.add_argument("--chunk-size", type=int, default=10000, help="number of rows converted at once")
+    convert.add_argument("-j", "--workers", type=int, default=1, help="number of worker processes")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = _build_parser().parse_args(argv)
+    if args.chunk_size < 1 or args.workers < 1:
+        print("--chunk-size and --workers must be positive", file=sys.stderr)
+        return 2
+
+    if args.input == "-":
+        input_file = io.TextIOWrapper(sys.stdin.buffer, encoding=args.encoding, newline="")
+    else:
+        input_file = open(args.input, encoding=args.encoding, newline="")
+    if args.output == "-":
+        output_file = io.TextIOWrapper(sys.stdout.buffer, encoding=args.encoding, newline="", write_through=True)
+    else:
+        output_file = open(args.output, "w", encoding=args.encoding, newline="")
+    parse_cache_enabled = cache._parse_cache is not None
+    try:
+        return _convert(args, input_file, output_file, sys.stderr)
+    finally:
+        if not parse_cache_enabled:
+            cache.disable_parse_cache()
+        # detach the wrappers of stdin and stdout instead of closing them
+        if args.input == "-":
+            input_file.detach()
+        else:
+            input_file.close()
+        if args.output == "-":
+            output_file.flush()
+            output_file.detach()
+        else:
+            output_file.close()
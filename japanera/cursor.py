@@ -0,0 +1,100 @@
+"""
+Sequential conversion of time-ordered dates.
+
+Consecutive dates of a time-ordered stream nearly always fall in the same interval of the era interval index,
+the span in which the same eras, one for each court during the Nanboku-chō period, are in effect.
+`WarekiCursor` remembers the last interval, and resolves each next date with two integer comparisons::
+
+    cursor = WarekiCursor()
+    for event in events:  # sorted by time
+        era_date = cursor.from_date(event.date)  # same as EraDate.from_date(event.date)
+
+The index is bisected only when a date crosses a boundary of the interval, so unordered dates are converted
+correctly too, just without the speedup.
+The interval is taken from the era data when the cursor crossed into it, same as `DayTable`.
+"""
+import datetime
+from bisect import bisect_right
+from typing import List, Tuple
+
+from . import parser
+from .japanera import Era, EraDate, EraDateTime, JST
+
+_MAX_ORDINAL = datetime.date.max.toordinal()
+
+
+class WarekiCursor:
+    def __init__(self):
+        # the last interval [_lower, _upper) of the index, and the eras of it
+        self._lower = self._upper = 0
+        self._eras = ()
+        self.seeks = 0
+
+    def __repr__(self):
+        return "WarekiCursor(seeks={!r})".format(self.seeks)
+
+    def _seek(self, ordinal: int) -> Tuple[Era, ...]:
+        starts = parser._era_index_starts
+        index = bisect_right(starts, ordinal) - 1
+        eras = parser._era_index_eras[index]
+        if not eras:
+            raise ValueError("Era not found")  # Maybe this can't be happened because of Common Era
+        self._lower = starts[index]
+        self._upper = starts[index + 1] if index + 1 < len(starts) else _MAX_ORDINAL + 1
+        self._eras = eras
+        self.seeks += 1
+        return eras
+
+    def eras_of_ordinal(self, ordinal: int) -> Tuple[Era, ...]:
+        """
+        Same as `japanera.parser.find_eras_with_ordinal(ordinal)`.
+        Returns: tuple of Era that contains the day of `ordinal`. The last one is the era `EraDate` picks
+        """
+        if self._lower <= ordinal < self._upper:
+            return self._eras
+        return self._seek(ordinal)
+
+    def lookup(self, date: datetime.date) -> Tuple[Era, int]:
+        """
+        Returns: era and relative year of `date`, same as `EraDate.from_date(date)`
+        """
+        ordinal = date.toordinal()
+        eras = self._eras if self._lower <= ordinal < self._upper else self._seek(ordinal)
+        era = eras[-1]
+        return era, date.year - era.since.year + 1
+
+    def from_date(self, dt: datetime.date) -> EraDate:
+        """
+        Same as `EraDate.from_date(dt)`.
+        """
+        ordinal = dt.toordinal()
+        eras = self._eras if self._lower <= ordinal < self._upper else self._seek(ordinal)
+        return EraDate._from_trusted(dt.year, dt.month, dt.day, eras[-1])
+
+    def from_ordinal(self, ordinal: int) -> EraDate:
+        """
+        Same as `EraDate.from_ordinal(ordinal)`.
+        """
+        eras = self._eras if self._lower <= ordinal < self._upper else self._seek(ordinal)
+        dt = datetime.date.fromordinal(ordinal)
+        return EraDate._from_trusted(dt.year, dt.month, dt.day, eras[-1])
+
+    def list_from_date(self, dt: datetime.date) -> List[EraDate]:
+        """
+        Same as `EraDate.list_from_date(dt)`.
+        """
+        ordinal = dt.toordinal()
+        eras = self._eras if self._lower <= ordinal < self._upper else self._seek(ordinal)
+        year, month, day = dt.year, dt.month, dt.day
+        return [EraDate._from_trusted(year, month, day, era) for era in eras]
+
+    def from_datetime(self, dtt: datetime.datetime, in_jst: bool = False) -> EraDateTime:
+        """
+        Same as `EraDateTime.from_datetime(dtt, in_jst=in_jst)`.
+        """
+        if in_jst and dtt.utcoffset() is not None:
+            dtt = dtt.astimezone(JST)
+        ordinal = dtt.toordinal()
+        eras = self._eras if self._lower <= ordinal < self._upper else self._seek(ordinal)
+        return EraDateTime._from_trusted(dtt.year, dtt.month, dtt.day, eras[-1], dtt.hour, dtt.minute, dtt.second,
+                                         dtt.microsecond, dtt.tzinfo, dtt.fold)
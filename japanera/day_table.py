@@ -0,0 +1,204 @@
+"""
+Dense table of `(era, relative_year)` for every day of a range.
+
+The table is built from the era data once, saved as a file, and memory-mapped by every process using it.
+So worker processes of a pre-fork server share one physical copy of it, and resolve a date with one array index::
+
+    # in the master process, or in a build step
+    DayTable.build().save("/var/cache/japanera/days.bin")
+
+    # in each worker
+    table = DayTable.load("/var/cache/japanera/days.bin")
+    table.lookup(datetime.date(2019, 5, 1))  # (Era('令和', ...), 1)
+
+Each day takes 4 bytes, era id and relative year as two unsigned 16 bit integers,
+so the default range from 645-07-20 to 2200-12-31 takes about 2MB.
+Eras in the table are the ones `EraDate.from_date` picks, and dates out of the range are resolved as usual.
+"""
+import datetime
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_right
+from typing import List, Optional, Tuple
+
+from . import parser
+from .era_array import _serialize_era, _deserialize_era
+from .japanera import Era, EraDate, ERA_DATA_GENERAL
+
+_MAGIC = b"JPNRDAY1"
+# magic, length of JSON header
+_PREAMBLE = struct.Struct("<8sI")
+_ALIGNMENT = 8
+_TEMPORARY_PREFIX = ".japanera-days-"
+
+DEFAULT_UNTIL = datetime.date(2200, 12, 31)
+
+
+def _create_temporary(directory: str) -> Tuple[int, str]:
+    """
+    Create a new file in `directory` to be renamed to the table.
+    Unlike `tempfile.mkstemp`, whose files are readable only by the owner, the file gets the mode `open` gives,
+    as the kernel applies the umask to it.
+    Returns: file descriptor opened for writing and path of the file
+    """
+    flags = os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, "O_BINARY", 0)
+    while True:
+        temporary = os.path.join(directory, _TEMPORARY_PREFIX + os.urandom(8).hex())
+        try:
+            fd = os.open(temporary, flags, 0o666)
+        except FileExistsError:
+            continue
+        return fd, temporary
+
+
+class DayTable:
+    def __init__(self, first_ordinal: int, eras: List[Era], values: memoryview, mapped: Optional[mmap.mmap] = None):
+        """
+        Use `DayTable.build` or `DayTable.load` instead.
+        Args:
+            first_ordinal: ordinal of the first day of the table
+            eras: era table, which era ids index into
+            values: era id and relative year of each day, alternately
+            mapped: mmap which `values` is a view of
+        """
+        self.first_ordinal = first_ordinal
+        self.eras = eras
+        self._values = values
+        self._mapped = mapped
+        self.days = len(values) // 2
+
+    @property
+    def since(self) -> datetime.date:
+        return datetime.date.fromordinal(self.first_ordinal)
+
+    @property
+    def until(self) -> datetime.date:
+        return datetime.date.fromordinal(self.first_ordinal + self.days - 1)
+
+    @classmethod
+    def build(cls, until: datetime.date = DEFAULT_UNTIL, since: Optional[datetime.date] = None) -> "DayTable":
+        """
+        Build the table in memory from the current era data.
+        Args:
+            until: last day of the table. 2200-12-31 by default
+            since: first day of the table.
+                The first day of the first era of `ERA_DATA_GENERAL`, 645-07-20, by default
+        """
+        if since is None:
+            since = ERA_DATA_GENERAL[0].since
+        first_ordinal, last_ordinal = since.toordinal(), until.toordinal()
+        if first_ordinal > last_ordinal:
+            raise ValueError("since must not be after until")
+
+        eras = []
+        era_ids = {}
+        values = array('H')
+        starts, era_tuples = parser._era_index_starts, parser._era_index_eras
+        ordinal = first_ordinal
+        while ordinal <= last_ordinal:
+            index = bisect_right(starts, ordinal) - 1
+            era = era_tuples[index][-1]
+            if era not in era_ids:
+                era_ids[era] = len(eras)
+                eras.append(era)
+            interval_end = min(starts[index + 1] if index + 1 < len(starts) else last_ordinal + 1, last_ordinal + 1)
+            # relative year changes only on new year's day, so fill the days of the same year at once
+            while ordinal < interval_end:
+                year = datetime.date.fromordinal(ordinal).year
+                next_year = datetime.date(year + 1, 1, 1).toordinal() if year < datetime.MAXYEAR else interval_end
+                year_end = min(next_year, interval_end)
+                values.extend([era_ids[era], year - era.since.year + 1] * (year_end - ordinal))
+                ordinal = year_end
+        return cls(first_ordinal, eras, memoryview(values))
+
+    def save(self, path: str):
+        """
+        Save the table to `path`. The file is replaced atomically, so processes can load it while it is written.
+        The file is readable by other users as far as umask allows, same as files created with `open`.
+        """
+        header = json.dumps({"first_ordinal": self.first_ordinal, "days": self.days, "byteorder": sys.byteorder,
+                             "eras": [_serialize_era(era) for era in self.eras]}, ensure_ascii=False).encode()
+        padding = -(_PREAMBLE.size + len(header)) % _ALIGNMENT
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temporary = _create_temporary(directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(_PREAMBLE.pack(_MAGIC, len(header) + padding))
+                f.write(header + b" " * padding)
+                f.write(self._values)
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> "DayTable":
+        """
+        Memory-map the table saved at `path`. Pages are shared with every other process mapping the same file.
+        """
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            try:
+                magic, header_length = _PREAMBLE.unpack_from(mapped)
+            except struct.error:
+                raise ValueError("{} is truncated or corrupted, shorter than the header".format(path)) from None
+            if magic != _MAGIC:
+                raise ValueError("{} is not a day table of japanera".format(path))
+            header = json.loads(mapped[_PREAMBLE.size:_PREAMBLE.size + header_length].decode())
+            if header["byteorder"] != sys.byteorder:
+                raise ValueError("{} is built on {} endian machine".format(path, header["byteorder"]))
+            offset = _PREAMBLE.size + header_length
+            if len(mapped) != offset + header["days"] * 4:
+                raise ValueError("{} is truncated or corrupted, {} bytes of {} days expected".format(
+                    path, offset + header["days"] * 4, header["days"]))
+            values = memoryview(mapped)[offset:offset + header["days"] * 4].cast("H")
+        except BaseException:
+            mapped.close()
+            raise
+        return cls(header["first_ordinal"], [_deserialize_era(era) for era in header["eras"]], values, mapped)
+
+    def close(self):
+        """Release the mapping. The table can't be used after this."""
+        self._values.release()
+        if self._mapped is not None:
+            self._mapped.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.days
+
+    def __repr__(self):
+        return "DayTable(since={!r}, until={!r})".format(self.since, self.until)
+
+    def lookup_ordinal(self, ordinal: int) -> Tuple[Era, int]:
+        """
+        Returns: era and relative year of the day of proleptic Gregorian `ordinal`
+        """
+        index = ordinal - self.first_ordinal
+        if 0 <= index < self.days:
+            return self.eras[self._values[2 * index]], self._values[2 * index + 1]
+        era = parser.find_eras_with_ordinal(ordinal)[-1]
+        return era, datetime.date.fromordinal(ordinal).year - era.since.year + 1
+
+    def lookup(self, date: datetime.date) -> Tuple[Era, int]:
+        """
+        Returns: era and relative year of `date`, same as `EraDate.from_date(date)`
+        """
+        return self.lookup_ordinal(date.toordinal())
+
+    def era_date(self, date: datetime.date) -> EraDate:
+        """
+        Same as `EraDate.from_date(date)`, but the era is taken from the table.
+        """
+        era, relative_year = self.lookup_ordinal(date.toordinal())
+        return EraDate._from_trusted(date.year, date.month, date.day, era)
@@ -0,0 +1,193 @@
+"""
+Columnar container of many `EraDate`.
+
+`EraDateArray` keeps dates as two parallel compact arrays, ordinals in `array('i')` and era ids in `array('H')`,
+instead of a list of `EraDate` objects. `EraDate` is built only when an element is accessed.
+"""
+import datetime
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from . import parser
+from .era_data import EraType
+from .japanera import Era, EraDate
+
+# eras get ids in order of first use, and keep them while the process lives
+_eras: List[Era] = []
+_era_ids: Dict[Era, int] = {}
+
+_index_source = None
+_index_era_ids: List[int] = []
+
+
+def _era_id(era: Era) -> int:
+    era_id = _era_ids.get(era)
+    if era_id is None:
+        era_id = _era_ids[era] = len(_eras)
+        _eras.append(era)
+    return era_id
+
+
+def _serialize_era(era: Era) -> list:
+    """JSON-serializable form of `era`, to store era tables in files"""
+    return [era._kanji, era._english, era.since.isoformat(), era.until.isoformat() if era.until else None,
+            era.era_type.value]
+
+
+def _deserialize_era(values: list) -> Era:
+    kanji, english, since, until, era_type = values
+    return Era(kanji, english, datetime.date.fromisoformat(since),
+               datetime.date.fromisoformat(until) if until else None, EraType(era_type))
+
+
+def _get_index_era_ids() -> List[int]:
+    """era ids of the primary era of each interval of the era interval index"""
+    global _index_source, _index_era_ids
+    if _index_source is not parser._era_index_starts:
+        _index_era_ids = [_era_id(eras[-1]) for eras in parser._era_index_eras]
+        _index_source = parser._era_index_starts
+    return _index_era_ids
+
+
+class EraDateArray:
+    def __init__(self, era_dates: Iterable[EraDate] = ()):
+        self._ordinals = array('i')
+        self._era_ids = array('H')
+        self.extend(era_dates)
+
+    @classmethod
+    def _from_arrays(cls, ordinals: array, era_ids: array) -> "EraDateArray":
+        self = cls.__new__(cls)
+        self._ordinals = ordinals
+        self._era_ids = era_ids
+        return self
+
+    @classmethod
+    def from_ordinals(cls, ordinals: Iterable[int]) -> "EraDateArray":
+        """
+        Build from proleptic Gregorian ordinals. Each era is the one `EraDate.from_ordinal` picks.
+        """
+        starts, index_era_ids = parser._era_index_starts, _get_index_era_ids()
+        ordinal_array = array('i', ordinals)
+        era_ids = array('H')
+        append = era_ids.append
+        lower = upper = 0
+        era_id = 0
+        for ordinal in ordinal_array:
+            if not lower <= ordinal < upper:
+                if not 1 <= ordinal <= datetime.date.max.toordinal():
+                    raise ValueError("ordinal must be in 1..{}, not {}".format(datetime.date.max.toordinal(),
+                                                                              ordinal))
+                index = bisect_right(starts, ordinal) - 1
+                lower = starts[index]
+                upper = starts[index + 1] if index + 1 < len(starts) else datetime.date.max.toordinal() + 1
+                era_id = index_era_ids[index]
+            append(era_id)
+        return cls._from_arrays(ordinal_array, era_ids)
+
+    @classmethod
+    def from_dates(cls, dates: Iterable[datetime.date]) -> "EraDateArray":
+        """
+        Build from dates. Each era is the one `EraDate.from_date` picks.
+        """
+        return cls.from_ordinals(date.toordinal() for date in dates)
+
+    @property
+    def ordinals(self) -> memoryview:
+        """Read-only view of ordinals"""
+        return memoryview(self._ordinals).toreadonly()
+
+    def eras(self) -> Iterator[Era]:
+        eras = _eras
+        return (eras[era_id] for era_id in self._era_ids)
+
+    def append(self, era_date: EraDate):
+        self._ordinals.append(era_date.toordinal())
+        self._era_ids.append(_era_id(era_date.era))
+
+    def extend(self, era_dates: Iterable[EraDate]):
+        if isinstance(era_dates, EraDateArray):
+            self._ordinals.extend(era_dates._ordinals)
+            self._era_ids.extend(era_dates._era_ids)
+            return
+        for era_date in era_dates:
+            self.append(era_date)
+
+    def _materialize(self, ordinal: int, era_id: int) -> EraDate:
+        date = datetime.date.fromordinal(ordinal)
+        return EraDate._from_trusted(date.year, date.month, date.day, _eras[era_id])
+
+    def __len__(self) -> int:
+        return len(self._ordinals)
+
+    def __getitem__(self, item: Union[int, slice]) -> Union[EraDate, "EraDateArray"]:
+        if isinstance(item, slice):
+            return self._from_arrays(self._ordinals[item], self._era_ids[item])
+        return self._materialize(self._ordinals[item], self._era_ids[item])
+
+    def __iter__(self) -> Iterator[EraDate]:
+        for ordinal, era_id in zip(self._ordinals, self._era_ids):
+            yield self._materialize(ordinal, era_id)
+
+    def __eq__(self, other):
+        if not isinstance(other, EraDateArray):
+            return NotImplemented
+        if self._ordinals != other._ordinals:
+            return False
+        return all(_eras[a] == _eras[b] for a, b in zip(self._era_ids, other._era_ids))
+
+    def __repr__(self):
+        return "EraDateArray({!r})".format(list(self))
+
+    def strftime(self, format: str) -> List[str]:
+        """
+        Same as `[era_date.strftime(format) for era_date in self]`,
+        but each distinct pair of date and era is formatted only once.
+        """
+        formatted = {}
+        result = []
+        append = result.append
+        for key in zip(self._ordinals, self._era_ids):
+            string = formatted.get(key)
+            if string is None:
+                string = formatted[key] = self._materialize(*key).strftime(format)
+            append(string)
+        return result
+
+    def filter(self, era: Optional[Era] = None, era_type: Optional[EraType] = None) -> "EraDateArray":
+        """
+        Return new `EraDateArray` of dates whose era is `era` and whose era type is `era_type`.
+        Conditions given as None are not checked.
+        """
+        accepted = {era_id for era_id in set(self._era_ids)
+                    if (era is None or _eras[era_id] == era) and
+                    (era_type is None or _eras[era_id].era_type == era_type)}
+        ordinals = array('i')
+        era_ids = array('H')
+        for ordinal, era_id in zip(self._ordinals, self._era_ids):
+            if era_id in accepted:
+                ordinals.append(ordinal)
+                era_ids.append(era_id)
+        return self._from_arrays(ordinals, era_ids)
+
+    def sort(self, reverse: bool = False):
+        """
+        Sort dates in place. The sort is stable, so dates of the same day keep their order.
+        """
+        order = sorted(range(len(self._ordinals)), key=self._ordinals.__getitem__, reverse=reverse)
+        self._ordinals = array('i', [self._ordinals[i] for i in order])
+        self._era_ids = array('H', [self._era_ids[i] for i in order])
+
+    def group_by_era_year(self) -> Dict[Tuple[Era, int], int]:
+        """
+        Count dates for each pair of era and relative year.
+        Returns: dict of {(era, relative_year): count}
+        """
+        counts = Counter()
+        fromordinal = datetime.date.fromordinal
+        for (ordinal, era_id), count in Counter(zip(self._ordinals, self._era_ids)).items():
+            era = _eras[era_id]
+            counts[(era, fromordinal(ordinal).year - era.since.year + 1)] += count
+        return dict(counts)
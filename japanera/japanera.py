@@ -1,13 +1,19 @@
 # -*- coding: utf-8 -*-
+import calendar
 import datetime
+import mmap
 import re
-from typing import Optional, List, Union
+from itertools import islice
+from typing import Iterable, Iterator, Optional, List, Sequence, Tuple, Union
 from warnings import warn
 
 from kanjize import number2kanji
 
+from . import cache, parser
 from .era_data import EraType, _ERA_DATA_COMMON, _ERA_DATA_GENERAL, _ERA_DATA_DAIKAKUJI, _ERA_DATA_JIMYOUIN
-from .parser import _strptime, find_era_and_date, _set_era_data
+from .parser import (_strptime, _strptime_bytes, find_era_and_date, find_eras_with_ordinal, iter_era_and_date,
+                     _set_era_data, _FormatUnion, _compile_format, _get_fast_path, _try_strptime, _first_era_and_date,
+                     ParseFailure, _normalize_format, normalize_date_string)
 
 
 class Era:
@@ -147,31 +153,231 @@ ERA_DATA_JIMYOUIN = [Era(kanji, english, since, until, _type) for kanji, english
 
 _set_era_data(ERA_DATA_COMMON, ERA_DATA_GENERAL, ERA_DATA_DAIKAKUJI, ERA_DATA_JIMYOUIN)
 
+# Era boundaries are calendar dates in Japan, so they are resolved in Japan Standard Time.
+# The daylight saving time Japan used in 1948-1951 is ignored, as `Asia/Tokyo` fixed +09:00.
+JST = datetime.timezone(datetime.timedelta(hours=9), "JST")
+
+_MAX_ORDINAL = datetime.date.max.toordinal()
+
+
+def _timezone(gmtoff: Optional[int], gmtoff_fraction: int, tzname: Optional[str]) -> Optional[datetime.timezone]:
+    if gmtoff is None:
+        return None
+    tzdelta = datetime.timedelta(seconds=gmtoff, microseconds=gmtoff_fraction)
+    if tzname:
+        return datetime.timezone(tzdelta, tzname)
+    return datetime.timezone(tzdelta)
+
+
+def _take(candidates: Iterator, limit: Optional[int]) -> list:
+    """
+    Returns: list of the first `limit` of `candidates`, or of all of them if `limit` is None
+    """
+    if limit is not None and limit < 1:
+        raise ValueError("limit must be positive, not %r" % (limit,))
+    return list(islice(candidates, limit))
+
+
+def _moved_era(era: Era, ordinal: int) -> Era:
+    """
+    Era of the day of `ordinal` which a date in `era` was moved to.
+    `era` is kept while its `[since, until)` contains the day, without looking up the era interval index,
+    so a date of the Southern court stays in its era.
+    西暦 is the fallback of days without an era and contains every day, so it is not kept,
+    but looked up again same as `EraDate.from_ordinal`. Its dates move into 大化 and later eras.
+    Returns: `era`, or the era `EraDate.from_ordinal(ordinal)` picks
+    """
+    if era.era_type is not EraType.COMMON and era.since.toordinal() <= ordinal \
+            and (era.until is None or ordinal < era.until.toordinal()):
+        return era
+    eras = find_eras_with_ordinal(ordinal)
+    if not eras:
+        raise ValueError("Era not found")  # Maybe this can't be happened because of Common Era
+    return eras[-1]
+
+
+def _parse_with_cache(date_string: str, format: str, allow_date_after_end_of_era=False,
+                      prefer=None) -> cache.ParseResult:
+    """
+    Parse and resolve `date_string` through the parse cache, which must be enabled.
+    """
+    prefer_key = prefer if prefer is None or isinstance(prefer, (str, EraType)) else tuple(prefer)
+    key = (date_string, format, allow_date_after_end_of_era, prefer_key)
+    result = cache._parse_cache.get(key)
+    if result is None:
+        (era_kanji, era_english, era_english_vowel_shortened, era_head, relative_year), \
+        (year, month, day, hour, minute, second, weekday, julian, tz, tzname, gmtoff), \
+        fraction, gmtoff_fraction = _strptime(date_string, format)
+        candidates = tuple((era, date.toordinal()) for era, date in
+                           iter_era_and_date(era_kanji, era_english, era_english_vowel_shortened, era_head, year,
+                                             relative_year, month, day, allow_date_after_end_of_era, prefer))
+        result = cache.ParseResult(candidates,
+                                   (hour, minute, second, fraction, _timezone(gmtoff, gmtoff_fraction, tzname)))
+        cache._parse_cache.put(key, result)
+    return result
+
 
 class EraDate(datetime.date):
     def __new__(cls, year: int, month: Optional[int] = None, day: Optional[int] = None, era: Optional[Era] = None):
         self = super().__new__(cls, year, month, day)
         if era:
             self.era = era
+            if self not in era:
+                warn("Date is not in era", RuntimeWarning)
         else:
-            result = find_era_and_date(absolute_year=year, month=month, day=day)
-            if not result:
+            eras = find_eras_with_ordinal(self.toordinal())
+            if not eras:
                 raise ValueError("Era not found")  # Maybe this can't be happened because of Common Era
-            self.era = result[-1][0]
-        if self not in self.era:
-            warn("Date is not in era", RuntimeWarning)
+            self.era = eras[-1]
+        return self
+
+    @classmethod
+    def _from_trusted(cls, year: int, month: int, day: int, era: Era) -> "EraDate":
+        """
+        Build `EraDate` without looking up or validating `era`.
+        Only for callers who know the date is in `era`, such as when `era` was derived from the same date.
+        """
+        self = datetime.date.__new__(cls, year, month, day)
+        self.era = era
         return self
 
     @classmethod
-    def strptime(cls, date_string: str, format: str, allow_date_after_end_of_era=False) -> List["EraDate"]:
+    def strptime(cls, date_string: str, format: str, allow_date_after_end_of_era=False, prefer=None,
+                 limit: Optional[int] = None, normalize=False) -> List["EraDate"]:
+        return _take(cls.iter_strptime(date_string, format, allow_date_after_end_of_era, prefer, normalize), limit)
+
+    @classmethod
+    def iter_strptime(cls, date_string: str, format: str, allow_date_after_end_of_era=False,
+                      prefer=None, normalize=False) -> Iterator["EraDate"]:
+        """
+        Lazy version of `strptime`. Each candidate is built only when it is consumed.
+        `prefer` decides the order of candidates. See `japanera.parser.iter_era_and_date`.
+        If `normalize` is True, `date_string` and the literals of `format` are normalized first,
+        so "令和５年", "令和〇五年" and "㋿5年" are parsed same as "令和5年". See `japanera.parser.normalize_date_string`.
+        """
+        if normalize:
+            date_string, format = normalize_date_string(date_string), _normalize_format(format)
+        if cache._parse_cache is not None:
+            return cls._iter_from_result(_parse_with_cache(date_string, format, allow_date_after_end_of_era, prefer),
+                                         allow_date_after_end_of_era)
+        return cls._iter_from_parsed(_strptime(date_string, format), allow_date_after_end_of_era, prefer)
+
+    @classmethod
+    def strptime_bytes(cls, data: Union[bytes, bytearray, memoryview, mmap.mmap], format: str,
+                       encoding: str = "utf-8", allow_date_after_end_of_era=False, prefer=None,
+                       limit: Optional[int] = None) -> List["EraDate"]:
+        """
+        Same as `strptime`, but `data` is bytes-like object, such as bytes, memoryview slice or mmap, in `encoding`.
+        `data` is matched with a bytes regex precompiled for `encoding`, and only the matched fields are decoded.
+        `encoding` must be ASCII compatible, such as "utf-8", "cp932", "shift_jis" or "euc_jp".
+        """
+        parsed = _strptime_bytes(data, format, encoding)
+        return _take(cls._iter_from_parsed(parsed, allow_date_after_end_of_era, prefer), limit)
+
+    @classmethod
+    def try_parse(cls, date_string: str, format: str, allow_date_after_end_of_era=False,
+                  prefer=None, normalize=False) -> Tuple[Optional["EraDate"], Optional[ParseFailure]]:
+        """
+        Same as `strptime(...)[0]`, but failure is returned instead of raised as ValueError,
+        which is much cheaper for inputs that often fail to parse.
+        Returns: (first candidate, None) if parsed, otherwise (None, `ParseFailure` telling why)
+        """
+        if normalize:
+            date_string, format = normalize_date_string(date_string), _normalize_format(format)
+        format_regex, locale_time = _compile_format(format)
+        return cls._try_parse(format_regex, locale_time, _get_fast_path(format), date_string,
+                              allow_date_after_end_of_era, prefer)
+
+    @classmethod
+    def parse_or_none(cls, date_string: str, format: str, allow_date_after_end_of_era=False,
+                      prefer=None, normalize=False) -> Optional["EraDate"]:
+        """
+        Same as `strptime(...)[0]`, but returns None if `date_string` is not parsed.
+        """
+        return cls.try_parse(date_string, format, allow_date_after_end_of_era, prefer, normalize)[0]
+
+    @classmethod
+    def try_parse_many(cls, date_strings: Iterable[str], format: str, allow_date_after_end_of_era=False,
+                       prefer=None, normalize=False) -> List[Tuple[Optional["EraDate"], Optional[ParseFailure]]]:
+        """
+        Same as `[try_parse(date_string, format) for date_string in date_strings]`,
+        but `format` is looked up once and each distinct string is parsed once.
+        """
+        if normalize:
+            format = _normalize_format(format)
+        format_regex, locale_time = _compile_format(format)
+        fast_path = _get_fast_path(format)
+        parsed = {}
+        result = []
+        append = result.append
+        for date_string in date_strings:
+            found = parsed.get(date_string)
+            if found is None:
+                found = parsed[date_string] = cls._try_parse(format_regex, locale_time, fast_path,
+                                                             normalize_date_string(date_string) if normalize
+                                                             else date_string, allow_date_after_end_of_era, prefer)
+            append(found)
+        return result
+
+    @classmethod
+    def parse_many_or_none(cls, date_strings: Iterable[str], format: str, allow_date_after_end_of_era=False,
+                           prefer=None, normalize=False) -> List[Optional["EraDate"]]:
+        """
+        Same as `[parse_or_none(date_string, format) for date_string in date_strings]`. See `try_parse_many`.
+        """
+        return [era_date for era_date, _ in
+                cls.try_parse_many(date_strings, format, allow_date_after_end_of_era, prefer, normalize)]
+
+    @classmethod
+    def _try_parse(cls, format_regex, locale_time, fast_path, date_string: str, allow_date_after_end_of_era=False,
+                   prefer=None) -> Tuple[Optional["EraDate"], Optional[ParseFailure]]:
+        parsed = _try_strptime(format_regex, locale_time, date_string, fast_path)
+        if isinstance(parsed, ParseFailure):
+            return None, parsed
+        return cls._try_from_parsed(parsed, allow_date_after_end_of_era, prefer)
+
+    @classmethod
+    def _try_from_parsed(cls, parsed, allow_date_after_end_of_era=False,
+                         prefer=None) -> Tuple[Optional["EraDate"], Optional[ParseFailure]]:
         (era_kanji, era_english, era_english_vowel_shortened, era_head, relative_year), \
         (year, month, day, hour, minute, second, weekday, julian, tz, tzname, gmtoff), \
-        fraction, gmtoff_fraction = _strptime(date_string, format)
-        era_and_dates = find_era_and_date(era_kanji, era_english, era_english_vowel_shortened, era_head, year,
-                                          relative_year, month, day, allow_date_after_end_of_era)
-        if not era_and_dates:
+        fraction, gmtoff_fraction = parsed
+        found = _first_era_and_date(era_kanji, era_english, era_english_vowel_shortened, era_head, year,
+                                    relative_year, month, day, allow_date_after_end_of_era, prefer)
+        if isinstance(found, ParseFailure):
+            return None, found
+        era, date = found
+        if allow_date_after_end_of_era:
+            return cls(date.year, date.month, date.day, era=era), None
+        return cls._from_trusted(date.year, date.month, date.day, era), None
+
+    @classmethod
+    def _iter_from_parsed(cls, parsed, allow_date_after_end_of_era=False, prefer=None) -> Iterator["EraDate"]:
+        (era_kanji, era_english, era_english_vowel_shortened, era_head, relative_year), \
+        (year, month, day, hour, minute, second, weekday, julian, tz, tzname, gmtoff), \
+        fraction, gmtoff_fraction = parsed
+        found = False
+        for era, date in iter_era_and_date(era_kanji, era_english, era_english_vowel_shortened, era_head, year,
+                                           relative_year, month, day, allow_date_after_end_of_era, prefer):
+            found = True
+            if allow_date_after_end_of_era:
+                # `date` can be after the end of `era`, so let the constructor warn about it
+                yield cls(date.year, date.month, date.day, era=era)
+            else:
+                yield cls._from_trusted(date.year, date.month, date.day, era)
+        if not found:
+            raise ValueError("EraDate not found")
+
+    @classmethod
+    def _iter_from_result(cls, result: cache.ParseResult, allow_date_after_end_of_era=False) -> Iterator["EraDate"]:
+        if not result.candidates:
             raise ValueError("EraDate not found")
-        return [cls.from_date(date, era=era) for era, date in era_and_dates]
+        for era, ordinal in result.candidates:
+            date = datetime.date.fromordinal(ordinal)
+            if allow_date_after_end_of_era:
+                yield cls(date.year, date.month, date.day, era=era)
+            else:
+                yield cls._from_trusted(date.year, date.month, date.day, era)
 
     def strftime(self, format: str) -> str:
         """
@@ -205,25 +411,89 @@ class EraDate(datetime.date):
 
     @classmethod
     def from_date(cls, dt: datetime.date, era: Optional[Era] = None) -> "EraDate":
-        if not era:
-            result = find_era_and_date(absolute_year=dt.year, month=dt.month, day=dt.day)
-            if not result:
-                raise ValueError("Era not found")  # Maybe this can't be happened because of Common Era
-            era = result[-1][0]
-        return cls(year=dt.year, month=dt.month, day=dt.day, era=era)
+        if era:
+            return cls(year=dt.year, month=dt.month, day=dt.day, era=era)
+        eras = find_eras_with_ordinal(dt.toordinal())
+        if not eras:
+            raise ValueError("Era not found")  # Maybe this can't be happened because of Common Era
+        return cls._from_trusted(dt.year, dt.month, dt.day, eras[-1])
+
+    @classmethod
+    def from_ordinal(cls, ordinal: int, era: Optional[Era] = None) -> "EraDate":
+        """
+        Same as `EraDate.from_date(datetime.date.fromordinal(ordinal), era)`,
+        but the era is found directly from `ordinal`.
+        """
+        dt = datetime.date.fromordinal(ordinal)
+        if era:
+            return cls(dt.year, dt.month, dt.day, era=era)
+        eras = find_eras_with_ordinal(ordinal)
+        if not eras:
+            raise ValueError("Era not found")  # Maybe this can't be happened because of Common Era
+        return cls._from_trusted(dt.year, dt.month, dt.day, eras[-1])
 
     @classmethod
     def list_from_date(cls, dt: datetime.date, eras: Optional[List[Era]] = None) -> List["EraDate"]:
+        if eras:
+            return [cls(year=dt.year, month=dt.month, day=dt.day, era=era) for era in eras]
+        eras = find_eras_with_ordinal(dt.toordinal())
         if not eras:
-            result = find_era_and_date(absolute_year=dt.year, month=dt.month, day=dt.day)
-            if not result:
-                raise ValueError("Era not found")  # Maybe this can't be happened because of Common Era
-            eras = [era for era, date in result]
-        return [cls(year=dt.year, month=dt.month, day=dt.day, era=era) for era in eras]
+            raise ValueError("Era not found")  # Maybe this can't be happened because of Common Era
+        year, month, day = dt.year, dt.month, dt.day
+        return [cls._from_trusted(year, month, day, era) for era in eras]
 
     def to_date(self) -> datetime.date:
         return datetime.date(year=self.year, month=self.month, day=self.day)
 
+    def __add__(self, other):
+        """
+        `EraDate` `other` days later. The era is updated same as `EraDate.replace`.
+        """
+        if not isinstance(other, datetime.timedelta):
+            return NotImplemented
+        ordinal = self.toordinal() + other.days
+        if not 0 < ordinal <= _MAX_ORDINAL:
+            raise OverflowError("date value out of range")
+        date = datetime.date.fromordinal(ordinal)
+        return self._from_trusted(date.year, date.month, date.day, _moved_era(self.era, ordinal))
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if isinstance(other, datetime.timedelta):
+            return self + -other
+        return super().__sub__(other)
+
+    def replace(self, year: Optional[int] = None, month: Optional[int] = None, day: Optional[int] = None,
+                era: Optional[Era] = None) -> "EraDate":
+        """
+        Same as `datetime.date.replace`, but returns `EraDate`.
+        Args:
+            era: era of the result. If not given, the era of `self` is kept while the result is in it,
+                otherwise the era is the one `EraDate.from_date` picks, such as `平成31年5月1日` to `令和元年5月1日`.
+                Dates of 西暦 always get the era `EraDate.from_date` picks
+
+        Returns: `EraDate` of the replaced date
+        """
+        date = datetime.date(self.year if year is None else year, self.month if month is None else month,
+                             self.day if day is None else day)
+        if era:
+            return type(self)(date.year, date.month, date.day, era=era)
+        return self._from_trusted(date.year, date.month, date.day,
+                                  _moved_era(self.era, date.toordinal()))
+
+    def add_era_years(self, years: int) -> "EraDate":
+        """
+        Add `years` to the relative year, such as `平成30年2月28日` to `平成31年2月28日`.
+        February 29 becomes February 28 if the result is not a leap year.
+        The era is updated same as `EraDate.replace`, such as `平成30年5月1日` to `令和元年5月1日`.
+        """
+        year = self.year + years
+        day = self.day
+        if self.month == 2 and day == 29 and not calendar.isleap(year):
+            day = 28
+        return self.replace(year, self.month, day)
+
     def __hash__(self):
         return hash((self.year, self.month, self.day, self.era))
 
@@ -249,59 +519,171 @@ class EraDateTime(EraDate, datetime.datetime):
 
         if era:
             self.era = era
+            if self not in era:
+                warn("Date is not in era", RuntimeWarning)
         else:
-            result = find_era_and_date(absolute_year=year, month=month, day=day)
-            if not result:
+            eras = find_eras_with_ordinal(self.toordinal())
+            if not eras:
                 raise ValueError("Era not found")  # Maybe this can't be happened because of Common Era
-            self.era = result[-1][0]
-        if self not in self.era:
-            warn("Date is not in era", RuntimeWarning)
+            self.era = eras[-1]
         return self
 
     @classmethod
-    def strptime(cls, date_string: str, format: str, allow_date_after_end_of_era=False) -> List["EraDateTime"]:
+    def _from_trusted(cls, year: int, month: int, day: int, era: Era, hour: int = 0, minute: int = 0, second: int = 0,
+                      microsecond: int = 0, tzinfo: Optional[datetime.tzinfo] = None,
+                      fold: int = 0) -> "EraDateTime":
+        """
+        Build `EraDateTime` without looking up or validating `era`.
+        Only for callers who know the date is in `era`, such as when `era` was derived from the same date.
+        """
+        self = datetime.datetime.__new__(cls, year, month, day, hour, minute, second, microsecond, tzinfo, fold=fold)
+        self.era = era
+        return self
+
+    @classmethod
+    def strptime(cls, date_string: str, format: str, allow_date_after_end_of_era=False, prefer=None,
+                 limit: Optional[int] = None, normalize=False) -> List["EraDateTime"]:
+        return _take(cls.iter_strptime(date_string, format, allow_date_after_end_of_era, prefer, normalize), limit)
+
+    @classmethod
+    def iter_strptime(cls, date_string: str, format: str, allow_date_after_end_of_era=False,
+                      prefer=None, normalize=False) -> Iterator["EraDateTime"]:
+        """
+        Lazy version of `strptime`. Each candidate is built only when it is consumed.
+        `prefer` decides the order of candidates. See `japanera.parser.iter_era_and_date`.
+        If `normalize` is True, `date_string` and the literals of `format` are normalized first,
+        so "令和５年", "令和〇五年" and "㋿5年" are parsed same as "令和5年". See `japanera.parser.normalize_date_string`.
+        """
+        if normalize:
+            date_string, format = normalize_date_string(date_string), _normalize_format(format)
+        if cache._parse_cache is not None:
+            return cls._iter_from_result(_parse_with_cache(date_string, format, allow_date_after_end_of_era, prefer),
+                                         allow_date_after_end_of_era)
+        return cls._iter_from_parsed(_strptime(date_string, format), allow_date_after_end_of_era, prefer)
+
+    @classmethod
+    def _iter_from_parsed(cls, parsed, allow_date_after_end_of_era=False, prefer=None) -> Iterator["EraDateTime"]:
         (era_kanji, era_english, era_english_vowel_shortened, era_head, relative_year), \
         (year, month, day, hour, minute, second, weekday, julian, tz, tzname, gmtoff), \
-        fraction, gmtoff_fraction = _strptime(date_string, format)
-        era_and_dates = find_era_and_date(era_kanji, era_english, era_english_vowel_shortened, era_head, year,
-                                          relative_year, month, day, allow_date_after_end_of_era)
-        if not era_and_dates:
+        fraction, gmtoff_fraction = parsed
+
+        tz = _timezone(gmtoff, gmtoff_fraction, tzname)
+        found = False
+        for era, date in iter_era_and_date(era_kanji, era_english, era_english_vowel_shortened, era_head, year,
+                                           relative_year, month, day, allow_date_after_end_of_era, prefer):
+            found = True
+            if allow_date_after_end_of_era:
+                # `date` can be after the end of `era`, so let the constructor warn about it
+                yield cls(date.year, date.month, date.day, hour, minute, second, fraction, tzinfo=tz, era=era)
+            else:
+                yield cls._from_trusted(date.year, date.month, date.day, era, hour, minute, second, fraction, tz)
+        if not found:
             raise ValueError("EraDate not found")
 
-        tz = None
-        if gmtoff is not None:
-            tzdelta = datetime.timedelta(seconds=gmtoff, microseconds=gmtoff_fraction)
-            if tzname:
-                tz = datetime.timezone(tzdelta, tzname)
+    @classmethod
+    def _try_from_parsed(cls, parsed, allow_date_after_end_of_era=False,
+                         prefer=None) -> Tuple[Optional["EraDateTime"], Optional[ParseFailure]]:
+        (era_kanji, era_english, era_english_vowel_shortened, era_head, relative_year), \
+        (year, month, day, hour, minute, second, weekday, julian, tz, tzname, gmtoff), \
+        fraction, gmtoff_fraction = parsed
+        found = _first_era_and_date(era_kanji, era_english, era_english_vowel_shortened, era_head, year,
+                                    relative_year, month, day, allow_date_after_end_of_era, prefer)
+        if isinstance(found, ParseFailure):
+            return None, found
+        era, date = found
+        tz = _timezone(gmtoff, gmtoff_fraction, tzname)
+        if allow_date_after_end_of_era:
+            return cls(date.year, date.month, date.day, hour, minute, second, fraction, tzinfo=tz, era=era), None
+        return cls._from_trusted(date.year, date.month, date.day, era, hour, minute, second, fraction, tz), None
+
+    @classmethod
+    def _iter_from_result(cls, result: cache.ParseResult,
+                          allow_date_after_end_of_era=False) -> Iterator["EraDateTime"]:
+        if not result.candidates:
+            raise ValueError("EraDate not found")
+        hour, minute, second, microsecond, tz = result.time
+        for era, ordinal in result.candidates:
+            date = datetime.date.fromordinal(ordinal)
+            if allow_date_after_end_of_era:
+                yield cls(date.year, date.month, date.day, hour, minute, second, microsecond, tzinfo=tz, era=era)
             else:
-                tz = datetime.timezone(tzdelta)
-        return [cls(date.year, date.month, date.day, hour, minute, second, fraction, tzinfo=tz, era=era) for era, date
-                in era_and_dates]
+                yield cls._from_trusted(date.year, date.month, date.day, era, hour, minute, second, microsecond, tz)
 
     @classmethod
-    def list_from_datetime(cls, dtt: datetime.datetime, eras: Optional[List[Era]] = None) -> List["EraDateTime"]:
+    def list_from_datetime(cls, dtt: datetime.datetime, eras: Optional[List[Era]] = None,
+                           in_jst: bool = False) -> List["EraDateTime"]:
+        if in_jst and dtt.utcoffset() is not None:
+            dtt = dtt.astimezone(JST)
+        if eras:
+            return [cls(year=dtt.year, month=dtt.month, day=dtt.day, hour=dtt.hour, minute=dtt.minute,
+                        second=dtt.second, microsecond=dtt.microsecond, tzinfo=dtt.tzinfo, fold=dtt.fold, era=era)
+                    for era in eras]
+        eras = find_eras_with_ordinal(dtt.toordinal())
         if not eras:
-            result = find_era_and_date(absolute_year=dtt.year, month=dtt.month, day=dtt.day)
-            if not result:
-                raise ValueError("Era not found")  # Maybe this can't be happened because of Common Era
-            eras = [era for era, date in result]
-        return [cls(year=dtt.year, month=dtt.month, day=dtt.day, hour=dtt.hour, minute=dtt.minute, second=dtt.second,
-                    microsecond=dtt.microsecond, tzinfo=dtt.tzinfo, fold=dtt.fold, era=era) for era in eras]
+            raise ValueError("Era not found")  # Maybe this can't be happened because of Common Era
+        year, month, day = dtt.year, dtt.month, dtt.day
+        time_fields = (dtt.hour, dtt.minute, dtt.second, dtt.microsecond, dtt.tzinfo, dtt.fold)
+        return [cls._from_trusted(year, month, day, era, *time_fields) for era in eras]
 
     @classmethod
-    def from_datetime(cls, dtt: datetime.datetime, era: Optional[Era] = None) -> "EraDateTime":
-        if not era:
-            result = find_era_and_date(absolute_year=dtt.year, month=dtt.month, day=dtt.day)
-            if not result:
-                raise ValueError("Era not found")  # Maybe this can't be happened because of Common Era
-            era = result[-1][0]
-        return cls(year=dtt.year, month=dtt.month, day=dtt.day, hour=dtt.hour, minute=dtt.minute, second=dtt.second,
-                   microsecond=dtt.microsecond, tzinfo=dtt.tzinfo, fold=dtt.fold, era=era)
+    def from_datetime(cls, dtt: datetime.datetime, era: Optional[Era] = None, in_jst: bool = False) -> "EraDateTime":
+        """
+        If `in_jst` is True and `dtt` is timezone-aware, `dtt` is converted to JST(+09:00) first,
+        so the era is the one in effect in Japan at that instant. Naive `dtt` is taken as Japanese local time.
+        """
+        if in_jst and dtt.utcoffset() is not None:
+            dtt = dtt.astimezone(JST)
+        if era:
+            return cls(year=dtt.year, month=dtt.month, day=dtt.day, hour=dtt.hour, minute=dtt.minute,
+                       second=dtt.second, microsecond=dtt.microsecond, tzinfo=dtt.tzinfo, fold=dtt.fold, era=era)
+        eras = find_eras_with_ordinal(dtt.toordinal())
+        if not eras:
+            raise ValueError("Era not found")  # Maybe this can't be happened because of Common Era
+        return cls._from_trusted(dtt.year, dtt.month, dtt.day, eras[-1], dtt.hour, dtt.minute, dtt.second,
+                                 dtt.microsecond, dtt.tzinfo, dtt.fold)
 
     def to_datetime(self) -> datetime.datetime:
         return datetime.datetime(year=self.year, month=self.month, day=self.day, hour=self.hour, minute=self.minute,
                                  second=self.second, microsecond=self.microsecond, tzinfo=self.tzinfo, fold=self.fold)
 
+    def __add__(self, other):
+        """
+        `EraDateTime` `other` later. The era is updated same as `EraDate.replace`.
+        `fold` of `self` is kept same as `replace`, while `datetime.datetime` arithmetic resets it to 0.
+        """
+        if not isinstance(other, datetime.timedelta):
+            return NotImplemented
+        dtt = self.to_datetime() + other
+        era = _moved_era(self.era, dtt.toordinal())
+        return self._from_trusted(dtt.year, dtt.month, dtt.day, era, dtt.hour, dtt.minute, dtt.second, dtt.microsecond,
+                                  dtt.tzinfo, self.fold)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if isinstance(other, datetime.timedelta):
+            return self + -other
+        return datetime.datetime.__sub__(self, other)
+
+    def replace(self, year: Optional[int] = None, month: Optional[int] = None, day: Optional[int] = None,
+                hour: Optional[int] = None, minute: Optional[int] = None, second: Optional[int] = None,
+                microsecond: Optional[int] = None, tzinfo=True, *, fold: Optional[int] = None,
+                era: Optional[Era] = None) -> "EraDateTime":
+        """
+        Same as `datetime.datetime.replace`, but returns `EraDateTime`. `era` is same as `EraDate.replace`.
+        """
+        dtt = datetime.datetime(self.year if year is None else year, self.month if month is None else month,
+                                self.day if day is None else day, self.hour if hour is None else hour,
+                                self.minute if minute is None else minute, self.second if second is None else second,
+                                self.microsecond if microsecond is None else microsecond,
+                                self.tzinfo if tzinfo is True else tzinfo, fold=self.fold if fold is None else fold)
+        if era:
+            return type(self)(dtt.year, dtt.month, dtt.day, dtt.hour, dtt.minute, dtt.second, dtt.microsecond,
+                              dtt.tzinfo, fold=dtt.fold, era=era)
+        era = _moved_era(self.era, dtt.toordinal())
+        return self._from_trusted(dtt.year, dtt.month, dtt.day, era, dtt.hour, dtt.minute, dtt.second, dtt.microsecond,
+                                  dtt.tzinfo, dtt.fold)
+
     def __eq__(self, other):
         if isinstance(other, EraDateTime):
             return self.year == other.year and self.month == other.month and self.day == other.day and self.hour == \
@@ -324,3 +706,62 @@ class EraDateTime(EraDate, datetime.datetime):
 
     def __str__(self):
         return self.strftime("%-K%-y年 %m月%d日 %H時%M分%S秒")
+
+
+class CompiledFormats:
+    """
+    Several formats compiled into a single regex.
+    The date string is scanned once, whichever of the formats it is written in,
+    and converted with the rules of the format that matched.
+    Formats are tried in the given order, so put the most specific one first.
+    If `normalize` is True, date strings are normalized before matching. See `japanera.parser.normalize_date_string`.
+    """
+
+    def __init__(self, formats: Sequence[str], normalize=False):
+        self.formats = tuple(formats)
+        self.normalize = normalize
+        self._union = _FormatUnion([_normalize_format(format) for format in self.formats] if normalize
+                                   else self.formats)
+
+    def match(self, date_string: str) -> Optional[str]:
+        """
+        Return the format `date_string` is written in, or None if no format matches.
+        """
+        if self.normalize:
+            date_string = normalize_date_string(date_string)
+        found = self._union.match(date_string)
+        return None if found is None else self.formats[found[0]]
+
+    def _parse(self, date_string: str):
+        if self.normalize:
+            date_string = normalize_date_string(date_string)
+        found = self._union.match(date_string)
+        if found is None:
+            raise ValueError("time data %r does not match any of formats %r" % (date_string, self.formats))
+        return self.formats[found[0]], found[1]
+
+    def strptime(self, date_string: str, allow_date_after_end_of_era=False, prefer=None,
+                 limit: Optional[int] = None) -> Tuple[str, List[EraDate]]:
+        """
+        Return the matched format and the same list `EraDate.strptime(date_string, format)` would return.
+        """
+        format, parsed = self._parse(date_string)
+        return format, _take(EraDate._iter_from_parsed(parsed, allow_date_after_end_of_era, prefer), limit)
+
+    def strptime_datetime(self, date_string: str, allow_date_after_end_of_era=False, prefer=None,
+                          limit: Optional[int] = None) -> Tuple[str, List[EraDateTime]]:
+        """
+        Return the matched format and the same list `EraDateTime.strptime(date_string, format)` would return.
+        """
+        format, parsed = self._parse(date_string)
+        return format, _take(EraDateTime._iter_from_parsed(parsed, allow_date_after_end_of_era, prefer), limit)
+
+    def __repr__(self):
+        return "CompiledFormats({!r})".format(list(self.formats))
+
+
+def compile_formats(formats: Sequence[str], normalize=False) -> CompiledFormats:
+    """
+    Compile `formats` into one `CompiledFormats`.
+    """
+    return CompiledFormats(formats, normalize)
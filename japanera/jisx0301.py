@@ -0,0 +1,111 @@
+"""
+JIS X 0301 wareki dates, such as `R05.03.07` and `H31.04.30`.
+
+A JIS X 0301 date is the first letter of the era, two digits of the relative year, month and day, separated by ".".
+The letter maps to one of the modern eras through a fixed table, so no era candidates are searched::
+
+    decode("H31.04.30")  # EraDate(2019, 4, 30, Era('平成', ...))
+    encode(datetime.date(2023, 3, 7))  # 'R05.03.07'
+
+JIS X 0301 covers dates since the Gregorian calendar was adopted, M06.01.01 (1873-01-01).
+Eras are the same as the ones `EraDate.from_date` picks.
+"""
+import datetime
+from typing import Iterable, List
+
+from .japanera import EraDate, ERA_DATA_GENERAL
+
+FIRST_DATE = datetime.date(1873, 1, 1)
+
+_LETTERS = "MTSHR"
+# letter: (era, first day in JIS X 0301, day after the last day or None)
+_ERAS = {}
+for _era in ERA_DATA_GENERAL[-len(_LETTERS):]:
+    _ERAS[_era.english_head] = (_era, max(_era.since, FIRST_DATE), _era.until)
+if "".join(_ERAS) != _LETTERS:  # pragma: no cover
+    raise RuntimeError("the last eras of ERA_DATA_GENERAL are not Meiji to Reiwa")
+del _era
+# the latest era first, since most dates are recent
+_ERAS_BY_SINCE = [(since, letter, era.since.year - 1) for letter, (era, since, _) in reversed(_ERAS.items())]
+
+_TWO_DIGITS = ["{:02d}".format(number) for number in range(100)]
+# "H31": (era, absolute year, first day of the era in JIS X 0301, day after the last day or None)
+_ERA_YEARS = {letter + _TWO_DIGITS[year]: (era, era.since.year + year - 1, since, until)
+              for letter, (era, since, until) in _ERAS.items() for year in range(1, 100)}
+# "04.30": (4, 30)
+_MONTH_DAYS = {"{}.{}".format(_TWO_DIGITS[month], _TWO_DIGITS[day]): (month, day)
+               for month in range(1, 13) for day in range(1, 32)}
+
+
+def _invalid(text) -> ValueError:
+    return ValueError("invalid JIS X 0301 date: {!r}".format(text))
+
+
+def decode(text: str, allow_date_after_end_of_era: bool = False) -> EraDate:
+    """
+    Parse JIS X 0301 date, such as "R05.03.07".
+    Args:
+        text: JIS X 0301 date. The era letter must be one of M, T, S, H and R in upper case
+        allow_date_after_end_of_era: If True, accept dates after the end of the era, such as "H31.05.01"
+
+    Returns: `EraDate` of the era of the letter
+    """
+    era_year = _ERA_YEARS.get(text[:3])
+    month_day = _MONTH_DAYS.get(text[4:])
+    if era_year is None or month_day is None or text[3] != ".":
+        raise _invalid(text)
+    era, year, since, until = era_year
+    try:
+        result = EraDate._from_trusted(year, month_day[0], month_day[1], era)
+    except ValueError:  # such as February 30
+        raise _invalid(text) from None
+    if result < since or (until is not None and result >= until and not allow_date_after_end_of_era):
+        raise ValueError("{!r} is out of {}".format(text, era.english))
+    return result
+
+
+def encode(date: datetime.date) -> str:
+    """
+    Format `date` as JIS X 0301 date, such as "R05.03.07". `datetime.datetime` is formatted by its date.
+    The era is the one `EraDate.from_date` picks, whatever `era` of `EraDate` is.
+    """
+    if isinstance(date, datetime.datetime):
+        date = date.date()
+    for since, letter, offset in _ERAS_BY_SINCE:
+        if date >= since:
+            year = date.year - offset
+            if year > 99:
+                raise ValueError("{} is too late to be written in JIS X 0301".format(date))
+            return letter + _TWO_DIGITS[year] + "." + _TWO_DIGITS[date.month] + "." + _TWO_DIGITS[date.day]
+    raise ValueError("JIS X 0301 has no date before {}, not {}".format(FIRST_DATE, date))
+
+
+def decode_many(texts: Iterable[str], allow_date_after_end_of_era: bool = False) -> List[EraDate]:
+    """
+    Same as `[decode(text) for text in texts]`, but each distinct text is parsed once.
+    """
+    decoded = {}
+    result = []
+    append = result.append
+    for text in texts:
+        era_date = decoded.get(text)
+        if era_date is None:
+            era_date = decoded[text] = decode(text, allow_date_after_end_of_era)
+        append(era_date)
+    return result
+
+
+def encode_many(dates: Iterable[datetime.date]) -> List[str]:
+    """
+    Same as `[encode(date) for date in dates]`, but each distinct day is formatted once.
+    """
+    encoded = {}
+    result = []
+    append = result.append
+    for date in dates:
+        ordinal = date.toordinal()
+        text = encoded.get(ordinal)
+        if text is None:
+            text = encoded[ordinal] = encode(date)
+        append(text)
+    return result
@@ -0,0 +1,196 @@
+"""
+`Series.wareki` accessor for pandas.
+
+Importing this module registers the accessor::
+
+    import japanera.pandas_accessor
+
+    dates.wareki.era
+    dates.wareki.relative_year
+    dates.wareki.strftime("%-K%-y年%m月%d日")
+    strings.wareki.parse("%-K%-y年%m月%d日")
+
+Eras are looked up for all rows at once with `numpy.searchsorted` over the era interval index,
+and the era the row gets is the one `EraDate.from_date` picks.
+Missing values (`NaT`, `None`, `NaN`) stay missing.
+"""
+import datetime
+import re
+
+try:
+    import numpy as np
+    import pandas as pd
+except ImportError as e:  # pragma: no cover
+    raise ImportError("japanera.pandas_accessor requires pandas. "
+                      "Install it with `pip install japanera[pandas]`") from e
+
+from kanjize import number2kanji
+
+from . import parser
+
+_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+_EPOCH_WEEKDAY = datetime.date(1970, 1, 1).weekday()
+_MICROSECONDS_PER_DAY = 24 * 60 * 60 * 1000000
+
+_JAPANERA_DIRECTIVE = re.compile(r"(%-[KEehnNyYmda])")
+
+_TWO_DIGITS = np.array(["{:02}".format(i) for i in range(100)], dtype=object)
+_KANJI_UNDER_100 = np.array([number2kanji(i) for i in range(100)], dtype=object)
+_KANJI_WEEKDAYS = np.array(list('月火水木金土日'), dtype=object)
+
+
+class _EraTable:
+    """The interval index of `japanera.parser` as numpy arrays. Rebuilt when era data is set again."""
+    _cache = None
+
+    def __init__(self, starts, era_tuples):
+        self.source = starts
+        self.starts = np.array(starts, dtype=np.int64)
+        self.eras = np.empty(len(era_tuples), dtype=object)
+        self.eras[:] = [eras[-1] for eras in era_tuples]
+        self.since_years = np.array([era.since.year for era in self.eras], dtype=np.int64)
+        self.names = {
+            "%-K": np.array([era.kanji for era in self.eras], dtype=object),
+            "%-E": np.array([era.english for era in self.eras], dtype=object),
+            "%-e": np.array([era.english_vowel_shortened for era in self.eras], dtype=object),
+            "%-h": np.array([era.english_head for era in self.eras], dtype=object),
+        }
+
+    @classmethod
+    def get(cls) -> "_EraTable":
+        if cls._cache is None or cls._cache.source is not parser._era_index_starts:
+            cls._cache = cls(parser._era_index_starts, parser._era_index_eras)
+        return cls._cache
+
+
+def _map_unique(values, function):
+    uniques, inverse = np.unique(values, return_inverse=True)
+    return np.array([function(value) for value in uniques.tolist()], dtype=object)[inverse.reshape(-1)]
+
+
+@pd.api.extensions.register_series_accessor("wareki")
+class WarekiAccessor:
+    def __init__(self, series: pd.Series):
+        self._series = series
+
+    def _datetimes(self) -> pd.Series:
+        series = self._series
+        if isinstance(series.dtype, pd.DatetimeTZDtype):
+            # wall time of the series' timezone, same as `EraDateTime.from_datetime`
+            return series.dt.tz_localize(None)
+        if pd.api.types.is_datetime64_dtype(series.dtype):
+            return series
+        try:
+            return series.astype("datetime64[s]")
+        except (TypeError, ValueError):
+            raise AttributeError("Can only use .wareki accessor with date or datetime values") from None
+
+    def _resolve(self):
+        datetimes = self._datetimes()
+        days = datetimes.to_numpy().astype("datetime64[D]")
+        valid = ~np.isnat(days)
+        day_numbers = np.where(valid, days.astype(np.int64), 0)
+        table = _EraTable.get()
+        index = np.searchsorted(table.starts, day_numbers + _EPOCH_ORDINAL, side="right") - 1
+        years = days.astype("datetime64[Y]").astype(np.int64) + 1970
+        relative_years = np.where(valid, years - table.since_years[index] + 1, 0)
+        return datetimes, days, day_numbers, valid, table, index, relative_years
+
+    def _series_like(self, values, dtype=None) -> pd.Series:
+        return pd.Series(values, index=self._series.index, name=self._series.name, dtype=dtype)
+
+    @property
+    def era(self) -> pd.Series:
+        """`Era` of each row, or None for missing values."""
+        datetimes, days, day_numbers, valid, table, index, relative_years = self._resolve()
+        return self._series_like(np.where(valid, table.eras[index], None), dtype=object)
+
+    @property
+    def relative_year(self) -> pd.Series:
+        """Relative year of each row in its era, as nullable `Int64`."""
+        datetimes, days, day_numbers, valid, table, index, relative_years = self._resolve()
+        return self._series_like(pd.arrays.IntegerArray(relative_years, ~valid))
+
+    def strftime(self, format: str) -> pd.Series:
+        """
+        Same as `EraDate.strftime` for every row. Missing values stay missing.
+        Directives of japanera are filled in from lookup tables, and the rest is handled by `Series.dt.strftime`.
+        """
+        datetimes, days, day_numbers, valid, table, index, relative_years = self._resolve()
+        result = np.full(len(days), "", dtype=object)
+        for part in _JAPANERA_DIRECTIVE.split(format):
+            if not part:
+                continue
+            if part in table.names:
+                result += table.names[part][index]
+            elif part == "%-y":
+                result += _TWO_DIGITS[relative_years % 100]
+            elif part == "%-Y":
+                result += relative_years.astype(str).astype(object)
+            elif part == "%-n":
+                result += np.where(relative_years == 1, "元", _KANJI_UNDER_100[relative_years % 100])
+            elif part == "%-N":
+                result += np.where(relative_years == 1, "元", _map_unique(relative_years, number2kanji))
+            elif part == "%-m":
+                result += _KANJI_UNDER_100[days.astype("datetime64[M]").astype(np.int64) % 12 + 1]
+            elif part == "%-d":
+                day_of_month = (days - days.astype("datetime64[M]")).astype(np.int64) + 1
+                result += _KANJI_UNDER_100[np.where(valid, day_of_month, 0)]
+            elif part == "%-a":
+                result += _KANJI_WEEKDAYS[(day_numbers + _EPOCH_WEEKDAY) % 7]
+            elif "%" in part:
+                result += datetimes.dt.strftime(part).fillna("").to_numpy(dtype=object)
+            else:
+                result += part
+        result[~valid] = np.nan
+        return self._series_like(result, dtype=object)
+
+    def parse(self, format: str, allow_date_after_end_of_era: bool = False, prefer=None,
+              errors: str = "raise") -> pd.Series:
+        """
+        Parse strings of each row like `EraDate.strptime(value, format, allow_date_after_end_of_era, prefer)[0]`,
+        and return naive `datetime64[us]` series. Time zone parsed by `%z` or `%Z` is ignored.
+        Each distinct string is matched and resolved only once.
+        Args:
+            format: format of strings
+            allow_date_after_end_of_era: same as `EraDate.strptime`
+            prefer: same as `EraDate.strptime`
+            errors: "raise" to raise ValueError for strings not parsed, or "coerce" to make them NaT
+        """
+        if errors not in ("raise", "coerce"):
+            raise ValueError("errors must be 'raise' or 'coerce', not %r" % errors)
+        codes, uniques = pd.factorize(self._series)
+        format_regex, locale_time = parser._compile_format(format)
+
+        microseconds = np.empty(len(uniques), dtype=np.int64)
+        parsed_valid = np.ones(len(uniques), dtype=bool)
+        for i, value in enumerate(uniques):
+            try:
+                if not isinstance(value, str):
+                    raise ValueError("value %r is not str" % (value,))
+                parser._check_input_length(value)
+                found = format_regex.match(value)
+                if not found or found.end() != len(value):
+                    raise ValueError("time data %r does not match format %r" % (value, format))
+                (era_kanji, era_english, era_english_vowel_shortened, era_head, relative_year), \
+                (year, month, day, hour, minute, second, weekday, julian, tz, tzname, gmtoff), \
+                fraction, gmtoff_fraction = parser._parse_found_dict(found.groupdict(), locale_time)
+                for era, date in parser.iter_era_and_date(era_kanji, era_english, era_english_vowel_shortened,
+                                                          era_head, year, relative_year, month, day,
+                                                          allow_date_after_end_of_era, prefer):
+                    break
+                else:
+                    raise ValueError("EraDate not found for %r" % value)
+            except ValueError:
+                if errors == "raise":
+                    raise
+                parsed_valid[i] = False
+                continue
+            microseconds[i] = ((date.toordinal() - _EPOCH_ORDINAL) * _MICROSECONDS_PER_DAY +
+                               ((hour * 60 + minute) * 60 + second) * 1000000 + fraction)
+
+        valid = codes >= 0
+        valid[valid] = parsed_valid[codes[valid]]
+        values = np.where(valid, microseconds[np.where(codes >= 0, codes, 0)] if len(uniques) else 0,
+                          np.iinfo(np.int64).min)
+        return self._series_like(values.astype("datetime64[us]"))
@@ -1,24 +1,96 @@
 import calendar
+import codecs
 import datetime
+import enum
+import itertools
+import re
+import sys
 import time
+import unicodedata
 from _strptime import (_CACHE_MAX_SIZE, IGNORECASE, LocaleTime, _cache_lock,
                        _calc_julian_from_U_or_W, _getlang, _regex_cache,
                        re_compile, re_escape)
+from bisect import bisect_right
 from calendar import monthrange
 from collections import defaultdict
-from typing import List, Optional, Set, Tuple
+from types import MappingProxyType
+from typing import FrozenSet, Iterable, Iterator, List, Mapping, Optional, Set, Tuple, Union
 
 from kanjize import kanji2number
 
+try:
+    from re import _constants as _sre_constants, _parser as _sre_parse
+except ImportError:  # Python < 3.11
+    import sre_constants as _sre_constants
+    import sre_parse as _sre_parse
+
+from . import cache
+from .era_data import EraType
+
 _ERA_DATA_COMMON, _ERA_DATA_GENERAL, _ERA_DATA_DAIKAKUJI, _ERA_DATA_JIMYOUIN = [], [], [], []
 
-_era_kanji_dict = defaultdict(set)
-_era_alphabet_dict = defaultdict(set)
-_era_alphabet_vowel_shortened_dict = defaultdict(set)
-_era_alphabet_head_dict = defaultdict(set)
+# name: eras, built once by `_set_era_data` and never grown by lookups
+_era_kanji_dict = MappingProxyType({})
+_era_alphabet_dict = MappingProxyType({})
+_era_alphabet_vowel_shortened_dict = MappingProxyType({})
+_era_alphabet_head_dict = MappingProxyType({})
+# every name above and its `_era_name_key`: eras. See `find_eras_with_name`
+_era_name_index = MappingProxyType({})
+_NO_ERAS = frozenset()
+
+# interval index: `_era_index_eras[i]` is the eras containing every day of
+# [`_era_index_starts[i]`, `_era_index_starts[i + 1]`) in proleptic Gregorian ordinal
+_era_index_starts = []
+_era_index_eras = []
 
 _JAPANERA_TimeRE_cache = None
 
+DEFAULT_MAX_INPUT_LENGTH = 1024
+# date strings longer than this are rejected before matching. `sys.maxsize` if unlimited
+_max_input_length = DEFAULT_MAX_INPUT_LENGTH
+
+
+class ParseFailure(enum.Enum):
+    """
+    Reason why a date string was not parsed, which `try_parse` family returns instead of raising ValueError.
+    """
+    NO_MATCH = 'no_match'  # doesn't match the format
+    UNCONVERTED_DATA = 'unconverted_data'  # matches the format, but is followed by extra characters
+    INVALID_FIELD = 'invalid_field'  # fields are inconsistent, or out of range of `datetime.date`
+    UNKNOWN_ERA = 'unknown_era'  # no era has the given name, or the given names and year at once
+    DATE_NOT_IN_ERA = 'date_not_in_era'  # no era contains the given date
+    TOO_LONG = 'too_long'  # longer than `get_max_input_length()`, so not matched at all
+
+
+def set_max_input_length(length: Optional[int] = DEFAULT_MAX_INPUT_LENGTH) -> None:
+    """
+    Set the maximum length of date strings, characters of str or bytes of bytes-like objects.
+    Longer ones are rejected before matching, so the time to reject crafted input is bounded. 1024 by default.
+    Args:
+        length: maximum length, or None for no limit
+    """
+    global _max_input_length
+    if length is None:
+        _max_input_length = sys.maxsize
+        return
+    if length < 1:
+        raise ValueError("length must be positive, not %r" % length)
+    _max_input_length = length
+
+
+def get_max_input_length() -> Optional[int]:
+    """
+    Returns: maximum length of date strings, or None if unlimited. See `set_max_input_length`
+    """
+    return None if _max_input_length == sys.maxsize else _max_input_length
+
+
+def _check_input_length(data):
+    """Raise ValueError if `data` is longer than `get_max_input_length()`."""
+    if len(data) > _max_input_length:
+        raise ValueError("time data of length %d is longer than the limit %d. See `set_max_input_length`" %
+                         (len(data), _max_input_length))
+
 
 def _set_era_data(era_data_common, era_data_general, era_data_daikakuji, era_data_jimyouin):
     global _ERA_DATA_COMMON, _ERA_DATA_GENERAL, _ERA_DATA_DAIKAKUJI, _ERA_DATA_JIMYOUIN
@@ -27,52 +99,97 @@ def _set_era_data(era_data_common, era_data_general, era_data_daikakuji, era_dat
     _ERA_DATA_DAIKAKUJI = era_data_daikakuji
     _ERA_DATA_JIMYOUIN = era_data_jimyouin
 
-    for _era in _ERA_DATA_COMMON + _ERA_DATA_GENERAL + _ERA_DATA_DAIKAKUJI + _ERA_DATA_JIMYOUIN:
-        _era_kanji_dict[_era.kanji].add(_era)
-        _era_alphabet_dict[_era.english].add(_era)
-        _era_alphabet_vowel_shortened_dict[_era.english_vowel_shortened].add(_era)
-        _era_alphabet_head_dict[_era.english_head].add(_era)
+    global _era_kanji_dict, _era_alphabet_dict, _era_alphabet_vowel_shortened_dict, _era_alphabet_head_dict, \
+        _era_name_index
+    _era_kanji_dict, _era_alphabet_dict, _era_alphabet_vowel_shortened_dict, _era_alphabet_head_dict, \
+        _era_name_index = _build_name_indexes(
+            _ERA_DATA_COMMON + _ERA_DATA_GENERAL + _ERA_DATA_DAIKAKUJI + _ERA_DATA_JIMYOUIN)
+
+    global _era_index_starts, _era_index_eras
+    _era_index_starts, _era_index_eras = _build_era_index(
+        _ERA_DATA_COMMON + _ERA_DATA_GENERAL + _ERA_DATA_DAIKAKUJI + _ERA_DATA_JIMYOUIN)
 
     global _JAPANERA_TimeRE_cache
     _JAPANERA_TimeRE_cache = TimeRE()
+    _fast_path_cache.clear()
+
+    cache.clear_caches()
+
+
+def _era_name_key(name: str) -> str:
+    """
+    Fold spellings of an era name into one key: width, case and macrons, and long vowels of romanization.
+    So "Shouwa", "Showa", "Shōwa" and "SHOWA" are all "showa", and "昭和" and "㍼" are "昭和".
+    """
+    key = unicodedata.normalize("NFKD", name)
+    key = "".join(char for char in key if not unicodedata.combining(char)).lower()
+    if key.isascii():
+        key = key.replace("ou", "o").replace("uu", "u").replace("oo", "o")
+    return key
+
+
+def _build_name_indexes(eras: Iterable["Era"]) -> Tuple[Mapping[str, FrozenSet["Era"]], ...]:
+    """
+    Returns: read only mappings of kanji, English, vowel shortened English and head of era names to eras,
+        and of all of them and their `_era_name_key` to eras
+    """
+    indexes = ({}, {}, {}, {}, {})
+    for era in eras:
+        names = (era.kanji, era.english, era.english_vowel_shortened, era.english_head)
+        for index, name in zip(indexes, names):
+            index.setdefault(name, set()).add(era)
+        for name in set(names + tuple(_era_name_key(name) for name in names)):
+            indexes[4].setdefault(name, set()).add(era)
+    return tuple(MappingProxyType({name: frozenset(eras) for name, eras in index.items()}) for index in indexes)
 
 
 class TimeRE(dict):
     """Handle conversion from format directives to regexes."""
 
-    def __init__(self, locale_time=None):
+    def __init__(self, locale_time=None, name_dicts=None):
         """Create keys/values.
 
         Order of execution is important for dependency reasons.
+        `name_dicts` are the dicts of kanji, English, vowel shortened English
+        and head of era names, which the era name directives match. The
+        module level dicts of all eras by default.
 
         """
         if locale_time:
             self.locale_time = locale_time
         else:
             self.locale_time = LocaleTime()
+        if name_dicts is None:
+            name_dicts = (_era_kanji_dict, _era_alphabet_dict, _era_alphabet_vowel_shortened_dict,
+                          _era_alphabet_head_dict)
         base = super()
 
         base.__init__({
             # Added for Japanera
-            '-K': self.__seqToRE(_era_kanji_dict.keys(), '_K'),
-            '-E': self.__seqToRE(_era_alphabet_dict.keys(), '_E'),
-            '-e': self.__seqToRE(_era_alphabet_vowel_shortened_dict.keys(), '_e'),
-            '-h': self.__seqToRE(_era_alphabet_head_dict.keys(), '_h'),
-            '-n': r"(?P<_n>[一二三四五六七八九]?十[一二三四五六七八九]?|"
-                  r"[一二三四五六七八九]|"
+            '-K': self.__seqToTrieRE(name_dicts[0].keys(), '_K'),
+            '-E': self.__seqToTrieRE(name_dicts[1].keys(), '_E'),
+            '-e': self.__seqToTrieRE(name_dicts[2].keys(), '_e'),
+            '-h': self.__seqToTrieRE(name_dicts[3].keys(), '_h'),
+            # kanji numerals are factored by their first character, so each alternative is entered only
+            # by the character it starts with. They match the same as the plain alternations, in the same order
+            '-n': r"(?P<_n>[一二三四五六七八九](?:十[一二三四五六七八九]?)?|"
+                  r"十[一二三四五六七八九]?|"
                   r"元)",
             '-N': r"(?P<_N>"
-                  r"[一二三四五六七八九]?千([一二三四五六七八九]?百)?([一二三四五六七八九]?十)?[一二三四五六七八九]?|"
-                  r"[一二三四五六七八九]?百([一二三四五六七八九]?十)?[一二三四五六七八九]?|"
-                  r"[一二三四五六七八九]?十[一二三四五六七八九]?|"
-                  r"[一二三四五六七八九]|"
+                  r"[一二三四五六七八九](?:千(?:[一二三四五六七八九]?百)?(?:[一二三四五六七八九]?十)?[一二三四五六七八九]?|"
+                  r"百(?:[一二三四五六七八九]?十)?[一二三四五六七八九]?|"
+                  r"十[一二三四五六七八九]?)?|"
+                  r"千(?:[一二三四五六七八九]?百)?(?:[一二三四五六七八九]?十)?[一二三四五六七八九]?|"
+                  r"百(?:[一二三四五六七八九]?十)?[一二三四五六七八九]?|"
+                  r"十[一二三四五六七八九]?|"
                   r"元)",
             '-y': r"(?P<_y>\d\d|\d|"
                   r"元)",
             '-Y': r"(?P<_Y>\d{1,4}|"
                   r"元)",
             '-m': r"(?P<_m>1[0-2]|0[1-9]|[1-9]|十[一二]?|[一二三四五六七八九])",
-            '-d': r"(?P<_d>3[0-1]|[1-2]\d|0[1-9]|[1-9]| [1-9]|三十一?|二?十[一二三四五六七八九]?|[一二三四五六七八九])",
+            '-d': r"(?P<_d>3[0-1]|[1-2]\d|0[1-9]|[1-9]| [1-9]|三十一?|二(?:十[一二三四五六七八九]?)?|十[一二三四五六七八九]?|"
+                  r"[一二三四五六七八九])",
             '-a': r"(?P<_a>[月火水木金土日])",
 
             # Default below
@@ -129,6 +246,25 @@ class TimeRE(dict):
         regex = '(?P<%s>%s' % (directive, regex)
         return '%s)' % regex
 
+    def __seqToTrieRE(self, to_convert, directive):
+        """Same as `__seqToRE`, but the values are factored into a trie by their prefixes.
+
+        Values which can match at the same position are prefixes of one another,
+        so they lie on one path of the trie, and the greedy optional groups try
+        the longer one first, as `__seqToRE` does. Values are put in the trie
+        lowercased, since the pattern is compiled with IGNORECASE.
+
+        """
+        trie = {}
+        for value in to_convert:
+            node = trie
+            for char in (value.lower() if value.isascii() else value):
+                node = node.setdefault(char, {})
+            node[None] = None  # end of a value
+        if not any(key is not None for key in trie):
+            return ''
+        return '(?P<%s>%s)' % (directive, _trie_to_regex(trie))
+
     def pattern(self, format):
         """Return regex pattern for the format string.
 
@@ -143,7 +279,8 @@ class TimeRE(dict):
         regex_chars = re_compile(r"([\\.^$*+?\(\){}\[\]|])")
         format = regex_chars.sub(r"\\\1", format)
         whitespace_replacement = re_compile(r'\s+')
-        format = whitespace_replacement.sub(r'\\s+', format)
+        # a run of whitespace has only one way to end, so a failed match never retries it with fewer characters
+        format = whitespace_replacement.sub(r'\\s+(?!\\s)', format)
         while '%' in format:
             directive_index = format.index('%') + 1
             if format[directive_index] == '-':
@@ -161,6 +298,26 @@ class TimeRE(dict):
         return re_compile(self.pattern(format), IGNORECASE)
 
 
+def _trie_to_regex(node):
+    """Return regex matching the values in `node` of a trie, trying longer ones first."""
+    leaves = []
+    branches = []
+    for char, child in node.items():
+        if char is None:
+            continue
+        if len(child) == 1 and None in child:
+            leaves.append(re_escape(char))
+        else:
+            branches.append(re_escape(char) + _trie_to_regex(child))
+    if leaves:
+        branches.append(leaves[0] if len(leaves) == 1 else '[%s]' % ''.join(leaves))
+    if None in node:
+        return '(?:%s)?' % '|'.join(branches)
+    if len(branches) == 1:
+        return branches[0]
+    return '(?:%s)' % '|'.join(branches)
+
+
 def _calc_julian_from_V(iso_year, iso_week, iso_weekday):
     """Calculate the Julian day based on the ISO 8601 year, week, and weekday.
     ISO weeks start on Mondays, with week 01 being the week containing 4 Jan.
@@ -177,52 +334,271 @@ def _calc_julian_from_V(iso_year, iso_week, iso_weekday):
     return iso_year, ordinal
 
 
-def _strptime(data_string, format="%a %b %d %H:%M:%S %Y"):
-    """Return a 2-tuple consisting of a time struct and an int containing
-    the number of microseconds based on the input string and the
-    format string."""
+def _get_time_re():
+    """Return the shared TimeRE, rebuilding it if the locale has changed since it was built."""
+    global _JAPANERA_TimeRE_cache
+    locale_time = _JAPANERA_TimeRE_cache.locale_time
+    if (_getlang() != locale_time.lang or
+            time.tzname != locale_time.tzname or
+            time.daylight != locale_time.daylight):
+        _JAPANERA_TimeRE_cache = TimeRE()
+        _regex_cache.clear()
+    return _JAPANERA_TimeRE_cache
 
-    for index, arg in enumerate([data_string, format]):
-        if not isinstance(arg, str):
-            msg = "strptime() argument {} must be str, not {}"
-            raise TypeError(msg.format(index, type(arg)))
 
+def _format_to_pattern(time_re, format):
+    """Return regex pattern of `format`, converting `TimeRE` errors to `ValueError`."""
+    try:
+        return time_re.pattern(format)
+    # KeyError raised when a bad format is found; can be specified as
+    # \\, in which case it was a stray % but with a space after it
+    except KeyError as err:
+        bad_directive = err.args[0]
+        if bad_directive == "\\":
+            bad_directive = "%"
+        del err
+        raise ValueError("'%s' is a bad directive in format '%s'" %
+                         (bad_directive, format)) from None
+    # IndexError only occurs when the format string is "%"
+    except IndexError:
+        raise ValueError("stray %% in format '%s'" % format) from None
+
+
+def _compile_format(format):
+    """Return a 2-tuple of the compiled regex for `format` and the LocaleTime it was built with."""
     with _cache_lock:
-        global _JAPANERA_TimeRE_cache
-        locale_time = _JAPANERA_TimeRE_cache.locale_time
-        if (_getlang() != locale_time.lang or
-                time.tzname != locale_time.tzname or
-                time.daylight != locale_time.daylight):
-            _JAPANERA_TimeRE_cache = TimeRE()
-            _regex_cache.clear()
-            locale_time = _JAPANERA_TimeRE_cache.locale_time
+        time_re = _get_time_re()
         if len(_regex_cache) > _CACHE_MAX_SIZE:
             _regex_cache.clear()
         format_regex = _regex_cache.get(format)
         if not format_regex:
-            try:
-                format_regex = _JAPANERA_TimeRE_cache.compile(format)
-            # KeyError raised when a bad format is found; can be specified as
-            # \\, in which case it was a stray % but with a space after it
-            except KeyError as err:
-                bad_directive = err.args[0]
-                if bad_directive == "\\":
-                    bad_directive = "%"
-                del err
-                raise ValueError("'%s' is a bad directive in format '%s'" %
-                                 (bad_directive, format)) from None
-            # IndexError only occurs when the format string is "%"
-            except IndexError:
-                raise ValueError("stray %% in format '%s'" % format) from None
+            format_regex = re_compile(_format_to_pattern(time_re, format), IGNORECASE)
             _regex_cache[format] = format_regex
-    found = format_regex.match(data_string)
+        return format_regex, time_re.locale_time
+
+
+# full width ASCII except "％", which would turn literals of formats into directives
+_NORMALIZE_TABLE = {code: code - 0xFEE0 for code in range(0xFF01, 0xFF5F) if code != ord("％")}
+_NORMALIZE_TABLE[ord("　")] = " "
+# square era names, such as "㍻"
+_NORMALIZE_TABLE.update({ord("㍾"): "明治", ord("㍽"): "大正", ord("㍼"): "昭和", ord("㍻"): "平成", ord("㋿"): "令和"})
+_KANJI_DIGIT_TABLE = str.maketrans("〇一二三四五六七八九", "0123456789")
+# "二〇二三" and "〇五" are positional, while a single "五" is left for %-n, %-m and %-d, which take kanji numerals
+_POSITIONAL_KANJI_RE = re_compile("[〇一二三四五六七八九]{2,}|〇")
+
+
+def _positional_kanji_to_digits(found) -> str:
+    return found.group().translate(_KANJI_DIGIT_TABLE)
+
+
+def normalize_date_string(date_string: str) -> str:
+    """
+    Map the variants of date strings into the forms the directives of `strptime` accept.
+    - full width characters, such as "令和５年", to ASCII, such as "令和5年"
+    - ideographic space to " "
+    - square era names, such as "㍻", to kanji, such as "平成"
+    - positional kanji numerals, such as "二〇二三" and "〇五", to ASCII digits.
+      Kanji numerals with "十", "百" and "千", such as "二十三", are left as they are
+
+    `元` is left as it is, since %-y, %-Y, %-n and %-N accept it.
+    """
+    if not isinstance(date_string, str):
+        raise TypeError("date string must be str, not {}".format(type(date_string)))
+    date_string = date_string.translate(_NORMALIZE_TABLE)
+    return _POSITIONAL_KANJI_RE.sub(_positional_kanji_to_digits, date_string)
+
+
+_normalized_formats = {}
+
+
+def _normalize_format(format: str) -> str:
+    """
+    `normalize_date_string` for formats, cached. Literals of the format are normalized same as date strings.
+    """
+    normalized = _normalized_formats.get(format)
+    if normalized is None:
+        if len(_normalized_formats) > _CACHE_MAX_SIZE:
+            _normalized_formats.clear()
+        normalized = _normalized_formats[format] = normalize_date_string(format)
+    return normalized
+
+
+def _strptime(data_string, format="%a %b %d %H:%M:%S %Y"):
+    """Return a 2-tuple consisting of a time struct and an int containing
+    the number of microseconds based on the input string and the
+    format string."""
+
+    if not isinstance(data_string, str):
+        raise TypeError("strptime() argument 0 must be str, not {}".format(type(data_string)))
+    if not isinstance(format, str):
+        raise TypeError("strptime() argument 1 must be str, not {}".format(type(format)))
+    _check_input_length(data_string)
+
+    fast_path = _get_fast_path(format)
+    if fast_path is not None:
+        found = fast_path(data_string)
+        if type(found) is tuple:
+            return found
+    format_regex, locale_time = _compile_format(format)
+    if fast_path is None:
+        found = format_regex.match(data_string)
     if not found:
         raise ValueError("time data %r does not match format %r" %
                          (data_string, format))
     if len(data_string) != found.end():
         raise ValueError("unconverted data remains: %s" %
                          data_string[found.end():])
+    return _parse_found_dict(found.groupdict(), locale_time)
+
+
+def _try_strptime(format_regex, locale_time, data_string, fast_path=None):
+    """
+    Same as `_strptime` with the results of `_compile_format` and `_get_fast_path`,
+    but returns `ParseFailure` instead of raising ValueError.
+    """
+    if not isinstance(data_string, str):
+        raise TypeError("strptime() argument 0 must be str, not {}".format(type(data_string)))
+    if len(data_string) > _max_input_length:
+        return ParseFailure.TOO_LONG
+    if fast_path is not None:
+        found = fast_path(data_string)
+        if type(found) is tuple:
+            return found
+    else:
+        found = format_regex.match(data_string)
+    if not found:
+        return ParseFailure.NO_MATCH
+    if len(data_string) != found.end():
+        return ParseFailure.UNCONVERTED_DATA
+    try:
+        return _parse_found_dict(found.groupdict(), locale_time)
+    except ValueError:  # such as inconsistent ISO week directives, which is rare enough to raise
+        return ParseFailure.INVALID_FIELD
+
+
+# Fast paths are functions generated for formats made only of the directives below and literals.
+# They match with the same regex, but convert the groups by position and lookup tables,
+# instead of `groupdict` and the dispatch of `_parse_found_dict`, and `kanjize` for each field.
+# Groups missing from the tables, such as numbers in non-ASCII digits, are left to the general path.
 
+# directive: (group name, characters to enumerate the lookup table from, max length, variable it sets)
+_TABLE_DIRECTIVES = {
+    '-y': ('_y', "0123456789元", 2, 'relative_year'),
+    '-Y': ('_Y', "0123456789元", 4, 'year'),
+    '-n': ('_n', "一二三四五六七八九十元", 3, 'relative_year'),
+    '-m': ('_m', "0123456789一二三四五六七八九十", 2, 'month'),
+    '-d': ('_d', "0123456789 一二三四五六七八九十", 3, 'day'),
+    'y': ('y', "0123456789", 2, 'year'),
+    'Y': ('Y', "0123456789", 4, 'year'),
+    'm': ('m', "0123456789", 2, 'month'),
+    'd': ('d', "0123456789 ", 2, 'day'),
+    'H': ('H', "0123456789", 2, 'hour'),
+    'M': ('M', "0123456789", 2, 'minute'),
+    'S': ('S', "0123456789", 2, 'second'),
+}
+# directive: (group name, variable it sets)
+_ERA_NAME_DIRECTIVES = {
+    '-K': ('_K', 'era_kanji'),
+    '-E': ('_E', 'era_english'),
+    '-e': ('_e', 'era_english_vowel_shortened'),
+    '-h': ('_h', 'era_head'),
+}
+# where each variable is in the result of `_parse_found_dict`
+_RESULT_INDICES = {'relative_year': (0, 4), 'year': (1, 0), 'month': (1, 1), 'day': (1, 2),
+                   'hour': (1, 3), 'minute': (1, 4), 'second': (1, 5)}
+_DIRECTIVE_RE = re_compile(r"%(-?.)", re.DOTALL)
+
+_fast_path_tables = {}
+_fast_path_cache = {}
+_FAST_PATH_UNKNOWN = object()
+
+
+def _get_fast_path(format):
+    """Return the fast path of `format`, or None if `format` has directives fast paths don't handle."""
+    fast_path = _fast_path_cache.get(format, _FAST_PATH_UNKNOWN)
+    if fast_path is _FAST_PATH_UNKNOWN:
+        fast_path = _build_fast_path(format)
+        if len(_fast_path_cache) > _CACHE_MAX_SIZE:
+            _fast_path_cache.clear()
+        _fast_path_cache[format] = fast_path
+    return fast_path
+
+
+def _fast_path_table(directive):
+    """Return dict of every string `directive` matches, except ones with non-ASCII digits, to its value."""
+    table = _fast_path_tables.get(directive)
+    if table is None:
+        group, alphabet, max_length, variable = _TABLE_DIRECTIVES[directive]
+        time_re = _get_time_re()
+        directive_regex = re_compile(time_re[directive], IGNORECASE)
+        first, second = _RESULT_INDICES[variable]
+        table = {}
+        for length in range(1, max_length + 1):
+            for chars in itertools.product(alphabet, repeat=length):
+                text = "".join(chars)
+                if not directive_regex.fullmatch(text):
+                    continue
+                try:
+                    parsed = _parse_found_dict({group: text}, time_re.locale_time)
+                except ValueError:  # such as " 1" of %-d, which kanji2number rejects. Leave it to the general path
+                    continue
+                table[text] = parsed[first][second]
+        _fast_path_tables[directive] = table
+    return table
+
+
+def _build_fast_path(format):
+    """
+    Generate the fast path of `format`, or return None if `format` can't have one.
+    The fast path returns the same tuple as `_strptime`, or where the general path has to go on,
+    the match of `format_regex` so that it is not matched again, which is None if `format_regex` doesn't match.
+    """
+    format_regex, locale_time = _compile_format(format)  # bad formats raise here, as they do without fast paths
+    directives = [directive for directive in _DIRECTIVE_RE.findall(format) if directive != '%']
+    if not all(directive in _TABLE_DIRECTIVES or directive in _ERA_NAME_DIRECTIVES for directive in directives):
+        return None
+
+    namespace = {"match": format_regex.match}
+    # values of variables no directive sets, same as the ones of `_parse_found_dict`
+    variables = {'era_kanji': 'None', 'era_english': 'None', 'era_english_vowel_shortened': 'None',
+                 'era_head': 'None', 'relative_year': 'None', 'year': 'None', 'month': 'None', 'day': 'None',
+                 'hour': '0', 'minute': '0', 'second': '0'}
+    groups = []
+    lines = ["def fast_path(s):",
+             "    found = match(s)",
+             "    if found is None or found.end() != len(s):",
+             "        return found"]
+    conversions = []
+    for index, directive in enumerate(directives):
+        local = "g{}".format(index)
+        if directive in _ERA_NAME_DIRECTIVES:
+            group, variable = _ERA_NAME_DIRECTIVES[directive]
+            variables[variable] = local
+        else:
+            group, variable = _TABLE_DIRECTIVES[directive][0], _TABLE_DIRECTIVES[directive][3]
+            table = "t{}".format(index)
+            namespace[table] = _fast_path_table(directive)
+            # a later directive setting the same variable wins, as in `_parse_found_dict`
+            variables[variable] = local
+            conversions += ["    {} = {}.get({})".format(local, table, local),
+                            "    if {} is None:".format(local),
+                            "        return found"]
+        groups.append((local, group))
+    if groups:
+        # `group` returns a tuple for more than one group, and a string for one
+        lines.append("    {} = found.group({})".format(", ".join(local for local, _ in groups),
+                                                     ", ".join(repr(group) for _, group in groups)))
+    lines += conversions
+    lines += ["    return (({era_kanji}, {era_english}, {era_english_vowel_shortened}, {era_head}, {relative_year}),"
+              .format(**variables),
+              "            ({year}, {month}, {day}, {hour}, {minute}, {second}, None, None, -1, None, None), 0, 0)"
+              .format(**variables)]
+    exec(compile("\n".join(lines), "<japanera fast path of {!r}>".format(format), "exec"), namespace)
+    return namespace["fast_path"]
+
+
+def _parse_found_dict(found_dict, locale_time):
+    """Convert the named groups of a matched format into the values returned by `_strptime`."""
     iso_year = year = None
     month = day = None
     hour = minute = second = fraction = 0
@@ -236,7 +612,6 @@ def _strptime(data_string, format="%a %b %d %H:%M:%S %Y"):
     # weekday and julian defaulted to None so as to signal need to calculate
     # values
     weekday = julian = None
-    found_dict = found.groupdict()
 
     era_kanji = era_english = era_english_vowel_shortened = era_head = None
     relative_year = None
@@ -446,6 +821,240 @@ def _strptime(data_string, format="%a %b %d %H:%M:%S %Y"):
          gmtoff), fraction, gmtoff_fraction
 
 
+_GROUP_NAME_RE = re_compile(r"\(\?P<([^>]+)>")
+
+
+class _FormatUnion:
+    """Several formats compiled into one alternation, so a string is matched in a single scan.
+
+    Named groups of the i-th format are renamed to `_{i}_{name}` and the whole
+    format is wrapped in the group `_{i}`, which tells which format matched.
+    """
+
+    def __init__(self, formats):
+        if not formats:
+            raise ValueError("at least one format is required")
+        self.formats = tuple(formats)
+        for index, format in enumerate(self.formats):
+            if not isinstance(format, str):
+                msg = "format {} must be str, not {}"
+                raise TypeError(msg.format(index, type(format)))
+
+        with _cache_lock:
+            time_re = _get_time_re()
+        self.locale_time = time_re.locale_time
+
+        branches = []
+        self._branch_groups = {}
+        for index, format in enumerate(self.formats):
+            prefix = "_%d_" % index
+            pattern = _format_to_pattern(time_re, format)
+            names = tuple(_GROUP_NAME_RE.findall(pattern))
+            pattern = _GROUP_NAME_RE.sub(lambda m: "(?P<%s%s>" % (prefix, m.group(1)), pattern)
+            branches.append("(?P<_%d>%s)" % (index, pattern))
+            self._branch_groups["_%d" % index] = (index, names, tuple(prefix + name for name in names))
+        self.regex = re_compile("(?:%s)\\Z" % "|".join(branches), IGNORECASE)
+
+    def match(self, data_string):
+        """Return a 2-tuple of the index of the matched format and its `_strptime` values, or None."""
+        if not isinstance(data_string, str):
+            msg = "strptime() argument 0 must be str, not {}"
+            raise TypeError(msg.format(type(data_string)))
+        if len(data_string) > _max_input_length:
+            return None
+        found = self.regex.match(data_string)
+        if not found:
+            return None
+        index, names, prefixed_names = self._branch_groups[found.lastgroup]
+        if len(names) == 1:
+            found_dict = {names[0]: found.group(prefixed_names[0])}
+        else:
+            found_dict = dict(zip(names, found.group(*prefixed_names))) if names else {}
+        return index, _parse_found_dict(found_dict, self.locale_time)
+
+
+# `\d` and `\s` of str patterns match any Unicode digit and space, but in data of legacy encodings
+# only ASCII and full-width ones can appear
+_BYTES_CATEGORIES = {
+    _sre_constants.CATEGORY_DIGIT: "0123456789０１２３４５６７８９",
+    _sre_constants.CATEGORY_SPACE: " \t\n\r\f\v　",
+}
+_MAX_BYTES_CLASS_SIZE = 1024
+
+
+class _Unencodable(Exception):
+    pass
+
+
+class _BytesPatternTranslator:
+    """Translate a str regex pattern into a bytes regex pattern matching the same text in `encoding`.
+
+    Characters are matched as their encoded byte sequences, so character classes with
+    non-ASCII members become alternations. Alternatives with characters `encoding` can't
+    represent are dropped, since they never appear in data of that encoding.
+    Letters are expanded into both cases instead of compiling with IGNORECASE, which would
+    also fold trail bytes of multibyte characters, such as b'\x94N' (年) and b'\x94n' (馬) in CP932.
+    """
+
+    def __init__(self, encoding):
+        self.encoding = encoding
+        self.group_names = {}
+
+    def translate(self, pattern):
+        parsed = _sre_parse.parse(pattern)
+        self.group_names = {index: name for name, index in parsed.state.groupdict.items()}
+        return self.sequence(parsed)
+
+    def encode(self, char):
+        try:
+            return char.encode(self.encoding)
+        except UnicodeEncodeError:
+            raise _Unencodable(char) from None
+
+    def sequence(self, items):
+        return b"".join(self.item(op, av) for op, av in items)
+
+    def item(self, op, av):
+        if op is _sre_constants.LITERAL:
+            char = chr(av)
+            if len(_case_variants(char)) == 1:
+                return re.escape(self.encode(char))
+            return self.chars_pattern([char])
+        if op is _sre_constants.IN:
+            return self.char_class(av)
+        if op is _sre_constants.BRANCH:
+            branches = []
+            for branch in av[1]:
+                try:
+                    branches.append(self.sequence(branch))
+                except _Unencodable:
+                    continue
+            if not branches:
+                raise _Unencodable(None)
+            return b"(?:" + b"|".join(branches) + b")"
+        if op is _sre_constants.SUBPATTERN:
+            group, add_flags, del_flags, items = av
+            body = self.sequence(items)
+            if group is None:
+                return b"(?:" + body + b")"
+            if group in self.group_names:
+                return b"(?P<" + self.group_names[group].encode("ascii") + b">" + body + b")"
+            return b"(" + body + b")"
+        if op is _sre_constants.MAX_REPEAT or op is _sre_constants.MIN_REPEAT:
+            minimum, maximum, items = av
+            maximum = b"" if maximum is _sre_constants.MAXREPEAT else str(maximum).encode("ascii")
+            repeat = b"{" + str(minimum).encode("ascii") + b"," + maximum + b"}"
+            if op is _sre_constants.MIN_REPEAT:
+                repeat += b"?"
+            return b"(?:" + self.sequence(items) + b")" + repeat
+        if (op is _sre_constants.ASSERT or op is _sre_constants.ASSERT_NOT) and av[0] == 1:  # lookahead
+            try:
+                body = self.sequence(av[1])
+            except _Unencodable:
+                if op is _sre_constants.ASSERT:
+                    raise
+                return b""  # what can't appear in data never follows
+            return (b"(?=" if op is _sre_constants.ASSERT else b"(?!") + body + b")"
+        if op is _sre_constants.AT:
+            return {_sre_constants.AT_BEGINNING: b"^", _sre_constants.AT_END: b"$",
+                    _sre_constants.AT_BEGINNING_STRING: b"\\A", _sre_constants.AT_END_STRING: b"\\Z"}[av]
+        raise ValueError("regex %s can't be used to parse bytes" % op)
+
+    def char_class(self, items):
+        chars = []
+        for op, av in items:
+            if op is _sre_constants.LITERAL:
+                chars.append(chr(av))
+            elif op is _sre_constants.RANGE:
+                if av[1] - av[0] >= _MAX_BYTES_CLASS_SIZE:
+                    raise ValueError("character range is too large to parse bytes")
+                chars.extend(chr(code) for code in range(av[0], av[1] + 1))
+            elif op is _sre_constants.CATEGORY and av in _BYTES_CATEGORIES:
+                chars.extend(_BYTES_CATEGORIES[av])
+            else:
+                raise ValueError("regex %s can't be used to parse bytes" % op)
+        return self.chars_pattern(chars)
+
+    def chars_pattern(self, chars):
+        """Return a pattern matching any of `chars` in either case."""
+        single_bytes, sequences = [], []
+        for char in dict.fromkeys(variant for char in chars for variant in _case_variants(char)):
+            try:
+                encoded = self.encode(char)
+            except _Unencodable:
+                continue
+            if len(encoded) == 1:
+                single_bytes.append(re.escape(encoded))
+            else:
+                sequences.append(re.escape(encoded))
+        if single_bytes:
+            sequences.append(b"[" + b"".join(single_bytes) + b"]")
+        if not sequences:
+            raise _Unencodable(None)
+        return b"(?:" + b"|".join(sequences) + b")"
+
+
+def _case_variants(char):
+    """Return `char` and its other cases of single character, which IGNORECASE of str patterns matches."""
+    return [variant for variant in dict.fromkeys((char, char.lower(), char.upper())) if len(variant) == 1]
+
+
+_encoding_names = {}
+
+
+def _normalize_encoding(encoding):
+    """Return canonical name of `encoding`, which must be ASCII compatible."""
+    name = _encoding_names.get(encoding)
+    if name is None:
+        name = codecs.lookup(encoding).name
+        if "0123456789%:-./ Zz".encode(name) != b"0123456789%:-./ Zz":
+            raise ValueError("encoding %r is not ASCII compatible" % encoding)
+        _encoding_names[encoding] = name
+    return name
+
+
+def _compile_bytes_format(format, encoding):
+    """Return a 3-tuple of the compiled bytes regex for `format` in `encoding`,
+    the normalized encoding and the LocaleTime it was built with."""
+    encoding = _normalize_encoding(encoding)
+    with _cache_lock:
+        time_re = _get_time_re()
+        # kept on the TimeRE, so they are dropped together whenever it is rebuilt
+        bytes_regex_cache = time_re.__dict__.setdefault("bytes_regex_cache", {})
+        if len(bytes_regex_cache) > _CACHE_MAX_SIZE:
+            bytes_regex_cache.clear()
+        format_regex = bytes_regex_cache.get((format, encoding))
+        if not format_regex:
+            try:
+                pattern = _BytesPatternTranslator(encoding).translate(_format_to_pattern(time_re, format))
+            except _Unencodable:
+                raise ValueError("format %r can't be matched in %s" % (format, encoding)) from None
+            format_regex = re_compile(pattern)
+            bytes_regex_cache[(format, encoding)] = format_regex
+        return format_regex, encoding, time_re.locale_time
+
+
+def _strptime_bytes(data, format, encoding="utf-8"):
+    """Same as `_strptime`, but `data` is bytes-like object such as bytes, memoryview or mmap in `encoding`.
+    `data` is matched without being decoded, and only the matched groups are decoded."""
+    if not isinstance(format, str):
+        msg = "strptime() argument 1 must be str, not {}"
+        raise TypeError(msg.format(type(format)))
+
+    format_regex, encoding, locale_time = _compile_bytes_format(format, encoding)
+    _check_input_length(data)
+    found = format_regex.match(data)
+    if not found:
+        raise ValueError("time data %r does not match format %r" %
+                         (bytes(data[:100]), format))
+    if len(data) != found.end():
+        raise ValueError("unconverted data remains: %r" %
+                         bytes(data[found.end():found.end() + 100]))
+    found_dict = {name: value.decode(encoding) if value is not None else None
+                  for name, value in found.groupdict().items()}
+    return _parse_found_dict(found_dict, locale_time)
+
+
 def find_era_and_date(era_kanji: Optional[str] = None,
                       era_english: Optional[str] = None,
                       era_english_vowel_shortened: Optional[str] = None,
@@ -455,6 +1064,7 @@ def find_era_and_date(era_kanji: Optional[str] = None,
                       month: Optional[int] = None,
                       day: Optional[int] = None,
                       allow_date_after_end_of_era: bool = False,
+                      prefer=None,
                       ) -> List[Tuple["Era", datetime.date]]:
     """
     Find era and date from given information.
@@ -468,29 +1078,111 @@ def find_era_and_date(era_kanji: Optional[str] = None,
         month: Month
         day: Day
         allow_date_after_end_of_era: If True, allow date after end of era
+        prefer: Order of result. See `iter_era_and_date`
 
     Returns: List of era and date
 
+    """
+    return list(iter_era_and_date(era_kanji, era_english, era_english_vowel_shortened, era_head_english,
+                                  absolute_year, relative_year, month, day, allow_date_after_end_of_era, prefer))
+
+
+def iter_era_and_date(era_kanji: Optional[str] = None,
+                      era_english: Optional[str] = None,
+                      era_english_vowel_shortened: Optional[str] = None,
+                      era_head_english: Optional[str] = None,
+                      absolute_year: Optional[int] = None,
+                      relative_year: Optional[int] = None,
+                      month: Optional[int] = None,
+                      day: Optional[int] = None,
+                      allow_date_after_end_of_era: bool = False,
+                      prefer=None,
+                      ) -> Iterator[Tuple["Era", datetime.date]]:
+    """
+    Lazy version of `find_era_and_date`. The date of each candidate era is computed only when it is consumed.
+    Args:
+        era_kanji: Kanji of era name
+        era_english: English of era name
+        era_english_vowel_shortened: English of era name with vowel shortened
+        era_head_english: English of era name with only first letter
+        absolute_year: Absolute year
+        relative_year: Relative year from era
+        month: Month
+        day: Day
+        allow_date_after_end_of_era: If True, allow date after end of era
+        prefer: Order of candidates.
+            None: earliest starting era first
+            "latest": latest starting era first, which is the era `EraDate(year, month, day)` picks
+            EraType or sequence of EraType: eras of given types first, in given order
+
+    Returns: Iterator of era and date
+
+    """
+    era_set = _find_era_set(era_kanji, era_english, era_english_vowel_shortened, era_head_english, absolute_year)
+    if era_set is not None and not era_set:
+        raise ValueError("Era_ information given but no match era found.")
+
+    yield from _iter_dates_in_eras(_sort_eras(era_set or _all_eras(), prefer), absolute_year, relative_year,
+                                   month, day, allow_date_after_end_of_era)
+
+
+def _first_era_and_date(era_kanji: Optional[str] = None,
+                        era_english: Optional[str] = None,
+                        era_english_vowel_shortened: Optional[str] = None,
+                        era_head_english: Optional[str] = None,
+                        absolute_year: Optional[int] = None,
+                        relative_year: Optional[int] = None,
+                        month: Optional[int] = None,
+                        day: Optional[int] = None,
+                        allow_date_after_end_of_era: bool = False,
+                        prefer=None,
+                        ) -> Union[Tuple["Era", datetime.date], "ParseFailure"]:
+    """
+    Same as the first item of `iter_era_and_date`, but returns `ParseFailure` instead of raising ValueError.
+    """
+    era_set = _find_era_set(era_kanji, era_english, era_english_vowel_shortened, era_head_english, absolute_year)
+    if era_set is not None and not era_set:
+        return ParseFailure.UNKNOWN_ERA
+    era_list = _sort_eras(era_set or _all_eras(), prefer)
+    try:
+        for found in _iter_dates_in_eras(era_list, absolute_year, relative_year, month, day,
+                                         allow_date_after_end_of_era):
+            return found
+    except ValueError:  # such as year out of range of `datetime.date`
+        return ParseFailure.INVALID_FIELD
+    return ParseFailure.DATE_NOT_IN_ERA
+
+
+def _all_eras() -> List["Era"]:
+    return _ERA_DATA_GENERAL + _ERA_DATA_COMMON + _ERA_DATA_DAIKAKUJI + _ERA_DATA_JIMYOUIN
+
+
+def _find_era_set(era_kanji, era_english, era_english_vowel_shortened, era_head_english,
+                  absolute_year, name_dicts=None, eras_with_year=None) -> Optional[Set["Era"]]:
+    """
+    Args:
+        name_dicts: dicts of era names to look up, same as the ones of `TimeRE`. The module level ones by default
+        eras_with_year: function finding eras of absolute year. `find_eras_with_year` by default
+
+    Returns: eras matching all of given era information, or None if none is given
     """
     era_set = None
 
-    for text, _dict in zip((era_kanji, era_english, era_english_vowel_shortened, era_head_english),
-                           (_era_kanji_dict, _era_alphabet_dict, _era_alphabet_vowel_shortened_dict,
-                            _era_alphabet_head_dict)):
+    if name_dicts is None:
+        name_dicts = (_era_kanji_dict, _era_alphabet_dict, _era_alphabet_vowel_shortened_dict,
+                      _era_alphabet_head_dict)
+    for text, _dict in zip((era_kanji, era_english, era_english_vowel_shortened, era_head_english), name_dicts):
         if text:
-            _found = _dict[text]
+            _found = _dict.get(text, _NO_ERAS)
             era_set = era_set & _found if era_set else _found
     if absolute_year is not None:
-        _found = find_eras_with_year(absolute_year)
+        _found = (eras_with_year or find_eras_with_year)(absolute_year)
         era_set = era_set & _found if era_set else _found
-    if (era_kanji or era_english or era_english_vowel_shortened or
-        era_head_english or absolute_year is not None) and not era_set:
-        raise ValueError("Era_ information given but no match era found.")
+    return era_set
 
-    era_set = era_set or _ERA_DATA_GENERAL + _ERA_DATA_COMMON + _ERA_DATA_DAIKAKUJI + _ERA_DATA_JIMYOUIN
-    era_list = sorted(era_set, key=lambda x: (x.since, x.era_type.value))
 
-    result = []
+def _iter_dates_in_eras(era_list, absolute_year, relative_year, month, day,
+                        allow_date_after_end_of_era) -> Iterator[Tuple["Era", datetime.date]]:
     for era in era_list:
         dt = era.since
         if absolute_year is not None and absolute_year != dt.year:
@@ -528,8 +1220,39 @@ def find_era_and_date(era_kanji: Optional[str] = None,
                 continue
         elif dt not in era:
             continue
-        result.append((era, dt))
-    return result
+        yield era, dt
+
+
+def _sort_eras(eras, prefer=None) -> List["Era"]:
+    """
+    Sort `eras` by the order `prefer` describes. See `iter_era_and_date`.
+    """
+    era_list = sorted(eras, key=lambda x: (x.since, x.era_type.value))
+    if prefer is None:
+        return era_list
+    if prefer == "latest":
+        era_list.reverse()
+        return era_list
+    if isinstance(prefer, str):
+        raise ValueError("unknown prefer policy %r" % prefer)
+    priority = {era_type: i for i, era_type in enumerate([prefer] if isinstance(prefer, EraType) else prefer)}
+    # sort is stable, so the default order is kept within each priority
+    return sorted(era_list, key=lambda x: priority.get(x.era_type, len(priority)))
+
+
+def find_eras_with_name(name: str) -> FrozenSet["Era"]:
+    """
+    Find all eras called `name`, whichever of kanji, English, vowel shortened English or head letter it is,
+    in any case, width and with or without macrons. For example, "Shouwa", "Showa", "Shōwa", "SHOWA" and "昭和".
+    Args:
+        name: era name
+
+    Returns: frozenset of Era called `name`. Empty if none
+    """
+    eras = _era_name_index.get(name)
+    if eras is None:
+        eras = _era_name_index.get(_era_name_key(name), _NO_ERAS)
+    return eras
 
 
 def find_closest_leap_year(year: int) -> int:
@@ -550,6 +1273,40 @@ def find_closest_leap_year(year: int) -> int:
     return year + (4 - year % 4)
 
 
+def _build_era_index(eras) -> Tuple[List[int], List[Tuple["Era", ...]]]:
+    """
+    Split the timeline at every start and end of `eras`, so each interval is contained by a fixed set of eras.
+    Eras of each interval are sorted in the same order as `find_era_and_date`.
+    """
+    starting = defaultdict(list)
+    ending = defaultdict(list)
+    for era in eras:
+        starting[era.since.toordinal()].append(era)
+        if era.until:
+            ending[era.until.toordinal()].append(era)
+
+    starts, era_tuples = [], []
+    active = set()
+    for boundary in sorted(set(starting) | set(ending) | {1}):
+        active.difference_update(ending.get(boundary, ()))
+        active.update(starting.get(boundary, ()))
+        starts.append(boundary)
+        era_tuples.append(tuple(sorted(active, key=lambda x: (x.since, x.era_type.value))))
+    return starts, era_tuples
+
+
+def find_eras_with_ordinal(ordinal: int) -> Tuple["Era", ...]:
+    """
+    Find all eras that contains the date of proleptic Gregorian `ordinal`, by bisecting the precomputed interval index.
+    Args:
+        ordinal: ordinal of date to find, same as `datetime.date.toordinal()`
+
+    Returns: tuple of Era that contains the date, in the same order as `find_era_and_date`.
+        So the last one is the era `EraDate` picks.
+    """
+    return _era_index_eras[bisect_right(_era_index_starts, ordinal) - 1]
+
+
 def find_eras_with_year(year: int) -> Set["Era"]:
     """
     Find all eras that contains `year`.
@@ -558,6 +1315,14 @@ def find_eras_with_year(year: int) -> Set["Era"]:
 
     Returns: set of Era that contains `year`
     """
+    return _find_eras_with_year(year, _ERA_DATA_COMMON,
+                                (_ERA_DATA_GENERAL, _ERA_DATA_DAIKAKUJI, _ERA_DATA_JIMYOUIN))
+
+
+def _find_eras_with_year(year: int, era_data_common, era_lists) -> Set["Era"]:
+    """
+    `find_eras_with_year` over given era data. Each of `era_lists` must be sorted by `since` without overlaps.
+    """
 
     def _find_first_era_after_year_index(era_list: List["Era"]) -> int:
         # return the index of first era that starts after `year`
@@ -571,8 +1336,8 @@ def find_eras_with_year(year: int) -> Set["Era"]:
                 ok = mid
         return ok
 
-    result = set(_ERA_DATA_COMMON)
-    for era_list in (_ERA_DATA_GENERAL, _ERA_DATA_DAIKAKUJI, _ERA_DATA_JIMYOUIN):
+    result = set(era_data_common)
+    for era_list in era_lists:
         for i in range(_find_first_era_after_year_index(era_list) - 1, -1, -1):
             era = era_list[i]
             # we know that this era must be started before or exact `year`
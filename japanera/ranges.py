@@ -0,0 +1,132 @@
+"""
+Gregorian date bounds of era and era year ranges.
+
+`wareki_range_bounds` turns expressions such as "平成10年〜令和2年" or "昭和" into half-open `[start, end)` bounds
+of `datetime.date`, computed from `since` and `until` of eras only, which the era interval index is built from::
+
+    start, end = wareki_range_bounds("平成10年〜令和2年")  # (datetime.date(1998, 1, 1), datetime.date(2021, 1, 1))
+    cursor.execute("SELECT * FROM events WHERE ? <= day AND day < ?", (start, end))
+
+An era year is clipped to the part of the Gregorian year its era covers, so "平成31年" ends at 2019-05-01,
+the first day of 令和, and "令和元年" starts there.
+"""
+import datetime
+import re
+from typing import Dict, FrozenSet, Optional, Tuple
+
+from kanjize import kanji2number
+
+from . import parser
+from .japanera import Era
+
+Bounds = Tuple[Optional[datetime.date], Optional[datetime.date]]
+
+# `normalize_date_string` has already made full width tilde and hyphen ASCII
+_SEPARATOR_RE = re.compile(r"\s*(?:[~〜\-‐–—]|から)\s*")
+_YEAR_RE = re.compile(r"\s*(?:(?P<digits>\d+)|(?P<first>元)|(?P<kanji>[〇一二三四五六七八九十百千]+))\s*年?")
+
+
+def _parse_side(text: str, default_eras: FrozenSet[Era]) -> Tuple[FrozenSet[Era], Optional[int]]:
+    """
+    Split one side of a range into the eras called by its name, and its relative year if given.
+    The longest known era name wins, so "元禄元年" is 元禄 and 1, not 元 and 禄元.
+    Args:
+        text: era name followed by optional relative year, such as "平成10年"
+        default_eras: eras of text without era name, such as "20年" of "平成10年〜20年"
+
+    Returns: eras and relative year
+    """
+    eras = parser.find_eras_with_name(text)
+    if eras:
+        return eras, None
+    for split in range(len(text) - 1, -1, -1):
+        found = _YEAR_RE.fullmatch(text, split)
+        if found is None:
+            continue
+        name = text[:split]
+        eras = parser.find_eras_with_name(name) if name else default_eras
+        if not eras:
+            continue
+        if found.group("digits"):
+            relative_year = int(found.group("digits"))
+        elif found.group("first"):
+            relative_year = 1
+        else:
+            try:
+                relative_year = kanji2number(found.group("kanji"))
+            except ValueError:
+                raise ValueError("invalid year %r" % text[split:]) from None
+        return eras, relative_year
+    raise ValueError("no era found in %r" % text)
+
+
+def _era_year_bounds(era: Era, relative_year: Optional[int]) -> Optional[Bounds]:
+    """
+    Returns: bounds of `era`, or of `relative_year` of `era` clipped to `era`. None if `era` doesn't have the year
+    """
+    if relative_year is None:
+        return era.since, era.until
+    year = era.relative_year_to_absolute_year(relative_year)
+    if relative_year < 1 or year > datetime.MAXYEAR or (era.until is not None and era.until.year < year) \
+            or era.until == datetime.date(year, 1, 1):
+        return None
+    start = max(era.since, datetime.date(year, 1, 1))
+    end = datetime.date(year + 1, 1, 1) if year < datetime.MAXYEAR else None
+    if era.until is not None and (end is None or era.until < end):
+        end = era.until
+    return start, end
+
+
+def _side_bounds(text: str, default_eras: FrozenSet[Era], prefer) -> Tuple[Era, Bounds]:
+    eras, relative_year = _parse_side(text, default_eras)
+    # eras of the same bounds are the same for queries, such as 建武 of GENERAL and DAIKAKUJI
+    candidates: Dict[Bounds, Era] = {}
+    for era in parser._sort_eras(eras, prefer):
+        bounds = _era_year_bounds(era, relative_year)
+        if bounds is not None:
+            candidates.setdefault(bounds, era)
+    if not candidates:
+        raise ValueError("no era of %r has the year" % text)
+    if len(candidates) > 1 and prefer is None:
+        raise ValueError("%r is ambiguous between %s. Give `prefer` to choose one" %
+                         (text, ", ".join("{}({})".format(era.kanji, era.since) for era in candidates.values())))
+    bounds, era = next(iter(candidates.items()))
+    return era, bounds
+
+
+def wareki_range_bounds(expression: str, prefer=None) -> Bounds:
+    """
+    Convert era or era year, or range of them, into half-open Gregorian bounds `[start, end)`.
+    Args:
+        expression: "昭和", "平成10年", "平成10年〜令和2年", "平成10年〜20年" or open ended "平成10年〜" and "〜平成10年".
+            Era names are any of `find_eras_with_name` accepts, years are digits, kanji numerals or 元,
+            and sides are separated by 〜, ~, - or から. "平成10年まで" is same as "〜平成10年".
+            Normalized with `normalize_date_string` first
+        prefer: which era to take if an era name is ambiguous, same as `EraDate.strptime`.
+            If None, ambiguous names raise ValueError unless all the eras have the same bounds
+
+    Returns: (start, end) of dates `start <= date < end`. None of open ended side, or of `end` of the current era
+    """
+    text = parser.normalize_date_string(expression).strip()
+    until = text.endswith("まで")
+    if until:
+        text = text[:-2].rstrip()
+    sides = _SEPARATOR_RE.split(text, maxsplit=1)
+    if len(sides) == 1:
+        start, end = _side_bounds(sides[0], parser._NO_ERAS, prefer)[1]
+        # "平成10年まで" is up to the end of 平成10年
+        return (None, end) if until else (start, end)
+
+    left, right = sides
+    if not left and not right:
+        raise ValueError("no era found in %r" % expression)
+    start = end = None
+    left_eras = parser._NO_ERAS
+    if left:
+        era, (start, _) = _side_bounds(left, parser._NO_ERAS, prefer)
+        left_eras = frozenset([era])
+    if right:
+        _, (_, end) = _side_bounds(right, left_eras, prefer)
+    if start is not None and end is not None and end <= start:
+        raise ValueError("%r ends before it starts" % expression)
+    return start, end
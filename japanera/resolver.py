@@ -0,0 +1,214 @@
+"""
+Era resolution restricted to chosen era types.
+
+`Resolver` has its own era name indexes, interval index and `TimeRE` built only from eras of the given types,
+so candidates, regexes of era name directives and memory shrink for callers which never see the other eras::
+
+    resolver = Resolver({EraType.GENERAL, EraType.COMMON})
+    resolver.from_date(datetime.date(1340, 1, 1))  # in 西暦, since no GENERAL era is in the Nanboku-chō period
+    resolver.strptime("令和05年03月07日", "%-K%-y年%m月%d日")
+
+Eras are taken from `ERA_DATA_COMMON`, `ERA_DATA_GENERAL`, `ERA_DATA_DAIKAKUJI` and `ERA_DATA_JIMYOUIN`
+when the resolver is created.
+"""
+import datetime
+import time
+from bisect import bisect_right
+from typing import FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from _strptime import _CACHE_MAX_SIZE, IGNORECASE, _cache_lock, _getlang, re_compile
+
+from . import parser
+from .era_data import EraType
+from .japanera import (Era, EraDate, EraDateTime, ERA_DATA_COMMON, ERA_DATA_GENERAL, ERA_DATA_DAIKAKUJI,
+                       ERA_DATA_JIMYOUIN, JST, _take, _timezone)
+
+
+class Resolver:
+    def __init__(self, era_types: Iterable[EraType]):
+        """
+        Args:
+            era_types: types of eras to resolve, such as `{EraType.GENERAL, EraType.COMMON}`
+        """
+        self.era_types = frozenset(era_types)
+        if not self.era_types:
+            raise ValueError("at least one era type is required")
+        # same order as `japanera.parser._all_eras`
+        era_data = [(era_type, era_list) for era_type, era_list in ((EraType.GENERAL, ERA_DATA_GENERAL),
+                                                                    (EraType.COMMON, ERA_DATA_COMMON),
+                                                                    (EraType.DAIKAKUJI, ERA_DATA_DAIKAKUJI),
+                                                                    (EraType.JIMYOUIN, ERA_DATA_JIMYOUIN))
+                    if era_type in self.era_types]
+        self.eras: List[Era] = [era for _, era_list in era_data for era in era_list]
+        self._common = ERA_DATA_COMMON if EraType.COMMON in self.era_types else []
+        self._era_lists = tuple(era_list for era_type, era_list in era_data if era_type != EraType.COMMON)
+
+        indexes = parser._build_name_indexes(self.eras)
+        self._name_dicts, self._name_index = indexes[:4], indexes[4]
+
+        self._index_starts, self._index_eras = parser._build_era_index(self.eras)
+        self._time_re = parser.TimeRE(name_dicts=self._name_dicts)
+        self._regex_cache = {}
+
+    def __repr__(self):
+        return "Resolver({!r})".format(sorted(self.era_types, key=lambda era_type: era_type.value))
+
+    def find_eras_with_ordinal(self, ordinal: int) -> Tuple[Era, ...]:
+        """
+        Same as `japanera.parser.find_eras_with_ordinal`, but only eras in scope.
+        """
+        return self._index_eras[bisect_right(self._index_starts, ordinal) - 1]
+
+    def find_eras_with_name(self, name: str) -> FrozenSet[Era]:
+        """
+        Same as `japanera.parser.find_eras_with_name`, but only eras in scope.
+        """
+        eras = self._name_index.get(name)
+        if eras is None:
+            eras = self._name_index.get(parser._era_name_key(name), parser._NO_ERAS)
+        return eras
+
+    def find_eras_with_year(self, year: int) -> Set[Era]:
+        """
+        Same as `japanera.parser.find_eras_with_year`, but only eras in scope.
+        """
+        return parser._find_eras_with_year(year, self._common, self._era_lists)
+
+    def _last_era(self, ordinal: int) -> Era:
+        eras = self._index_eras[bisect_right(self._index_starts, ordinal) - 1]
+        if not eras:
+            raise ValueError("Era not found")
+        return eras[-1]
+
+    def from_date(self, dt: datetime.date) -> EraDate:
+        """
+        Same as `EraDate.from_date(dt)`, but the era is the latest starting one in scope.
+        """
+        return EraDate._from_trusted(dt.year, dt.month, dt.day, self._last_era(dt.toordinal()))
+
+    def from_ordinal(self, ordinal: int) -> EraDate:
+        """
+        Same as `EraDate.from_ordinal(ordinal)`, but the era is the latest starting one in scope.
+        """
+        dt = datetime.date.fromordinal(ordinal)
+        return EraDate._from_trusted(dt.year, dt.month, dt.day, self._last_era(ordinal))
+
+    def list_from_date(self, dt: datetime.date) -> List[EraDate]:
+        """
+        Same as `EraDate.list_from_date(dt)`, but only eras in scope.
+        """
+        eras = self.find_eras_with_ordinal(dt.toordinal())
+        if not eras:
+            raise ValueError("Era not found")
+        return [EraDate._from_trusted(dt.year, dt.month, dt.day, era) for era in eras]
+
+    def from_datetime(self, dtt: datetime.datetime, in_jst: bool = False) -> EraDateTime:
+        """
+        Same as `EraDateTime.from_datetime(dtt, in_jst=in_jst)`, but the era is the latest starting one in scope.
+        """
+        if in_jst and dtt.utcoffset() is not None:
+            dtt = dtt.astimezone(JST)
+        return EraDateTime._from_trusted(dtt.year, dtt.month, dtt.day, self._last_era(dtt.toordinal()), dtt.hour,
+                                         dtt.minute, dtt.second, dtt.microsecond, dtt.tzinfo, dtt.fold)
+
+    def strftime(self, dtt: Union[datetime.date, datetime.datetime], format: str) -> str:
+        """
+        Same as `EraDate.from_date(dtt).strftime(format)`, but the era is the latest starting one in scope.
+        """
+        if isinstance(dtt, datetime.datetime):
+            return self.from_datetime(dtt).strftime(format)
+        return self.from_date(dtt).strftime(format)
+
+    def _compile_format(self, format: str):
+        """Same as `japanera.parser._compile_format` with the `TimeRE` of this resolver."""
+        with _cache_lock:
+            locale_time = self._time_re.locale_time
+            if (_getlang() != locale_time.lang or
+                    time.tzname != locale_time.tzname or
+                    time.daylight != locale_time.daylight):
+                self._time_re = parser.TimeRE(name_dicts=self._name_dicts)
+                self._regex_cache.clear()
+            if len(self._regex_cache) > _CACHE_MAX_SIZE:
+                self._regex_cache.clear()
+            format_regex = self._regex_cache.get(format)
+            if not format_regex:
+                format_regex = re_compile(parser._format_to_pattern(self._time_re, format), IGNORECASE)
+                self._regex_cache[format] = format_regex
+            return format_regex, self._time_re.locale_time
+
+    def _strptime(self, date_string: str, format: str):
+        if not isinstance(date_string, str):
+            raise TypeError("strptime() argument 0 must be str, not {}".format(type(date_string)))
+        if not isinstance(format, str):
+            raise TypeError("strptime() argument 1 must be str, not {}".format(type(format)))
+        parser._check_input_length(date_string)
+        format_regex, locale_time = self._compile_format(format)
+        found = format_regex.match(date_string)
+        if not found:
+            raise ValueError("time data %r does not match format %r" % (date_string, format))
+        if len(date_string) != found.end():
+            raise ValueError("unconverted data remains: %s" % date_string[found.end():])
+        return parser._parse_found_dict(found.groupdict(), locale_time)
+
+    def iter_era_and_date(self, era_kanji: Optional[str] = None,
+                          era_english: Optional[str] = None,
+                          era_english_vowel_shortened: Optional[str] = None,
+                          era_head_english: Optional[str] = None,
+                          absolute_year: Optional[int] = None,
+                          relative_year: Optional[int] = None,
+                          month: Optional[int] = None,
+                          day: Optional[int] = None,
+                          allow_date_after_end_of_era: bool = False,
+                          prefer=None,
+                          ) -> Iterator[Tuple[Era, datetime.date]]:
+        """
+        Same as `japanera.parser.iter_era_and_date`, but only eras in scope are candidates.
+        """
+        era_set = parser._find_era_set(era_kanji, era_english, era_english_vowel_shortened, era_head_english,
+                                       absolute_year, self._name_dicts, self.find_eras_with_year)
+        if era_set is not None and not era_set:
+            raise ValueError("Era_ information given but no match era found.")
+
+        yield from parser._iter_dates_in_eras(parser._sort_eras(era_set or self.eras, prefer), absolute_year,
+                                              relative_year, month, day, allow_date_after_end_of_era)
+
+    def iter_strptime(self, date_string: str, format: str, allow_date_after_end_of_era=False,
+                      prefer=None) -> Iterator[EraDate]:
+        """
+        Same as `EraDate.iter_strptime`, but only era names and eras in scope are accepted.
+        """
+        return self._iter_from_parsed(EraDate, self._strptime(date_string, format), allow_date_after_end_of_era,
+                                      prefer)
+
+    def strptime(self, date_string: str, format: str, allow_date_after_end_of_era=False, prefer=None,
+                 limit: Optional[int] = None) -> List[EraDate]:
+        """
+        Same as `EraDate.strptime`, but only era names and eras in scope are accepted.
+        """
+        return _take(self.iter_strptime(date_string, format, allow_date_after_end_of_era, prefer), limit)
+
+    def strptime_datetime(self, date_string: str, format: str, allow_date_after_end_of_era=False, prefer=None,
+                          limit: Optional[int] = None) -> List[EraDateTime]:
+        """
+        Same as `EraDateTime.strptime`, but only era names and eras in scope are accepted.
+        """
+        return _take(self._iter_from_parsed(EraDateTime, self._strptime(date_string, format),
+                                            allow_date_after_end_of_era, prefer), limit)
+
+    def _iter_from_parsed(self, cls, parsed, allow_date_after_end_of_era=False, prefer=None) -> Iterator[EraDate]:
+        (era_kanji, era_english, era_english_vowel_shortened, era_head, relative_year), \
+        (year, month, day, hour, minute, second, weekday, julian, tz, tzname, gmtoff), \
+        fraction, gmtoff_fraction = parsed
+        time_fields = () if cls is EraDate else (hour, minute, second, fraction,
+                                                  _timezone(gmtoff, gmtoff_fraction, tzname))
+        found = False
+        for era, date in self.iter_era_and_date(era_kanji, era_english, era_english_vowel_shortened, era_head, year,
+                                                relative_year, month, day, allow_date_after_end_of_era, prefer):
+            found = True
+            if allow_date_after_end_of_era:
+                # `date` can be after the end of `era`, so let the constructor warn about it
+                yield cls(date.year, date.month, date.day, *time_fields, era=era)
+            else:
+                yield cls._from_trusted(date.year, date.month, date.day, era, *time_fields)
+        if not found:
+            raise ValueError("EraDate not found")
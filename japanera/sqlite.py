@@ -0,0 +1,145 @@
+"""
+SQLite support.
+
+`register_adapters()` lets `sqlite3` store `EraDate` and `EraDateTime` as compact integers,
+and read them back from columns declared as `ERADATE` or `ERADATETIME` with `detect_types=sqlite3.PARSE_DECLTYPES`.
+
+`register_functions(connection)` adds deterministic SQL functions, so conversions run inside queries::
+
+    SELECT wareki_era(sold_on), wareki_year(sold_on), count(*) FROM sales GROUP BY 1, 2
+
+Integer encoding of `EraDate` is `ordinal * 8 + slot`, where `slot` is the position of the era in
+`japanera.parser.find_eras_with_ordinal(ordinal)`, and that of `EraDateTime` is
+`encoded_date * 86400000000 + microseconds of the day`. So only eras containing the date can be stored.
+"""
+import datetime
+import sqlite3
+from functools import lru_cache
+from typing import Optional, Union
+
+from . import cache
+from .japanera import EraDate, EraDateTime
+from .parser import find_eras_with_ordinal
+
+_ERA_SLOTS = 8
+_MICROSECONDS_PER_DAY = 24 * 60 * 60 * 1000000
+# encoded `EraDateTime` of the first day is still larger than any encoded `EraDate`
+_MAX_ENCODED_DATE = (datetime.date.max.toordinal() + 1) * _ERA_SLOTS
+
+_CACHE_SIZE = 4096
+
+
+def _encode_date(era_date: EraDate) -> int:
+    ordinal = era_date.toordinal()
+    eras = find_eras_with_ordinal(ordinal)
+    try:
+        slot = eras.index(era_date.era)
+    except ValueError:
+        raise ValueError("{!r} is not in its era, so it can't be stored".format(era_date)) from None
+    return ordinal * _ERA_SLOTS + slot
+
+
+def _decode_date(value: int) -> EraDate:
+    ordinal, slot = divmod(value, _ERA_SLOTS)
+    if not 1 <= ordinal <= datetime.date.max.toordinal():
+        raise ValueError("{!r} is not an encoded EraDate".format(value))
+    eras = find_eras_with_ordinal(ordinal)
+    if slot >= len(eras):
+        raise ValueError("{!r} is not an encoded EraDate".format(value))
+    date = datetime.date.fromordinal(ordinal)
+    return EraDate._from_trusted(date.year, date.month, date.day, eras[slot])
+
+
+def adapt_era_date(era_date: EraDate) -> int:
+    if isinstance(era_date, EraDateTime):
+        return adapt_era_date_time(era_date)
+    return _encode_date(era_date)
+
+
+def adapt_era_date_time(era_date_time: EraDateTime) -> int:
+    if era_date_time.utcoffset() is not None:
+        raise ValueError("timezone-aware EraDateTime can't be stored, convert it to naive one first")
+    microseconds = ((era_date_time.hour * 60 + era_date_time.minute) * 60 + era_date_time.second) * 1000000 + \
+                   era_date_time.microsecond
+    return _encode_date(era_date_time) * _MICROSECONDS_PER_DAY + microseconds
+
+
+def convert_era_date(value: bytes) -> EraDate:
+    return _decode_date(int(value))
+
+
+def convert_era_date_time(value: bytes) -> EraDateTime:
+    encoded_date, microseconds = divmod(int(value), _MICROSECONDS_PER_DAY)
+    era_date = _decode_date(encoded_date)
+    seconds, microsecond = divmod(microseconds, 1000000)
+    minutes, second = divmod(seconds, 60)
+    hour, minute = divmod(minutes, 60)
+    return EraDateTime._from_trusted(era_date.year, era_date.month, era_date.day, era_date.era, hour, minute, second,
+                                     microsecond)
+
+
+def register_adapters():
+    """
+    Register adapters of `EraDate` and `EraDateTime`, and converters of `ERADATE` and `ERADATETIME` columns.
+    """
+    sqlite3.register_adapter(EraDate, adapt_era_date)
+    sqlite3.register_adapter(EraDateTime, adapt_era_date_time)
+    sqlite3.register_converter("ERADATE", convert_era_date)
+    sqlite3.register_converter("ERADATETIME", convert_era_date_time)
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _to_era_date(value: Union[str, int]) -> Optional[EraDate]:
+    """
+    `EraDate` or `EraDateTime` of ISO 8601 text or integer stored by the adapters. None if `value` is neither.
+    """
+    try:
+        if isinstance(value, int):
+            if value < _MAX_ENCODED_DATE:
+                return _decode_date(value)
+            return convert_era_date_time(value)
+        if len(value) == 10:
+            return EraDate.from_date(datetime.date.fromisoformat(value))
+        return EraDateTime.from_datetime(datetime.datetime.fromisoformat(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def wareki_era(value: Union[str, int, None]) -> Optional[str]:
+    era_date = _to_era_date(value) if value is not None else None
+    return era_date.era.kanji if era_date is not None else None
+
+
+def wareki_year(value: Union[str, int, None]) -> Optional[int]:
+    era_date = _to_era_date(value) if value is not None else None
+    return era_date.year - era_date.era.since.year + 1 if era_date is not None else None
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _format(value: Union[str, int], format: str) -> Optional[str]:
+    era_date = _to_era_date(value)
+    return era_date.strftime(format) if era_date is not None else None
+
+
+def wareki_format(value: Union[str, int, None], format: Optional[str]) -> Optional[str]:
+    if value is None or format is None:
+        return None
+    return _format(value, format)
+
+
+# both depend on era data
+cache.register_clear(_to_era_date.cache_clear)
+cache.register_clear(_format.cache_clear)
+
+
+def register_functions(connection: sqlite3.Connection):
+    """
+    Register SQL functions to `connection`. Each of them takes ISO 8601 date or datetime text,
+    or integer stored by the adapters, and returns NULL for NULL or values which are neither.
+      wareki_era(value): kanji name of the era, same as `EraDate.from_date(date).era.kanji`
+      wareki_year(value): relative year in the era
+      wareki_format(value, format): same as `EraDate.strftime(format)`
+    """
+    connection.create_function("wareki_era", 1, wareki_era, deterministic=True)
+    connection.create_function("wareki_year", 1, wareki_year, deterministic=True)
+    connection.create_function("wareki_format", 2, wareki_format, deterministic=True)
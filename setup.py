@@ -48,7 +48,14 @@ setup(name=about["__title__"],
       long_description=__doc__,
       long_description_content_type="text/markdown",
       install_requires=_requires_from_file('requirements.txt'),
+      extras_require={
+          "pandas": ["pandas"],
+          "arrow": ["pyarrow"],
+      },
       packages=["japanera"],
+      entry_points={
+          "console_scripts": ["japanera = japanera.cli:main"],
+      },
       zip_safe=False,
       setup_requires=['wheel'],
       platforms="any",
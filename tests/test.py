@@ -1,8 +1,11 @@
 import datetime
+import mmap
 import unittest
+import warnings
 from datetime import date
 
-from japanera import EraDate, Era, EraType, EraDateTime, ERA_DATA_GENERAL, ERA_DATA_COMMON
+from japanera import (EraDate, Era, EraType, EraDateTime, ERA_DATA_GENERAL, ERA_DATA_COMMON, ERA_DATA_DAIKAKUJI,
+                      ParseFailure, compile_formats)
 
 
 class TestEraDate(unittest.TestCase):
@@ -10,6 +13,19 @@ class TestEraDate(unittest.TestCase):
         self.assertWarns(RuntimeWarning, EraDate, 2019, 1, 1,
                          Era("Test", "test", date(2000, 1, 1), date(2000, 1, 2), EraType.GENERAL))
 
+    def test_from_trusted(self):
+        era = Era("Test", "test", date(2000, 1, 1), date(2000, 1, 2), EraType.GENERAL)
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            era_date = EraDate._from_trusted(2019, 1, 1, era)
+            self.assertEqual(EraDate.from_date(date(2019, 5, 1)), EraDate(2019, 5, 1, ERA_DATA_GENERAL[-1]))
+            self.assertEqual(len(EraDate.list_from_date(date(2019, 5, 1))), 2)
+        self.assertEqual(era_date.to_date(), date(2019, 1, 1))
+        self.assertIs(era_date.era, era)
+        self.assertIs(type(era_date), EraDate)
+        self.assertWarns(RuntimeWarning, EraDate.from_date, date(2019, 1, 1), era)
+        self.assertWarns(RuntimeWarning, EraDate.list_from_date, date(2019, 1, 1), [era])
+
     def test_strptime_normal(self):
         result = EraDate.strptime("2020-01-01", "%Y-%m-%d")
         self.assertEqual(len(result), 2)
@@ -48,6 +64,77 @@ class TestEraDate(unittest.TestCase):
         self.assertEqual(len(result), 1)
         self.assertEqual(result[0], EraDate(2023, 1, 1, ERA_DATA_COMMON[0]))
 
+    def test_strptime_prefer_and_limit(self):
+        self.assertListEqual(EraDate.strptime("2020-01-01", "%Y-%m-%d", prefer=EraType.GENERAL, limit=1),
+                             [EraDate(2020, 1, 1, ERA_DATA_GENERAL[-1])])
+        self.assertListEqual(EraDate.strptime("2020-01-01", "%Y-%m-%d", prefer=[EraType.COMMON]),
+                             [EraDate(2020, 1, 1, ERA_DATA_COMMON[0]), EraDate(2020, 1, 1, ERA_DATA_GENERAL[-1])])
+        self.assertListEqual(EraDate.strptime("H10.05.01", "%-h%-y.%m.%d", prefer="latest", limit=1),
+                             [EraDate(1998, 5, 1, ERA_DATA_GENERAL[-2])])
+        self.assertEqual(len(EraDate.strptime("H10.05.01", "%-h%-y.%m.%d")), 3)
+        self.assertRaises(ValueError, EraDate.strptime, "2020-01-01", "%Y-%m-%d", prefer="earliest")
+        for limit in (0, -1):
+            self.assertRaises(ValueError, EraDate.strptime, "2020-01-01", "%Y-%m-%d", limit=limit)
+            self.assertRaises(ValueError, EraDate.strptime, "平成32年01月01日", "%-K%-y年%m月%d日", limit=limit)
+            self.assertRaises(ValueError, EraDateTime.strptime, "2020-01-01", "%Y-%m-%d", limit=limit)
+
+    def test_iter_strptime(self):
+        candidates = EraDate.iter_strptime("H10.05.01", "%-h%-y.%m.%d")
+        self.assertEqual(next(candidates).era.kanji, "宝亀")
+        self.assertListEqual([era_date.era.kanji for era_date in candidates], ["宝暦", "平成"])
+        self.assertRaises(ValueError, list, EraDate.iter_strptime("令和-04-31", "%-K-%m-%d"))
+
+    def test_try_parse(self):
+        format = "%-K%-y年%m月%d日"
+        self.assertEqual(EraDate.try_parse("令和05年03月07日", format), (EraDate(2023, 3, 7), None))
+        self.assertEqual(EraDate.try_parse("令和05年3/7", format), (None, ParseFailure.NO_MATCH))
+        self.assertEqual(EraDate.try_parse("令和05年03月07日です", format), (None, ParseFailure.UNCONVERTED_DATA))
+        self.assertEqual(EraDate.try_parse("昭和70年03月07日", format), (None, ParseFailure.DATE_NOT_IN_ERA))
+        self.assertEqual(EraDate.try_parse("令和 1900/01/01", "%-K %Y/%m/%d"), (None, ParseFailure.UNKNOWN_ERA))
+        self.assertEqual(EraDate.try_parse("H10.05.01", "%-h%-y.%m.%d", prefer="latest"),
+                         (EraDate(1998, 5, 1, ERA_DATA_GENERAL[-2]), None))
+        self.assertEqual(EraDate.parse_or_none("令和05年03月07日", format), EraDate(2023, 3, 7))
+        self.assertIsNone(EraDate.parse_or_none("令和05年02月30日", format))
+        self.assertRaises(TypeError, EraDate.try_parse, None, format)
+        self.assertRaises(ValueError, EraDate.try_parse, "2020-01-01", "%Y-%m-%d", prefer="earliest")
+
+    def test_try_parse_many(self):
+        format = "%-K%-y年%m月%d日"
+        date_strings = ["令和05年03月07日", "", "昭和70年03月07日", "令和05年03月07日"]
+        self.assertListEqual(EraDate.try_parse_many(date_strings, format),
+                             [EraDate.try_parse(date_string, format) for date_string in date_strings])
+        self.assertListEqual(EraDate.parse_many_or_none(iter(date_strings), format),
+                             [EraDate(2023, 3, 7), None, None, EraDate(2023, 3, 7)])
+
+    def test_normalize(self):
+        format = "%-K%-y年%m月%d日"
+        for date_string in ["令和５年３月７日", "令和〇五年〇三月〇七日", "㋿５年３月７日"]:
+            self.assertEqual(EraDate.strptime(date_string, format, normalize=True), [EraDate(2023, 3, 7)])
+            self.assertEqual(EraDate.try_parse(date_string, format, normalize=True), (EraDate(2023, 3, 7), None))
+            self.assertEqual(EraDate.try_parse(date_string, format), (None, ParseFailure.NO_MATCH))
+        self.assertEqual(EraDate.parse_many_or_none(["令和５年３月７日", "令和5年3月7日"], format, normalize=True),
+                         [EraDate(2023, 3, 7), EraDate(2023, 3, 7)])
+        self.assertEqual(EraDateTime.strptime("Ｒ０５．０３．０７　１２：００", "%-h%-y.%m.%d %H:%M", prefer="latest",
+                                              limit=1, normalize=True),
+                         [EraDateTime(2023, 3, 7, 12)])
+        compiled = compile_formats(["%-K%-y年%m月%d日", "%-K%-n年%-m月%-d日"], normalize=True)
+        self.assertEqual(compiled.match("令和〇五年〇三月〇七日"), "%-K%-y年%m月%d日")
+        self.assertEqual(compiled.strptime("令和五年三月七日"), ("%-K%-n年%-m月%-d日", [EraDate(2023, 3, 7)]))
+
+    def test_strptime_bytes(self):
+        data = "平成31年04月30日,令和01年05月01日".encode("cp932")
+        with mmap.mmap(-1, len(data)) as mapped:
+            mapped.write(data)
+            with memoryview(mapped) as view:
+                self.assertEqual(EraDate.strptime_bytes(view[:len(data) // 2], "%-K%-y年%m月%d日", "cp932"),
+                                 EraDate.strptime("平成31年04月30日", "%-K%-y年%m月%d日"))
+        view = memoryview(data)
+        self.assertEqual(EraDate.strptime_bytes(view[len(data) // 2 + 1:], "%-K%-y年%m月%d日", "cp932"),
+                         [EraDate(2019, 5, 1)])
+        self.assertEqual(EraDateTime.strptime_bytes(b"R01.05.01 12:00", "%-h%-y.%m.%d %H:%M", prefer="latest",
+                                                    limit=1),
+                         [EraDateTime(2019, 5, 1, 12)])
+
     def test_strftime(self):
         era_date = EraDate(1950, 12, 24, ERA_DATA_GENERAL[-3])  # 昭和
         self.assertEqual(era_date.strftime("%-K(%-E, %-e, %-h)%-n年 %-m月%-d日 %H:%M:%S"),
@@ -62,11 +149,67 @@ class TestEraDate(unittest.TestCase):
         self.assertEqual(EraDate.from_date(date(2300, 1, 1)).era, ERA_DATA_GENERAL[-1])
         self.assertEqual(EraDate.from_date(date(2300, 1, 1), ERA_DATA_COMMON[0]).era, ERA_DATA_COMMON[0])
 
+    def test_from_ordinal(self):
+        self.assertEqual(EraDate.from_ordinal(date(2019, 4, 30).toordinal()),
+                         EraDate(2019, 4, 30, ERA_DATA_GENERAL[-2]))
+        self.assertEqual(EraDate.from_ordinal(date(2019, 5, 1).toordinal()), EraDate(2019, 5, 1, ERA_DATA_GENERAL[-1]))
+        self.assertEqual(EraDate.from_ordinal(1, ERA_DATA_COMMON[0]), EraDate(1, 1, 1, ERA_DATA_COMMON[0]))
+        self.assertEqual(EraDateTime.from_ordinal(date(2019, 5, 1).toordinal()),
+                         EraDateTime(2019, 5, 1, era=ERA_DATA_GENERAL[-1]))
+        self.assertRaises(ValueError, EraDate.from_ordinal, 0)
+
     def test_to_date(self):
         self.assertEqual(EraDate.from_date(date(300, 1, 1)).to_date(), date(300, 1, 1))
         self.assertEqual(EraDate.from_date(date(2300, 1, 1)).to_date(), date(2300, 1, 1))
         self.assertEqual(EraDate.from_date(date(2300, 1, 1), ERA_DATA_COMMON[0]).to_date(), date(2300, 1, 1))
 
+    def test_arithmetic(self):
+        heisei, reiwa = ERA_DATA_GENERAL[-2], ERA_DATA_GENERAL[-1]
+        era_date = EraDate(2019, 4, 29)
+        self.assertEqual(era_date + datetime.timedelta(days=1), EraDate(2019, 4, 30, heisei))
+        self.assertEqual(datetime.timedelta(days=2) + era_date, EraDate(2019, 5, 1, reiwa))
+        self.assertEqual(EraDate(2019, 5, 1) - datetime.timedelta(days=1), EraDate(2019, 4, 30, heisei))
+        self.assertEqual(EraDate(2019, 5, 1) - era_date, datetime.timedelta(days=2))
+        self.assertIsInstance(era_date + datetime.timedelta(days=1), EraDate)
+        self.assertRaises(OverflowError, lambda: EraDate(9999, 12, 31) + datetime.timedelta(days=1))
+
+        # the era is kept while the result is in it, even if it is not the one `EraDate` picks
+        engen = next(era for era in ERA_DATA_DAIKAKUJI if era.kanji == "延元")
+        southern = EraDate(1338, 10, 1, engen)
+        self.assertNotEqual(EraDate.from_date(date(1338, 10, 31)).era, engen)
+        self.assertEqual(southern + datetime.timedelta(days=30), EraDate(1338, 10, 31, engen))
+        self.assertEqual(southern.replace(day=20), EraDate(1338, 10, 20, engen))
+        self.assertEqual(southern.add_era_years(1), EraDate(1339, 10, 1, engen))
+        self.assertEqual((southern + datetime.timedelta(days=365 * 2)).era, EraDate.from_date(date(1340, 9, 30)).era)
+
+        # 西暦 is the fallback of days without an era, so its dates always get the era `EraDate` picks
+        common = EraDate(2019, 4, 29, ERA_DATA_COMMON[0])
+        self.assertEqual(common + datetime.timedelta(days=1), EraDate(2019, 4, 30, heisei))
+        self.assertEqual(common.replace(year=1990), EraDate(1990, 4, 29, heisei))
+        taika = ERA_DATA_GENERAL[0]
+        self.assertEqual((EraDate(600, 1, 1) + datetime.timedelta(days=1)).era, ERA_DATA_COMMON[0])
+        self.assertEqual(EraDate(600, 1, 1) + datetime.timedelta(days=365 * 50),
+                         EraDate.from_date(date(600, 1, 1) + datetime.timedelta(days=365 * 50)))
+        self.assertEqual((EraDate(600, 1, 1) + datetime.timedelta(days=365 * 50)).era, taika)
+        self.assertEqual(EraDate(600, 1, 1).replace(year=2023), EraDate(2023, 1, 1, reiwa))
+        self.assertEqual(EraDate(600, 1, 1).add_era_years(1423), EraDate(2023, 1, 1, reiwa))
+        self.assertEqual((EraDateTime(600, 1, 1) + datetime.timedelta(days=365 * 50)).era, taika)
+
+    def test_replace(self):
+        heisei, reiwa = ERA_DATA_GENERAL[-2], ERA_DATA_GENERAL[-1]
+        self.assertEqual(EraDate(2019, 4, 1).replace(day=30), EraDate(2019, 4, 30, heisei))
+        self.assertEqual(EraDate(2019, 4, 1).replace(month=5), EraDate(2019, 5, 1, reiwa))
+        self.assertEqual(EraDate(2019, 4, 1).replace(era=ERA_DATA_COMMON[0]), EraDate(2019, 4, 1, ERA_DATA_COMMON[0]))
+        self.assertRaises(ValueError, EraDate(2019, 4, 1).replace, day=31)
+
+    def test_add_era_years(self):
+        heisei, reiwa = ERA_DATA_GENERAL[-2], ERA_DATA_GENERAL[-1]
+        self.assertEqual(EraDate(2018, 2, 28).add_era_years(1), EraDate(2019, 2, 28, heisei))
+        self.assertEqual(EraDate(2016, 2, 29).add_era_years(1), EraDate(2017, 2, 28, heisei))
+        self.assertEqual(EraDate(2016, 2, 29).add_era_years(4), EraDate(2020, 2, 29, reiwa))
+        self.assertEqual(EraDate(2018, 5, 1).add_era_years(1), EraDate(2019, 5, 1, reiwa))
+        self.assertEqual(EraDate(2020, 5, 1).add_era_years(-2), EraDate(2018, 5, 1, heisei))
+
 
 class TestEraDateTime(unittest.TestCase):
     def test_new(self):
@@ -104,6 +247,33 @@ class TestEraDateTime(unittest.TestCase):
         self.assertEqual(len(result), 1)
         self.assertEqual(result[0], EraDateTime(1970, 1, 1, era=ERA_DATA_GENERAL[-3]))
 
+    def test_from_datetime_in_jst(self):
+        utc = datetime.datetime(2019, 4, 30, 16, 0, tzinfo=datetime.timezone.utc)
+        self.assertEqual(EraDateTime.from_datetime(utc).era, ERA_DATA_GENERAL[-2])
+        in_jst = EraDateTime.from_datetime(utc, in_jst=True)
+        self.assertEqual(in_jst.era, ERA_DATA_GENERAL[-1])
+        self.assertEqual(in_jst, utc)
+        self.assertEqual(in_jst.strftime("%-K%-y年%m月%d日 %H時"), "令和01年05月01日 01時")
+        self.assertListEqual([era_datetime.era for era_datetime in EraDateTime.list_from_datetime(utc, in_jst=True)],
+                             [ERA_DATA_COMMON[0], ERA_DATA_GENERAL[-1]])
+
+        naive = datetime.datetime(2019, 4, 30, 16, 0)
+        self.assertEqual(EraDateTime.from_datetime(naive, in_jst=True).era, ERA_DATA_GENERAL[-2])
+
+    def test_strptime_prefer_and_limit(self):
+        result = EraDateTime.strptime("2020-01-01 12:00", "%Y-%m-%d %H:%M", prefer=EraType.GENERAL, limit=1)
+        self.assertListEqual(result, [EraDateTime(2020, 1, 1, 12, era=ERA_DATA_GENERAL[-1])])
+        result = next(EraDateTime.iter_strptime("2020-01-01 12:00", "%Y-%m-%d %H:%M"))
+        self.assertEqual(result, EraDateTime(2020, 1, 1, 12, era=ERA_DATA_COMMON[0]))
+
+    def test_try_parse(self):
+        result = EraDateTime.try_parse("令和05年03月07日 10:20+0900", "%-K%-y年%m月%d日 %H:%M%z")
+        self.assertEqual(result, (EraDateTime(2023, 3, 7, 10, 20, tzinfo=datetime.timezone(
+            datetime.timedelta(hours=9))), None))
+        self.assertIsInstance(result[0], EraDateTime)
+        self.assertEqual(EraDateTime.try_parse("令和05年03月07日 25:20", "%-K%-y年%m月%d日 %H:%M"),
+                         (None, ParseFailure.NO_MATCH))
+
     def test_strftime(self):
         era_date = EraDateTime(1950, 12, 24, 12, 34, 56, era=ERA_DATA_GENERAL[-3])
         self.assertEqual(era_date.strftime("%-K(%-E, %-e, %-h)%-n年 %-m月%-d日 %H:%M:%S"),
@@ -113,6 +283,66 @@ class TestEraDateTime(unittest.TestCase):
         self.assertEqual(era_date.strftime("%-K(%-E, %-e, %-h)%-n年 %-m月%-d日(%-a) %H:%M:%S"),
                          "昭和(Shouwa, Showa, S)元年 十二月二十四日(金) 12:34:56")
 
+    def test_arithmetic(self):
+        heisei, reiwa = ERA_DATA_GENERAL[-2], ERA_DATA_GENERAL[-1]
+        era_datetime = EraDateTime(2019, 4, 30, 23, tzinfo=datetime.timezone.utc)
+        self.assertEqual(era_datetime + datetime.timedelta(minutes=30),
+                         EraDateTime(2019, 4, 30, 23, 30, tzinfo=datetime.timezone.utc, era=heisei))
+        self.assertEqual(era_datetime + datetime.timedelta(hours=1),
+                         EraDateTime(2019, 5, 1, tzinfo=datetime.timezone.utc, era=reiwa))
+        self.assertEqual(EraDateTime(2019, 5, 1, tzinfo=datetime.timezone.utc) - datetime.timedelta(seconds=1),
+                         EraDateTime(2019, 4, 30, 23, 59, 59, tzinfo=datetime.timezone.utc, era=heisei))
+        self.assertEqual(EraDateTime(2019, 5, 1, tzinfo=datetime.timezone.utc) - era_datetime,
+                         datetime.timedelta(hours=1))
+        self.assertIsInstance(datetime.timedelta(hours=1) + era_datetime, EraDateTime)
+        self.assertEqual((EraDateTime(2019, 4, 30, 1, fold=1) + datetime.timedelta(minutes=1)).fold, 1)
+        self.assertEqual((EraDateTime(2019, 4, 30, 1, fold=1) - datetime.timedelta(days=1)).fold, 1)
+
+    def test_replace(self):
+        heisei, reiwa = ERA_DATA_GENERAL[-2], ERA_DATA_GENERAL[-1]
+        era_datetime = EraDateTime(2019, 4, 30, 23, tzinfo=datetime.timezone.utc)
+        self.assertEqual(era_datetime.replace(minute=5),
+                         EraDateTime(2019, 4, 30, 23, 5, tzinfo=datetime.timezone.utc, era=heisei))
+        self.assertEqual(era_datetime.replace(day=1, month=5, tzinfo=None), EraDateTime(2019, 5, 1, 23, era=reiwa))
+        self.assertEqual(era_datetime.add_era_years(1),
+                         EraDateTime(2020, 4, 30, 23, tzinfo=datetime.timezone.utc, era=reiwa))
+
+
+class TestCompiledFormats(unittest.TestCase):
+    formats = ["%-K%-y年%m月%d日", "%-K%-n年%-m月%-d日", "%-h%-y.%m.%d", "%Y-%m-%d"]
+
+    def test_match(self):
+        compiled = compile_formats(self.formats)
+        self.assertEqual(compiled.match("令和05年03月07日"), "%-K%-y年%m月%d日")
+        self.assertEqual(compiled.match("令和五年三月七日"), "%-K%-n年%-m月%-d日")
+        self.assertEqual(compiled.match("R05.03.07"), "%-h%-y.%m.%d")
+        self.assertEqual(compiled.match("2023-03-07"), "%Y-%m-%d")
+        self.assertIsNone(compiled.match("2023/03/07"))
+        self.assertIsNone(compiled.match("2023-03-07 "))  # unconverted data remains
+
+    def test_strptime(self):
+        compiled = compile_formats(self.formats)
+        for date_string in ("令和05年03月07日", "令和五年三月七日", "R05.03.07", "2023-03-07"):
+            format, result = compiled.strptime(date_string)
+            self.assertListEqual(result, EraDate.strptime(date_string, format))
+        self.assertRaises(ValueError, compiled.strptime, "2023/03/07")
+        self.assertRaises(ValueError, compiled.strptime, "平成31年05月01日")  # matches, but no era found
+
+        format, result = compiled.strptime("平成31年05月01日", allow_date_after_end_of_era=True)
+        self.assertEqual(format, "%-K%-y年%m月%d日")
+        self.assertListEqual(result, [EraDate(2019, 5, 1, ERA_DATA_GENERAL[-2])])
+
+    def test_strptime_datetime(self):
+        compiled = compile_formats(["%-K%-y年%m月%d日 %H:%M", "%Y-%m-%d %H:%M:%S"])
+        format, result = compiled.strptime_datetime("昭和45年01月02日 12:34")
+        self.assertEqual(format, "%-K%-y年%m月%d日 %H:%M")
+        self.assertListEqual(result, [EraDateTime(1970, 1, 2, 12, 34, era=ERA_DATA_GENERAL[-3])])
+
+    def test_bad_format(self):
+        self.assertRaises(ValueError, compile_formats, [])
+        self.assertRaises(ValueError, compile_formats, ["%Y", "%-Q"])
+        self.assertRaises(TypeError, compile_formats, ["%Y", None])
+
 
 if __name__ == '__main__':
     unittest.main()
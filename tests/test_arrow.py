@@ -0,0 +1,60 @@
+import io
+import unittest
+from datetime import date
+
+from japanera import EraDate, EraDateArray, ERA_DATA_GENERAL
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    from japanera.arrow import EraDateType, to_arrow, from_arrow
+except ImportError:
+    pa = None
+
+
+@unittest.skipIf(pa is None, "pyarrow is not installed")
+class TestEraDateType(unittest.TestCase):
+    def setUp(self):
+        self.era_dates = EraDate.list_from_date(date(1340, 5, 1)) + [EraDate(645, 7, 17), EraDate(2019, 4, 30),
+                                                                      EraDate(2019, 5, 1)]
+        self.array = EraDateArray(self.era_dates)
+
+    def test_round_trip(self):
+        arrow_array = to_arrow(self.array)
+        self.assertIsInstance(arrow_array.type, EraDateType)
+        self.assertEqual(arrow_array.storage.field("date").to_pylist(), [d.to_date() for d in self.era_dates])
+        self.assertListEqual(arrow_array.to_pylist(), self.era_dates)
+        self.assertEqual(from_arrow(arrow_array), self.array)
+        self.assertEqual(from_arrow(arrow_array.slice(2)), self.array[2:])
+        self.assertEqual(from_arrow(pa.chunked_array([arrow_array, arrow_array])),
+                         EraDateArray(self.era_dates + self.era_dates))
+
+    def test_ipc_and_parquet(self):
+        table = pa.table({"d": to_arrow(self.era_dates)})
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        read = pa.ipc.open_stream(sink.getvalue()).read_all()
+        self.assertIsInstance(read.column("d").type, EraDateType)
+        self.assertEqual(from_arrow(read.column("d")), self.array)
+
+        buffer = io.BytesIO()
+        pq.write_table(table, buffer)
+        buffer.seek(0)
+        read = pq.read_table(buffer)
+        self.assertIsInstance(read.column("d").type, EraDateType)
+        self.assertEqual(from_arrow(read.column("d")), self.array)
+
+    def test_era_table(self):
+        era_date_type = EraDateType(ERA_DATA_GENERAL[-2:])
+        self.assertListEqual(to_arrow(self.era_dates[-2:], era_date_type).to_pylist(), self.era_dates[-2:])
+        self.assertRaises(ValueError, to_arrow, self.era_dates, era_date_type)
+
+    def test_null(self):
+        arrow_array = pa.ExtensionArray.from_storage(EraDateType(), pa.array([None], EraDateType().storage_type))
+        self.assertListEqual(arrow_array.to_pylist(), [None])
+        self.assertRaises(ValueError, from_arrow, arrow_array)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+from datetime import date, datetime, timedelta, timezone
+
+from japanera import (EraDate, ERA_DATA_GENERAL, JST, epoch_seconds_to_wareki, epoch_millis_to_wareki,
+                      ordinals_to_wareki, excel_serials_to_wareki)
+
+
+def _fields(era_date):
+    return era_date.era, era_date.year - era_date.era.since.year + 1, era_date.month, era_date.day
+
+
+class TestEpochToWareki(unittest.TestCase):
+    def test_era_change_in_jst(self):
+        reiwa_in_jst = datetime(2019, 4, 30, 15, 0, tzinfo=timezone.utc).timestamp()  # 2019-05-01 00:00 JST
+        self.assertListEqual(epoch_seconds_to_wareki([reiwa_in_jst - 1, reiwa_in_jst]),
+                             [(ERA_DATA_GENERAL[-2], 31, 4, 30), (ERA_DATA_GENERAL[-1], 1, 5, 1)])
+        self.assertListEqual(epoch_seconds_to_wareki([reiwa_in_jst], utc_offset=0),
+                             [(ERA_DATA_GENERAL[-2], 31, 4, 30)])
+        self.assertListEqual(epoch_millis_to_wareki([int(reiwa_in_jst * 1000) - 1, int(reiwa_in_jst * 1000)]),
+                             [(ERA_DATA_GENERAL[-2], 31, 4, 30), (ERA_DATA_GENERAL[-1], 1, 5, 1)])
+
+    def test_same_as_from_date(self):
+        timestamps = [datetime(1868, 1, 1, tzinfo=JST) + timedelta(hours=hours) for hours in range(0, 1500000, 251)]
+        expected = [_fields(EraDate.from_date(timestamp.date())) for timestamp in timestamps]
+        self.assertListEqual(epoch_seconds_to_wareki(timestamp.timestamp() for timestamp in timestamps), expected)
+        self.assertListEqual(epoch_millis_to_wareki(int(timestamp.timestamp()) * 1000 for timestamp in timestamps),
+                             expected)
+
+    def test_before_epoch(self):
+        self.assertListEqual(epoch_seconds_to_wareki([-32400.5, -32400, -1.5]),
+                             [(ERA_DATA_GENERAL[-3], 44, 12, 31), (ERA_DATA_GENERAL[-3], 45, 1, 1),
+                              (ERA_DATA_GENERAL[-3], 45, 1, 1)])
+        self.assertListEqual(epoch_millis_to_wareki([-32400001]), [(ERA_DATA_GENERAL[-3], 44, 12, 31)])
+        self.assertListEqual(epoch_seconds_to_wareki([]), [])
+
+
+class TestOrdinalsToWareki(unittest.TestCase):
+    def test_same_as_from_date(self):
+        ordinals = list(range(date(1320, 1, 1).toordinal(), date(1400, 1, 1).toordinal(), 3))
+        self.assertListEqual(ordinals_to_wareki(ordinals),
+                             [_fields(EraDate.from_date(date.fromordinal(ordinal))) for ordinal in ordinals])
+        self.assertListEqual(ordinals_to_wareki(reversed(ordinals)),
+                             [_fields(EraDate.from_date(date.fromordinal(ordinal))) for ordinal in reversed(ordinals)])
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, ordinals_to_wareki, [0])
+        self.assertRaises(ValueError, ordinals_to_wareki, [date.max.toordinal() + 1])
+
+
+class TestExcelSerialsToWareki(unittest.TestCase):
+    def test_1900_date_system(self):
+        self.assertListEqual(excel_serials_to_wareki([1, 59, 61, 43586, 44992.75]),
+                             [(ERA_DATA_GENERAL[-5], 33, 1, 1), (ERA_DATA_GENERAL[-5], 33, 2, 28),
+                              (ERA_DATA_GENERAL[-5], 33, 3, 1), (ERA_DATA_GENERAL[-1], 1, 5, 1),
+                              (ERA_DATA_GENERAL[-1], 5, 3, 7)])
+        self.assertRaises(ValueError, excel_serials_to_wareki, [60])  # 1900-02-29 does not exist
+        self.assertRaises(ValueError, excel_serials_to_wareki, [0])
+
+    def test_1904_date_system(self):
+        self.assertListEqual(excel_serials_to_wareki([0, 42124], date1904=True),
+                             [(ERA_DATA_GENERAL[-5], 37, 1, 1), (ERA_DATA_GENERAL[-1], 1, 5, 1)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import warnings
+
+from japanera import (EraDate, EraDateTime, EraType, ERA_DATA_COMMON, ERA_DATA_GENERAL, ERA_DATA_DAIKAKUJI,
+                      ERA_DATA_JIMYOUIN, enable_parse_cache, disable_parse_cache, parse_cache_info)
+from japanera.cache import LRUCache
+from japanera.parser import _set_era_data
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_eviction(self):
+        cache = LRUCache(2)
+        cache.put(1, "a")
+        cache.put(2, "b")
+        self.assertEqual(cache.get(1), "a")  # 2 is the least recently used now
+        cache.put(3, "c")
+        self.assertIsNone(cache.get(2))
+        self.assertEqual(cache.get(3), "c")
+        self.assertEqual(tuple(cache.info()), (2, 1, 1, 2, 2))
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertRaises(ValueError, LRUCache, 0)
+
+
+class TestParseCache(unittest.TestCase):
+    def tearDown(self):
+        disable_parse_cache()
+
+    def test_same_as_without_cache(self):
+        cases = [(EraDate, ("令和05年03月07日", "%-K%-y年%m月%d日")),
+                 (EraDate, ("H01.02.01", "%-h%-y.%m.%d")),
+                 (EraDate, ("不明12年12月01日", "%-K%-y年%m月%d日", False, "latest", 1)),
+                 (EraDate, ("暦応03年05月01日", "%-K%-y年%m月%d日", False, [EraType.DAIKAKUJI])),
+                 (EraDate, ("平成32年01月01日", "%-K%-y年%m月%d日", True)),
+                 (EraDateTime, ("令和05年03月07日 12:34:56.789+0900", "%-K%-y年%m月%d日 %H:%M:%S.%f%z"))]
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")  # "平成32年" is after the end of the era
+            expected = [cls.strptime(*args) for cls, args in cases]
+            enable_parse_cache()
+            for _ in range(2):
+                self.assertListEqual([cls.strptime(*args) for cls, args in cases], expected)
+        self.assertEqual(parse_cache_info(), (len(cases), len(cases), 0, 4096, len(cases)))
+        self.assertListEqual(list(EraDate.iter_strptime("令和05年03月07日", "%-K%-y年%m月%d日")), expected[0])
+
+    def test_errors(self):
+        enable_parse_cache()
+        self.assertRaises(ValueError, EraDate.strptime, "junk", "%-K%-y年%m月%d日")
+        self.assertRaises(ValueError, EraDate.strptime, "平成32年01月01日", "%-K%-y年%m月%d日")
+
+    def test_cleared_when_era_data_is_set(self):
+        enable_parse_cache()
+        EraDate.strptime("令和05年03月07日", "%-K%-y年%m月%d日")
+        _set_era_data(ERA_DATA_COMMON, ERA_DATA_GENERAL, ERA_DATA_DAIKAKUJI, ERA_DATA_JIMYOUIN)
+        self.assertEqual(parse_cache_info().currsize, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
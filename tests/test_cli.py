@@ -0,0 +1,67 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from japanera.cli import main
+
+
+class TestConvert(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.input = os.path.join(self.directory.name, "input.csv")
+        self.output = os.path.join(self.directory.name, "output.csv")
+        with open(self.input, "w", encoding="utf-8", newline="") as f:
+            f.write("id,birthday,joined\n1,2019-04-30,2019-05-01\n2,1989-01-07,bad\n3,,2023-03-07\n")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def convert(self, *args, encoding="utf-8"):
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            status = main(["convert", "-o", self.output, "--encoding", encoding] + list(args))
+        with open(self.output, encoding=encoding) as f:
+            return status, f.read(), stderr.getvalue()
+
+    def test_to_wareki(self):
+        status, output, report = self.convert("-c", "birthday", "-c", "joined", "-f", "%Y-%m-%d",
+                                              "-t", "%-K%-y年%m月%d日", self.input)
+        self.assertEqual(status, 0)
+        self.assertEqual(output, "id,birthday,joined\n1,平成31年04月30日,令和01年05月01日\n"
+                                 "2,昭和64年01月07日,bad\n3,,令和05年03月07日\n")
+        self.assertIn("rows: 3, errors: 1", report)
+
+    def test_to_gregorian(self):
+        with open(self.input, "w", encoding="cp932", newline="") as f:
+            f.write("id\t生年月日\n1\t平成31年04月30日\n2\tR01.05.01\n")
+        status, output, report = self.convert("-c", "生年月日", "-f", "%-K%-y年%m月%d日", "-t", "%Y/%m/%d", "--tsv",
+                                              "--errors", "blank", self.input, encoding="cp932")
+        self.assertEqual(status, 0)
+        self.assertEqual(output, "id\t生年月日\n1\t2019/04/30\n2\t\n")
+
+    def test_strict(self):
+        status, output, report = self.convert("-c", "joined", "-f", "%Y-%m-%d", "-t", "%-K%-y年%m月%d日",
+                                              "--errors", "strict", self.input)
+        self.assertEqual(status, 1)
+        self.assertIn("line 3: 'bad'", report)
+        # output stops before the row which failed, with no row left unconverted
+        self.assertEqual(output, "id,birthday,joined\n1,2019-04-30,令和01年05月01日\n")
+        self.assertIn("rows: 1, errors: 1", report)
+
+    def test_workers(self):
+        status, output, report = self.convert("-c", "birthday", "-f", "%Y-%m-%d", "-t", "%-K%-n年%-m月%-d日",
+                                              "--workers", "2", "--chunk-size", "1", self.input)
+        self.assertEqual(status, 0)
+        self.assertEqual(output, "id,birthday,joined\n1,平成三十一年四月三十日,2019-05-01\n"
+                                 "2,昭和六十四年一月七日,bad\n3,,2023-03-07\n")
+
+    def test_missing_column(self):
+        status, output, report = self.convert("-c", "nothing", "-f", "%Y", "-t", "%-K", self.input)
+        self.assertEqual(status, 2)
+        self.assertIn("column not found: nothing", report)
+
+
+if __name__ == '__main__':
+    unittest.main()
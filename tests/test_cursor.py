@@ -0,0 +1,41 @@
+import random
+import unittest
+from datetime import date, datetime, timedelta, timezone
+
+from japanera import WarekiCursor, EraDate, EraDateTime, ERA_DATA_GENERAL
+from japanera.parser import find_eras_with_ordinal
+
+
+class TestWarekiCursor(unittest.TestCase):
+    def test_same_as_from_date(self):
+        cursor = WarekiCursor()
+        for ordinal in range(date(1320, 1, 1).toordinal(), date(1400, 1, 1).toordinal()):
+            day = date.fromordinal(ordinal)
+            self.assertEqual(cursor.from_date(day), EraDate.from_date(day))
+            self.assertEqual(cursor.list_from_date(day), EraDate.list_from_date(day))
+            self.assertEqual(cursor.eras_of_ordinal(ordinal), find_eras_with_ordinal(ordinal))
+
+    def test_seek_only_at_boundary(self):
+        cursor = WarekiCursor()
+        for ordinal in range(date(2019, 1, 1).toordinal(), date(2020, 1, 1).toordinal()):
+            cursor.from_ordinal(ordinal)
+        self.assertEqual(cursor.seeks, 2)  # 平成, then 令和
+        self.assertEqual(cursor.lookup(date(2019, 4, 30)), (ERA_DATA_GENERAL[-2], 31))
+        self.assertEqual(cursor.seeks, 3)
+
+    def test_unordered(self):
+        cursor = WarekiCursor()
+        rng = random.Random(46)
+        days = [date.fromordinal(rng.randrange(1, date(2200, 1, 1).toordinal())) for _ in range(1000)]
+        self.assertEqual([cursor.from_date(day) for day in days], [EraDate.from_date(day) for day in days])
+
+    def test_from_datetime(self):
+        cursor = WarekiCursor()
+        dtt = datetime(2019, 4, 30, 20, tzinfo=timezone.utc)
+        self.assertEqual(cursor.from_datetime(dtt), EraDateTime.from_datetime(dtt))
+        self.assertEqual(cursor.from_datetime(dtt, in_jst=True), EraDateTime.from_datetime(dtt, in_jst=True))
+        self.assertEqual(cursor.from_datetime(dtt + timedelta(days=1)).era, ERA_DATA_GENERAL[-1])
+
+
+if __name__ == '__main__':
+    unittest.main()
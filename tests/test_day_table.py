@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+from datetime import date
+
+from japanera import DayTable, EraDate, ERA_DATA_GENERAL
+
+
+class TestDayTable(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "days.bin")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def assertSameAsFromDate(self, table, start, stop, step=1):
+        for ordinal in range(start.toordinal(), stop.toordinal(), step):
+            day = date.fromordinal(ordinal)
+            era_date = EraDate.from_date(day)
+            self.assertEqual(table.lookup(day), (era_date.era, day.year - era_date.era.since.year + 1))
+            self.assertEqual(table.era_date(day), era_date)
+
+    def test_build(self):
+        table = DayTable.build(until=date(2100, 12, 31))
+        self.assertEqual(table.since, ERA_DATA_GENERAL[0].since)
+        self.assertEqual(table.until, date(2100, 12, 31))
+        self.assertEqual(len(table), date(2100, 12, 31).toordinal() - ERA_DATA_GENERAL[0].since.toordinal() + 1)
+        self.assertSameAsFromDate(table, date(1330, 1, 1), date(1400, 1, 1))
+        self.assertSameAsFromDate(table, date(1860, 1, 1), date(2030, 1, 1), 3)
+        self.assertSameAsFromDate(table, date(600, 1, 1), date(650, 1, 1), 5)  # before the table
+        self.assertSameAsFromDate(table, date(2100, 12, 1), date(2101, 2, 1))  # after the table
+        self.assertRaises(ValueError, DayTable.build, date(2000, 1, 1), date(2000, 1, 2))
+
+    def test_save_and_load(self):
+        DayTable.build(until=date(2030, 12, 31), since=date(1300, 1, 1)).save(self.path)
+        with DayTable.load(self.path) as table:
+            self.assertEqual((table.since, table.until), (date(1300, 1, 1), date(2030, 12, 31)))
+            self.assertSameAsFromDate(table, date(1300, 1, 1), date(2031, 1, 1), 11)
+            self.assertEqual(table.lookup(date(2019, 5, 1)), (ERA_DATA_GENERAL[-1], 1))
+
+    @unittest.skipIf(os.name != "posix", "file modes are POSIX")
+    def test_save_mode(self):
+        umask = os.umask(0o022)
+        try:
+            DayTable.build(until=date(2000, 12, 31), since=date(2000, 1, 1)).save(self.path)
+        finally:
+            os.umask(umask)
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o644)
+
+    def test_load_invalid(self):
+        with open(self.path, "wb") as f:
+            f.write(b"not a day table")
+        self.assertRaises(ValueError, DayTable.load, self.path)
+        # shorter than the magic and the length of the header
+        with open(self.path, "wb") as f:
+            f.write(b"JPNR")
+        self.assertRaises(ValueError, DayTable.load, self.path)
+
+    def test_load_truncated(self):
+        DayTable.build(until=date(2000, 12, 31), since=date(2000, 1, 1)).save(self.path)
+        with open(self.path, "r+b") as f:
+            f.truncate(os.path.getsize(self.path) - 4)
+        self.assertRaises(ValueError, DayTable.load, self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
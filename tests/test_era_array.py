@@ -0,0 +1,57 @@
+import unittest
+from datetime import date
+
+from japanera import EraDate, EraDateArray, EraType, ERA_DATA_GENERAL, ERA_DATA_DAIKAKUJI
+
+
+class TestEraDateArray(unittest.TestCase):
+    def setUp(self):
+        self.dates = [date(2019, 5, 1), date(1340, 5, 1), date(1989, 1, 7), date(2019, 4, 30), date(1989, 1, 8),
+                      date(2019, 5, 1)]
+        self.array = EraDateArray.from_dates(self.dates)
+
+    def test_from_dates(self):
+        self.assertEqual(len(self.array), len(self.dates))
+        self.assertListEqual(list(self.array), [EraDate.from_date(d) for d in self.dates])
+        self.assertEqual(self.array, EraDateArray.from_ordinals(d.toordinal() for d in self.dates))
+        self.assertRaises(ValueError, EraDateArray.from_ordinals, [0])
+
+    def test_keep_given_era(self):
+        era_dates = EraDate.list_from_date(date(1340, 5, 1))
+        array = EraDateArray(era_dates)
+        self.assertListEqual(list(array), era_dates)
+        self.assertEqual(array[0].era, era_dates[0].era)
+
+    def test_getitem(self):
+        self.assertEqual(self.array[1], EraDate.from_date(date(1340, 5, 1)))
+        self.assertEqual(self.array[-1].era, ERA_DATA_GENERAL[-1])
+        self.assertIsInstance(self.array[1:3], EraDateArray)
+        self.assertListEqual(list(self.array[1:3]), [EraDate.from_date(d) for d in self.dates[1:3]])
+        self.assertListEqual(list(self.array.ordinals), [d.toordinal() for d in self.dates])
+
+    def test_strftime(self):
+        self.assertListEqual(self.array.strftime("%-K%-n年%-m月%-d日"),
+                             [EraDate.from_date(d).strftime("%-K%-n年%-m月%-d日") for d in self.dates])
+
+    def test_filter(self):
+        self.assertListEqual(list(self.array.filter(era=ERA_DATA_GENERAL[-1])),
+                             [EraDate.from_date(date(2019, 5, 1))] * 2)
+        self.assertListEqual(list(self.array.filter(era_type=EraType.JIMYOUIN)),
+                             [EraDate.from_date(date(1340, 5, 1))])
+        self.assertEqual(len(self.array.filter(era=ERA_DATA_DAIKAKUJI[0], era_type=EraType.GENERAL)), 0)
+
+    def test_sort(self):
+        self.array.sort()
+        self.assertListEqual(list(self.array), [EraDate.from_date(d) for d in sorted(self.dates)])
+        self.array.sort(reverse=True)
+        self.assertListEqual(list(self.array), [EraDate.from_date(d) for d in sorted(self.dates, reverse=True)])
+
+    def test_group_by_era_year(self):
+        self.assertDictEqual(self.array.group_by_era_year(),
+                             {(ERA_DATA_GENERAL[-1], 1): 2, (ERA_DATA_GENERAL[-2], 31): 1,
+                              (ERA_DATA_GENERAL[-2], 1): 1, (ERA_DATA_GENERAL[-3], 64): 1,
+                              (EraDate.from_date(date(1340, 5, 1)).era, 3): 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
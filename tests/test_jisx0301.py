@@ -0,0 +1,60 @@
+import unittest
+from datetime import date, datetime, timedelta
+
+from japanera import EraDate, EraDateTime, ERA_DATA_GENERAL, jisx0301
+
+
+class TestDecode(unittest.TestCase):
+    def test_decode(self):
+        result = jisx0301.decode("R05.03.07")
+        self.assertEqual(result, EraDate(2023, 3, 7))
+        self.assertEqual(result.era, ERA_DATA_GENERAL[-1])
+        self.assertEqual(jisx0301.decode("H31.04.30"), EraDate(2019, 4, 30, ERA_DATA_GENERAL[-2]))
+        self.assertEqual(jisx0301.decode("S64.01.07"), EraDate(1989, 1, 7, ERA_DATA_GENERAL[-3]))
+        self.assertEqual(jisx0301.decode("T01.07.30"), EraDate(1912, 7, 30, ERA_DATA_GENERAL[-4]))
+        self.assertEqual(jisx0301.decode("M06.01.01"), EraDate(1873, 1, 1, ERA_DATA_GENERAL[-5]))
+        self.assertEqual(jisx0301.decode("H04.02.29"), EraDate(1992, 2, 29))
+
+    def test_invalid(self):
+        for text in ["R5.03.07", "R05-03-07", "r05.03.07", "K05.03.07", "R00.03.07", "R05.13.07", "R05.02.30",
+                     "R05.03.07 ", "R０5.03.07", "", "H05.02.29"]:
+            self.assertRaises(ValueError, jisx0301.decode, text)
+
+    def test_out_of_era(self):
+        self.assertRaises(ValueError, jisx0301.decode, "R01.04.30")
+        self.assertRaises(ValueError, jisx0301.decode, "H31.05.01")
+        self.assertRaises(ValueError, jisx0301.decode, "M05.12.31")  # before Gregorian calendar
+        result = jisx0301.decode("H31.05.01", allow_date_after_end_of_era=True)
+        self.assertEqual((result.to_date(), result.era), (date(2019, 5, 1), ERA_DATA_GENERAL[-2]))
+
+    def test_decode_many(self):
+        texts = ["R05.03.07", "H31.04.30", "R05.03.07"]
+        self.assertListEqual(jisx0301.decode_many(texts), [jisx0301.decode(text) for text in texts])
+        self.assertRaises(ValueError, jisx0301.decode_many, ["R05.03.07", "R05.03.32"])
+
+
+class TestEncode(unittest.TestCase):
+    def test_encode(self):
+        self.assertEqual(jisx0301.encode(date(2023, 3, 7)), "R05.03.07")
+        self.assertEqual(jisx0301.encode(date(2019, 4, 30)), "H31.04.30")
+        self.assertEqual(jisx0301.encode(date(2019, 5, 1)), "R01.05.01")
+        self.assertEqual(jisx0301.encode(datetime(1989, 1, 7, 23, 59)), "S64.01.07")
+        self.assertEqual(jisx0301.encode(EraDateTime(1989, 1, 8, 12)), "H01.01.08")
+        self.assertEqual(jisx0301.encode(date(1873, 1, 1)), "M06.01.01")
+
+    def test_out_of_range(self):
+        self.assertRaises(ValueError, jisx0301.encode, date(1872, 12, 31))
+        self.assertRaises(ValueError, jisx0301.encode, date(2118, 1, 1))
+        self.assertEqual(jisx0301.encode(date(2117, 12, 31)), "R99.12.31")
+
+    def test_round_trip(self):
+        dates = [date(1873, 1, 1) + timedelta(days=days) for days in range(0, 89000, 7)]
+        texts = jisx0301.encode_many(dates)
+        self.assertListEqual(texts, [jisx0301.encode(dt) for dt in dates])
+        decoded = jisx0301.decode_many(texts)
+        self.assertListEqual(decoded, [EraDate.from_date(dt) for dt in dates])
+        self.assertListEqual([era_date.era for era_date in decoded], [EraDate.from_date(dt).era for dt in dates])
+
+
+if __name__ == '__main__':
+    unittest.main()
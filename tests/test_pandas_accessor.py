@@ -0,0 +1,86 @@
+import unittest
+from datetime import date, datetime
+
+from japanera import EraDate, ERA_DATA_GENERAL, get_max_input_length, set_max_input_length
+
+try:
+    import pandas as pd
+    import japanera.pandas_accessor  # noqa: F401
+except ImportError:
+    pd = None
+
+
+@unittest.skipIf(pd is None, "pandas is not installed")
+class TestWarekiAccessor(unittest.TestCase):
+    def setUp(self):
+        self.dates = [date(645, 7, 17), date(1340, 5, 1), date(1868, 10, 23), date(1989, 1, 7), date(1989, 1, 8),
+                      date(2019, 4, 30), date(2019, 5, 1), date(2023, 3, 7)]
+
+    def test_era_and_relative_year(self):
+        series = pd.Series(pd.to_datetime(self.dates + [None]))
+        self.assertListEqual(series.wareki.era.tolist(),
+                             [EraDate.from_date(d).era for d in self.dates] + [None])
+        relative_year = series.wareki.relative_year
+        self.assertEqual(relative_year.dtype, "Int64")
+        self.assertListEqual(relative_year.tolist()[:-1],
+                             [d.year - EraDate.from_date(d).era.since.year + 1 for d in self.dates])
+        self.assertTrue(pd.isna(relative_year.iloc[-1]))
+
+    def test_object_dates(self):
+        series = pd.Series(self.dates)
+        self.assertListEqual(series.wareki.era.tolist(), [EraDate.from_date(d).era for d in self.dates])
+
+    def test_timezone_aware(self):
+        series = pd.Series(pd.to_datetime(["2019-04-30T15:00:00Z"])).dt.tz_convert("Asia/Tokyo")
+        self.assertEqual(series.wareki.era.iloc[0], ERA_DATA_GENERAL[-1])
+        self.assertEqual(series.dt.tz_convert("UTC").wareki.era.iloc[0], ERA_DATA_GENERAL[-2])
+
+    def test_strftime(self):
+        format = "%-K%-y年%m月%d日 %-E%-Y %-e %-h %-n %-N年%-m月%-d日(%-a) %Y-%m-%d"
+        series = pd.Series(pd.to_datetime(self.dates[1:] + [None]), name="date")
+        result = series.wareki.strftime(format)
+        self.assertEqual(result.name, "date")
+        self.assertListEqual(result.tolist()[:-1], [EraDate.from_date(d).strftime(format) for d in self.dates[1:]])
+        self.assertTrue(pd.isna(result.iloc[-1]))
+
+    def test_parse(self):
+        strings = pd.Series(["令和05年03月07日", "平成31年04月30日", None, "令和05年03月07日"])
+        self.assertListEqual(strings.wareki.parse("%-K%-y年%m月%d日").tolist()[:2],
+                             [pd.Timestamp(2023, 3, 7), pd.Timestamp(2019, 4, 30)])
+        parsed = strings.wareki.parse("%-K%-y年%m月%d日")
+        self.assertEqual(parsed.dtype, "datetime64[us]")
+        self.assertTrue(pd.isna(parsed.iloc[2]))
+        self.assertEqual(parsed.iloc[3], pd.Timestamp(2023, 3, 7))
+
+        with_time = pd.Series(["R05.03.07 12:34:56"]).wareki.parse("%-h%-y.%m.%d %H:%M:%S", prefer="latest")
+        self.assertEqual(with_time.iloc[0], pd.Timestamp(datetime(2023, 3, 7, 12, 34, 56)))
+
+    def test_parse_errors(self):
+        strings = pd.Series(["令和05年03月07日", "junk", "平成32年01月01日"])
+        self.assertRaises(ValueError, strings.wareki.parse, "%-K%-y年%m月%d日")
+        coerced = strings.wareki.parse("%-K%-y年%m月%d日", errors="coerce")
+        self.assertEqual(coerced.iloc[0], pd.Timestamp(2023, 3, 7))
+        self.assertTrue(coerced.iloc[1:].isna().all())
+        allowed = strings.wareki.parse("%-K%-y年%m月%d日", allow_date_after_end_of_era=True, errors="coerce")
+        self.assertEqual(allowed.iloc[2], pd.Timestamp(2020, 1, 1))
+        self.assertRaises(ValueError, strings.wareki.parse, "%-K%-y年%m月%d日", errors="ignore")
+
+    def test_parse_too_long(self):
+        strings = pd.Series([" 令和05年03月07日", " " * get_max_input_length() + "令和05年03月07日"])
+        self.assertRaisesRegex(ValueError, "longer than the limit", strings.wareki.parse, " %-K%-y年%m月%d日")
+        coerced = strings.wareki.parse(" %-K%-y年%m月%d日", errors="coerce")
+        self.assertEqual(coerced.iloc[0], pd.Timestamp(2023, 3, 7))
+        self.assertTrue(pd.isna(coerced.iloc[1]))
+        try:
+            set_max_input_length(None)
+            self.assertEqual(strings.wareki.parse(" %-K%-y年%m月%d日").iloc[1], pd.Timestamp(2023, 3, 7))
+        finally:
+            set_max_input_length()
+
+    def test_not_datetime(self):
+        with self.assertRaises(AttributeError):
+            pd.Series(["junk"]).wareki.era
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,5 @@
+import re
+import time
 import unittest
 from datetime import date, timedelta
 
@@ -97,6 +99,179 @@ class TestStrPTime(unittest.TestCase):
         self.assertRaises(ValueError, parser._strptime, "天", "%-a")  # invalid character
 
 
+class TestEraNameTrie(unittest.TestCase):
+    def test_same_as_flat_alternation(self):
+        time_re = parser._get_time_re()
+        for directive, names in (("-K", parser._era_kanji_dict), ("-E", parser._era_alphabet_dict),
+                                 ("-e", parser._era_alphabet_vowel_shortened_dict),
+                                 ("-h", parser._era_alphabet_head_dict)):
+            flat = re.compile("|".join(re.escape(name) for name in sorted(names, key=len, reverse=True)),
+                              re.IGNORECASE)
+            trie = re.compile(time_re[directive], re.IGNORECASE)
+            samples = set()
+            for name in names:
+                samples.update({name, name.upper(), name.lower(), name[:-1], name + "年", name + "a", name[1:]})
+            for sample in samples:
+                flat_found, trie_found = flat.match(sample), trie.match(sample)
+                self.assertEqual(flat_found and flat_found.group(), trie_found and trie_found.group(), sample)
+                self.assertEqual(bool(flat.fullmatch(sample)), bool(trie.fullmatch(sample)), sample)
+
+
+class TestFastPath(unittest.TestCase):
+    @staticmethod
+    def general_path(date_string, format):
+        format_regex, locale_time = parser._compile_format(format)
+        found = format_regex.fullmatch(date_string)
+        return found and parser._parse_found_dict(found.groupdict(), locale_time)
+
+    def test_same_as_general_path(self):
+        cases = [("%-K%-y年%m月%d日", ["令和05年03月07日", "令和5年3月7日", "令和元年05月01日", "天平勝宝3年01月02日"]),
+                 ("%-h%-y.%m.%d", ["H10.05.01", "r1.5.1", "S64.01.07"]),
+                 ("%-K%-n年%-m月%-d日", ["令和五年三月七日", "平成三十一年十二月三十一日", "昭和元年十二月二十五日"]),
+                 ("%-E %-y/%m/%d %H:%M:%S", ["Heisei 31/04/30 12:34:56", "SHOUWA 1/12/25 0:0:0"]),
+                 ("%-e%-Y年%-m月%-d日", ["Reiwa2023年3月7日", "Showa元年十二月一日"]),
+                 ("%Y%m%d %y", ["20230307 23", "20231231 99"]),
+                 ("%-K%-y年 %m月", ["令和05年　 03月"])]
+        for format, date_strings in cases:
+            fast_path = parser._get_fast_path(format)
+            self.assertIsNotNone(fast_path, format)
+            for date_string in date_strings:
+                self.assertEqual(fast_path(date_string), self.general_path(date_string, format), date_string)
+                self.assertEqual(parser._strptime(date_string, format), self.general_path(date_string, format))
+
+    def test_general_path_fallback(self):
+        fast_path = parser._get_fast_path("%-K%-y年%m月%d日")
+        # non-ASCII digits aren't in the lookup tables, so the match is handed over to the general path
+        self.assertEqual(fast_path("令和０５年03月07日").group("_y"), "０５")
+        self.assertEqual(parser._strptime("令和０５年03月07日", "%-K%-y年%m月%d日"),
+                         parser._strptime("令和05年03月07日", "%-K%-y年%m月%d日"))
+        self.assertEqual(fast_path("令和05年03月07日です").end(), len("令和05年03月07日"))
+        self.assertRaises(ValueError, parser._strptime, "令和05年03月07日です", "%-K%-y年%m月%d日")
+        self.assertIsNone(fast_path("令和05年"))
+        self.assertRaises(ValueError, parser._strptime, "令和05年", "%-K%-y年%m月%d日")
+
+        # the general path goes on with the match of the fast path, without matching the string again
+        format_regex, locale_time = parser._compile_format("%-K%-y年%m月%d日")
+        matched = []
+
+        class CountingRegex:
+            def match(self, string):
+                matched.append(string)
+                return format_regex.match(string)
+
+        for date_string, expected in [("令和０５年03月07日", parser._strptime("令和05年03月07日", "%-K%-y年%m月%d日")),
+                                      ("令和05年03月07日です", parser.ParseFailure.UNCONVERTED_DATA),
+                                      ("令和05年", parser.ParseFailure.NO_MATCH)]:
+            self.assertEqual(parser._try_strptime(CountingRegex(), locale_time, date_string, fast_path), expected)
+        self.assertEqual(matched, [])
+        self.assertIsNone(parser._get_fast_path("%-K%-y年%m月%d日(%-a)"))
+        self.assertIsNone(parser._get_fast_path("%Y-%m-%dT%H:%M:%S.%f%z"))
+        self.assertRaises(ValueError, parser._get_fast_path, "%-K%Q")
+
+    def test_tables(self):
+        self.assertEqual(parser._fast_path_table("-n")["三十一"], 31)
+        self.assertEqual(parser._fast_path_table("-n")["元"], 1)
+        self.assertEqual(parser._fast_path_table("-d")["二十九"], 29)
+        self.assertNotIn("三十二", parser._fast_path_table("-d"))
+        self.assertEqual(parser._fast_path_table("y")["68"], 2068)
+        self.assertEqual(len(parser._fast_path_table("Y")), 10000)
+
+
+class TestNormalizeDateString(unittest.TestCase):
+    def test_normalize(self):
+        self.assertEqual(parser.normalize_date_string("令和５年３月７日"), "令和5年3月7日")
+        self.assertEqual(parser.normalize_date_string("Ｈ３１．０４．３０　１２：００"), "H31.04.30 12:00")
+        self.assertEqual(parser.normalize_date_string("㍾㍽㍼㍻㋿"), "明治大正昭和平成令和")
+        self.assertEqual(parser.normalize_date_string("二〇二三年〇三月一一日"), "2023年03月11日")
+        self.assertEqual(parser.normalize_date_string("令和〇五年"), "令和05年")
+
+    def test_unchanged(self):
+        for date_string in ["令和元年五月一日", "昭和二十五年十二月二十四日", "100％", "2023-03-07"]:
+            self.assertEqual(parser.normalize_date_string(date_string), date_string)
+        self.assertRaises(TypeError, parser.normalize_date_string, b"R05.03.07")
+
+    def test_strptime(self):
+        format = parser._normalize_format("%-K%-y年%m月%d日")
+        for date_string in ["令和５年３月７日", "令和〇五年〇三月〇七日", "㋿5年3月7日"]:
+            self.assertEqual(parser._strptime(parser.normalize_date_string(date_string), format),
+                             parser._strptime("令和5年3月7日", format))
+
+
+class TestStrPTimeBytes(unittest.TestCase):
+    def test_same_as_strptime(self):
+        cases = [("令和05年03月07日", "%-K%-y年%m月%d日"),
+                 ("平成三十一年四月三十日(火) 12:00", "%-K%-n年%-m月%-d日(%-a) %H:%M"),
+                 ("宝暦(Houreki, Horeki, H)", "%-K(%-E, %-e, %-h)"),
+                 ("二千百四十六", "%-N"),
+                 ("令和０５年03月07日", "%-K%-y年%m月%d日"),  # full-width digits match \d
+                 ("令和05年　03月", "%-K%-y年 %m月"),  # ideographic space matches \s
+                 ("2020-10-23(Sun) 11:30:42.345678:+0900", "%Y-%m-%d(%a) %H:%M:%S.%f:%z")]
+        for encoding in ("utf-8", "cp932", "shift_jis", "euc_jp"):
+            for date_string, format in cases:
+                data = date_string.encode(encoding)
+                self.assertEqual(parser._strptime_bytes(data, format, encoding),
+                                 parser._strptime(date_string, format))
+                self.assertEqual(parser._strptime_bytes(memoryview(b"xx" + data)[2:], format, encoding),
+                                 parser._strptime(date_string, format))
+
+    def test_error(self):
+        self.assertRaises(ValueError, parser._strptime_bytes, "玲和".encode(), "%-K")
+        self.assertRaises(ValueError, parser._strptime_bytes, "令和元年".encode(), "%-K")
+        self.assertRaises(ValueError, parser._strptime_bytes, "令和".encode("utf-16"), "%-K", "utf-16")
+        self.assertRaises(TypeError, parser._strptime_bytes, "令和".encode(), b"%-K")
+
+    def test_case_of_trail_bytes(self):
+        # trail bytes of 年 and 馬 in CP932 differ only in case of ASCII, b'\x94N' and b'\x94n'
+        self.assertRaises(ValueError, parser._strptime_bytes, "令和05馬03月07日".encode("cp932"), "%-K%-y年%m月%d日",
+                          "cp932")
+        self.assertEqual(parser._strptime_bytes(b"HEISEI 01 jan", "%-E %-y %b"),
+                         parser._strptime("HEISEI 01 jan", "%-E %-y %b"))
+
+
+class TestAdversarialInput(unittest.TestCase):
+    def tearDown(self):
+        parser.set_max_input_length()
+
+    def test_max_input_length(self):
+        self.assertEqual(parser.get_max_input_length(), parser.DEFAULT_MAX_INPUT_LENGTH)
+        format_regex, locale_time = parser._compile_format("%-K%-y年")
+        long_string = "令和05年" + " " * parser.DEFAULT_MAX_INPUT_LENGTH
+        self.assertRaises(ValueError, parser._strptime, long_string, "%-K%-y年")
+        self.assertRaises(ValueError, parser._strptime_bytes, long_string.encode(), "%-K%-y年")
+        self.assertIs(parser._try_strptime(format_regex, locale_time, long_string), parser.ParseFailure.TOO_LONG)
+
+        parser.set_max_input_length(5)
+        self.assertEqual(parser.get_max_input_length(), 5)
+        self.assertEqual(parser._strptime("令和05年", "%-K%-y年")[0][-1], 5)
+        # bytes are counted, not characters
+        self.assertRaises(ValueError, parser._strptime_bytes, "令和05年".encode(), "%-K%-y年")
+
+        parser.set_max_input_length(None)
+        self.assertIsNone(parser.get_max_input_length())
+        self.assertIs(parser._try_strptime(format_regex, locale_time, long_string),
+                      parser.ParseFailure.UNCONVERTED_DATA)
+
+        self.assertRaises(ValueError, parser.set_max_input_length, 0)
+
+    def test_latency(self):
+        parser.set_max_input_length(None)
+        length = 8192
+        adversarial = [" " * length, " " * length + "x", "\u3000 " * (length // 2), "9" * length,
+                       "十" * length, "千百十" * (length // 3), "一二" * (length // 2), "一千" * (length // 2),
+                       "令和" * (length // 2), "Heisei" * (length // 6), "H" * length,
+                       "9 " * (length // 2), "+09:" * (length // 4)]
+        # whitespace ahead of each, so the leading whitespace of formats is matched before the directive
+        adversarial += [" " * (length // 2) + data_string[:length // 2] for data_string in adversarial]
+        for directive in parser._JAPANERA_TimeRE_cache:
+            for format in ("%" + directive, "%" + directive + " x", " %" + directive + " x"):
+                format_regex, locale_time = parser._compile_format(format)
+                for data_string in adversarial:
+                    start = time.perf_counter()
+                    parser._try_strptime(format_regex, locale_time, data_string)
+                    elapsed = time.perf_counter() - start
+                    self.assertLess(elapsed, 0.1, (format, data_string[:12]))
+
+
 class TestFindClosestLeapYear(unittest.TestCase):
     def test(self):
         self.assertEqual(parser.find_closest_leap_year(2000), 2000)
@@ -151,6 +326,45 @@ class TestFindErasWithYear(unittest.TestCase):
                             })
 
 
+class TestFindErasWithName(unittest.TestCase):
+    def test_spellings(self):
+        showa = {ERA_DATA_GENERAL[-3]}
+        for name in ("昭和", "Shouwa", "Showa", "Shōwa", "SHOWA", "showa", "ＳＨＯＷＡ", "㍼"):
+            self.assertSetEqual(parser.find_eras_with_name(name), showa)
+        self.assertIn(ERA_DATA_GENERAL[-3], parser.find_eras_with_name("S"))
+        self.assertSetEqual(parser.find_eras_with_name("Taishō"), {ERA_DATA_GENERAL[-4]})
+        self.assertSetEqual(parser.find_eras_with_name("Jōō"), parser.find_eras_with_name("Joo"))
+        self.assertSetEqual(parser.find_eras_with_name("Nonexistent"), set())
+
+    def test_frozen(self):
+        sizes = [len(index) for index in (parser._era_kanji_dict, parser._era_alphabet_dict,
+                                          parser._era_alphabet_vowel_shortened_dict, parser._era_alphabet_head_dict,
+                                          parser._era_name_index)]
+        for name in ("nonexistent", "ｎｏｎｅｘｉｓｔｅｎｔ", "存在しない元号"):
+            parser.find_eras_with_name(name)
+            self.assertRaises(ValueError, parser.find_era_and_date, era_kanji=name, era_english=name)
+        self.assertEqual(sizes, [len(index) for index in (parser._era_kanji_dict, parser._era_alphabet_dict,
+                                                          parser._era_alphabet_vowel_shortened_dict,
+                                                          parser._era_alphabet_head_dict, parser._era_name_index)])
+        with self.assertRaises(TypeError):
+            parser._era_kanji_dict["nonexistent"] = frozenset()
+
+
+class TestFindErasWithOrdinal(unittest.TestCase):
+    def test_same_as_find_era_and_date(self):
+        for ordinal in range(date(1320, 1, 1).toordinal(), date(1400, 1, 1).toordinal()):
+            dt = date.fromordinal(ordinal)
+            self.assertTupleEqual(parser.find_eras_with_ordinal(ordinal),
+                                  tuple(era for era, _ in parser.find_era_and_date(absolute_year=dt.year,
+                                                                                   month=dt.month, day=dt.day)))
+
+    def test_boundary(self):
+        self.assertTupleEqual(parser.find_eras_with_ordinal(1), tuple(ERA_DATA_COMMON))
+        self.assertEqual(parser.find_eras_with_ordinal(date(2019, 4, 30).toordinal())[-1], ERA_DATA_GENERAL[-2])
+        self.assertEqual(parser.find_eras_with_ordinal(date(2019, 5, 1).toordinal())[-1], ERA_DATA_GENERAL[-1])
+        self.assertEqual(parser.find_eras_with_ordinal(date.max.toordinal())[-1], ERA_DATA_GENERAL[-1])
+
+
 class TestFindEraAndDate(unittest.TestCase):
     def test_only_kanji(self):
         self.assertListEqual(parser.find_era_and_date(era_kanji="令和"),
@@ -327,5 +541,31 @@ class TestFindEraAndDate(unittest.TestCase):
                              ])
 
 
+class TestIterEraAndDate(unittest.TestCase):
+    def test_same_as_find_era_and_date(self):
+        self.assertListEqual(list(parser.iter_era_and_date(absolute_year=1225)),
+                             parser.find_era_and_date(absolute_year=1225))
+        self.assertListEqual(list(parser.iter_era_and_date(era_head_english="K", relative_year=3, month=2, day=29)),
+                             parser.find_era_and_date(era_head_english="K", relative_year=3, month=2, day=29))
+
+    def test_lazy(self):
+        candidates = parser.iter_era_and_date(relative_year=1)
+        self.assertEqual(next(candidates), (ERA_DATA_COMMON[0], date(1, 1, 1)))
+        self.assertRaises(ValueError, next, parser.iter_era_and_date(era_kanji="無効"))
+
+    def test_prefer(self):
+        self.assertListEqual([e.kanji for e, _ in parser.find_era_and_date(absolute_year=1225, prefer="latest")],
+                             ["嘉禄", "元仁", "貞応", "西暦"])
+        self.assertListEqual([e.era_type for e, _ in parser.find_era_and_date(absolute_year=1340,
+                                                                               prefer=era_data.EraType.JIMYOUIN)],
+                             [era_data.EraType.JIMYOUIN,
+                              era_data.EraType.COMMON, era_data.EraType.DAIKAKUJI, era_data.EraType.DAIKAKUJI])
+        self.assertListEqual([e.era_type for e, _ in parser.find_era_and_date(
+            absolute_year=1340, prefer=[era_data.EraType.DAIKAKUJI, era_data.EraType.JIMYOUIN])],
+                             [era_data.EraType.DAIKAKUJI, era_data.EraType.DAIKAKUJI,
+                              era_data.EraType.JIMYOUIN, era_data.EraType.COMMON])
+        self.assertRaises(ValueError, parser.find_era_and_date, absolute_year=1225, prefer="unknown")
+
+
 if __name__ == '__main__':
     unittest.main()
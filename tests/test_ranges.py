@@ -0,0 +1,66 @@
+import unittest
+from datetime import date, timedelta
+
+from japanera import ERA_DATA_GENERAL, EraType, wareki_range_bounds
+
+
+class TestWarekiRangeBounds(unittest.TestCase):
+    def test_era(self):
+        self.assertEqual(wareki_range_bounds("昭和"), (date(1926, 12, 25), date(1989, 1, 8)))
+        self.assertEqual(wareki_range_bounds("Showa"), (date(1926, 12, 25), date(1989, 1, 8)))
+        self.assertEqual(wareki_range_bounds("令和"), (date(2019, 5, 1), None))
+        # 天元 ends with a kanji numeral, but is an era name as a whole
+        self.assertEqual(wareki_range_bounds("天元"), (date(979, 1, 5), date(983, 6, 3)))
+
+    def test_era_year(self):
+        self.assertEqual(wareki_range_bounds("平成10年"), (date(1998, 1, 1), date(1999, 1, 1)))
+        self.assertEqual(wareki_range_bounds("平成31年"), (date(2019, 1, 1), date(2019, 5, 1)))
+        self.assertEqual(wareki_range_bounds("令和元年"), (date(2019, 5, 1), date(2020, 1, 1)))
+        self.assertEqual(wareki_range_bounds("昭和64年"), (date(1989, 1, 1), date(1989, 1, 8)))
+        self.assertEqual(wareki_range_bounds("元禄元年"), (date(1688, 10, 23), date(1689, 1, 1)))
+        self.assertEqual(wareki_range_bounds("平成十年"), (date(1998, 1, 1), date(1999, 1, 1)))
+        self.assertEqual(wareki_range_bounds("平成２０年"), (date(2008, 1, 1), date(2009, 1, 1)))
+        self.assertEqual(wareki_range_bounds("㍻二〇年"), (date(2008, 1, 1), date(2009, 1, 1)))
+        self.assertEqual(wareki_range_bounds("Heisei 10"), (date(1998, 1, 1), date(1999, 1, 1)))
+        self.assertEqual(wareki_range_bounds("西暦2020年"), (date(2020, 1, 1), date(2021, 1, 1)))
+
+    def test_range(self):
+        self.assertEqual(wareki_range_bounds("平成10年〜令和2年"), (date(1998, 1, 1), date(2021, 1, 1)))
+        self.assertEqual(wareki_range_bounds("平成10年～令和2年"), (date(1998, 1, 1), date(2021, 1, 1)))
+        self.assertEqual(wareki_range_bounds("平成十年から令和二年まで"), (date(1998, 1, 1), date(2021, 1, 1)))
+        self.assertEqual(wareki_range_bounds("Heisei 10 - Reiwa 2"), (date(1998, 1, 1), date(2021, 1, 1)))
+        self.assertEqual(wareki_range_bounds("昭和〜平成"), (date(1926, 12, 25), date(2019, 5, 1)))
+        self.assertEqual(wareki_range_bounds("平成10年〜20年"), (date(1998, 1, 1), date(2009, 1, 1)))
+        self.assertEqual(wareki_range_bounds("平成10年〜"), (date(1998, 1, 1), None))
+        self.assertEqual(wareki_range_bounds("〜平成10年"), (None, date(1999, 1, 1)))
+        self.assertEqual(wareki_range_bounds("令和2年まで"), (None, date(2021, 1, 1)))
+        self.assertEqual(wareki_range_bounds("平成10年から"), (date(1998, 1, 1), None))
+
+    def test_prefer(self):
+        self.assertRaises(ValueError, wareki_range_bounds, "S50")
+        self.assertEqual(wareki_range_bounds("S50", prefer="latest"), (date(1975, 1, 1), date(1976, 1, 1)))
+        self.assertEqual(wareki_range_bounds("H10〜20", prefer="latest"), (date(1998, 1, 1), date(2009, 1, 1)))
+        self.assertRaises(ValueError, wareki_range_bounds, "建武")
+        self.assertEqual(wareki_range_bounds("建武", prefer=EraType.DAIKAKUJI), (date(1334, 3, 13), date(1336, 4, 19)))
+
+    def test_error(self):
+        for expression in ["令和2年〜平成10年", "平成32年", "昭和0年", "平成十十年", "〜", "", "Nonexistent", "〜20年"]:
+            with self.subTest(expression=expression):
+                self.assertRaises(ValueError, wareki_range_bounds, expression)
+
+    def test_same_as_era(self):
+        for era in ERA_DATA_GENERAL[-30:]:
+            until = era.until or date(2100, 1, 1)
+            for year in range(era.since.year, until.year + 1):
+                days = [day for day in (date(year, 1, 1) + timedelta(days) for days in range(366))
+                        if day.year == year and day in era]
+                if not days:
+                    continue
+                expression = "{}{}年".format(era.kanji, year - era.since.year + 1)
+                with self.subTest(expression=expression):
+                    self.assertEqual(wareki_range_bounds(expression, prefer=EraType.GENERAL),
+                                     (days[0], days[-1] + timedelta(1)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import re
+import unittest
+from datetime import date, datetime
+
+from japanera import Resolver, EraDate, EraDateTime, EraType, ERA_DATA_COMMON, ERA_DATA_GENERAL
+from japanera.parser import find_eras_with_ordinal, find_eras_with_year
+
+
+class TestResolver(unittest.TestCase):
+    def setUp(self):
+        self.resolver = Resolver({EraType.GENERAL, EraType.COMMON})
+
+    def test_from_date(self):
+        for ordinal in range(date(1300, 1, 1).toordinal(), date(1450, 1, 1).toordinal(), 7):
+            day = date.fromordinal(ordinal)
+            eras = [era for era in find_eras_with_ordinal(ordinal) if era.era_type in self.resolver.era_types]
+            self.assertEqual(self.resolver.list_from_date(day), [EraDate(day.year, day.month, day.day, era)
+                                                                 for era in eras])
+            self.assertEqual(self.resolver.from_date(day).era, eras[-1])
+        self.assertEqual(self.resolver.from_date(date(1340, 1, 1)).era, ERA_DATA_COMMON[0])
+        self.assertEqual(self.resolver.from_ordinal(date(2019, 5, 1).toordinal()), EraDate(2019, 5, 1))
+        self.assertEqual(self.resolver.from_datetime(datetime(2019, 4, 30, 12)), EraDateTime(2019, 4, 30, 12))
+        self.assertRaises(ValueError, Resolver({EraType.GENERAL}).from_date, date(1340, 1, 1))
+
+    def test_find_eras_with_year(self):
+        for year in (600, 1336, 1392, 2019):
+            self.assertEqual(self.resolver.find_eras_with_year(year),
+                             {era for era in find_eras_with_year(year) if era.era_type in self.resolver.era_types})
+
+    def test_find_eras_with_name(self):
+        self.assertSetEqual(self.resolver.find_eras_with_name("Shōwa"), {ERA_DATA_GENERAL[-3]})
+        self.assertSetEqual(self.resolver.find_eras_with_name("Ryakuou"), set())  # JIMYOUIN
+        self.assertEqual(len(Resolver({EraType.JIMYOUIN}).find_eras_with_name("Ryakuo")), 1)
+
+    def test_strptime(self):
+        format = "%-K%-y年%m月%d日"
+        self.assertEqual(self.resolver.strptime("令和05年03月07日", format), EraDate.strptime("令和05年03月07日", format))
+        self.assertRaises(ValueError, self.resolver.strptime, "暦応03年03月07日", format)  # JIMYOUIN
+        self.assertIsNone(re.fullmatch(self.resolver._time_re["-K"], "暦応"))
+        self.assertEqual(self.resolver.strptime("1340-01-01", "%Y-%m-%d"),
+                         [EraDate(1340, 1, 1, ERA_DATA_COMMON[0])])
+        self.assertEqual(self.resolver.strptime_datetime("R01.05.01 10:00", "%-h%-y.%m.%d %H:%M", prefer="latest"),
+                         [EraDateTime(2019, 5, 1, 10, era=ERA_DATA_GENERAL[-1])])
+        self.assertEqual(list(self.resolver.iter_strptime("2020-01-01", "%Y-%m-%d", prefer=EraType.GENERAL)),
+                         EraDate.strptime("2020-01-01", "%Y-%m-%d", prefer=EraType.GENERAL))
+
+    def test_strftime(self):
+        self.assertEqual(self.resolver.strftime(date(2019, 5, 1), "%-K%-n年%-m月%-d日"), "令和元年五月一日")
+        self.assertEqual(self.resolver.strftime(datetime(1340, 1, 1, 12), "%-K%-Y年 %H時"), "西暦1340年 12時")
+
+    def test_error(self):
+        self.assertRaises(ValueError, Resolver, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
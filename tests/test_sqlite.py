@@ -0,0 +1,84 @@
+import sqlite3
+import unittest
+from datetime import date, datetime, timezone
+
+from japanera import (EraDate, EraDateTime, ERA_DATA_COMMON, ERA_DATA_GENERAL, ERA_DATA_DAIKAKUJI,
+                      ERA_DATA_JIMYOUIN)
+from japanera.parser import _set_era_data
+from japanera.sqlite import register_adapters, register_functions
+
+
+class TestAdapters(unittest.TestCase):
+    def setUp(self):
+        register_adapters()
+        self.connection = sqlite3.connect(":memory:", detect_types=sqlite3.PARSE_DECLTYPES)
+        self.connection.execute("CREATE TABLE t (d ERADATE, dt ERADATETIME)")
+
+    def tearDown(self):
+        self.connection.close()
+
+    def test_round_trip(self):
+        rows = [(era_date, EraDateTime.from_datetime(datetime(1340, 5, 1, 12, 34, 56, 789), era=era_date.era))
+                for era_date in EraDate.list_from_date(date(1340, 5, 1))]
+        rows.append((EraDate(2019, 5, 1), EraDateTime(2019, 4, 30, 23, 59, 59, 999999)))
+        self.connection.executemany("INSERT INTO t VALUES (?, ?)", rows)
+        stored = self.connection.execute("SELECT d, dt FROM t").fetchall()
+        self.assertListEqual(stored, rows)
+        self.assertEqual(stored[-1][1].era, ERA_DATA_GENERAL[-2])
+        self.assertEqual(self.connection.execute("SELECT typeof(d), typeof(dt) FROM t").fetchone(),
+                         ("integer", "integer"))
+
+    def test_invalid(self):
+        with self.assertWarns(RuntimeWarning):
+            out_of_era = EraDate(2019, 5, 1, era=ERA_DATA_GENERAL[-2])
+        with self.assertRaises(ValueError):
+            self.connection.execute("INSERT INTO t VALUES (?, NULL)", (out_of_era,))
+        with self.assertRaises(ValueError):
+            self.connection.execute("INSERT INTO t VALUES (NULL, ?)",
+                                    (EraDateTime(2019, 5, 1, tzinfo=timezone.utc),))
+
+
+class TestFunctions(unittest.TestCase):
+    def setUp(self):
+        register_adapters()
+        self.connection = sqlite3.connect(":memory:")
+        register_functions(self.connection)
+        self.connection.execute("CREATE TABLE sales (sold_on TEXT)")
+        self.connection.executemany("INSERT INTO sales VALUES (?)",
+                                    [("2019-04-30",), ("2019-05-01",), ("2019-05-02 10:00:00",), ("2023-03-07",),
+                                     (None,), ("junk",)])
+
+    def tearDown(self):
+        self.connection.close()
+
+    def test_group_by(self):
+        rows = self.connection.execute("SELECT wareki_era(sold_on), wareki_year(sold_on), count(*) FROM sales "
+                                       "GROUP BY 1, 2 ORDER BY 1, 2").fetchall()
+        self.assertListEqual(rows, [(None, None, 2), ("令和", 1, 2), ("令和", 5, 1), ("平成", 31, 1)])
+
+    def test_format(self):
+        self.assertListEqual(
+            [row[0] for row in self.connection.execute("SELECT wareki_format(sold_on, '%-K%-n年%-m月%-d日') FROM sales")],
+            ["平成三十一年四月三十日", "令和元年五月一日", "令和元年五月二日", "令和五年三月七日", None, None])
+        self.assertEqual(self.connection.execute("SELECT wareki_format('2019-05-02 10:00:00', '%H時')").fetchone(),
+                         ("10時",))
+
+    def test_cleared_when_era_data_is_set(self):
+        query = "SELECT wareki_era('2023-03-07'), wareki_format('2023-03-07', '%-K')"
+        self.assertEqual(self.connection.execute(query).fetchone(), ("令和", "令和"))
+        try:
+            _set_era_data(ERA_DATA_COMMON, ERA_DATA_GENERAL[:-1], ERA_DATA_DAIKAKUJI, ERA_DATA_JIMYOUIN)
+            self.assertEqual(self.connection.execute(query).fetchone(), ("西暦", "西暦"))
+        finally:
+            _set_era_data(ERA_DATA_COMMON, ERA_DATA_GENERAL, ERA_DATA_DAIKAKUJI, ERA_DATA_JIMYOUIN)
+        self.assertEqual(self.connection.execute(query).fetchone(), ("令和", "令和"))
+
+    def test_stored_integer(self):
+        self.connection.execute("CREATE TABLE t (d ERADATE)")
+        self.connection.execute("INSERT INTO t VALUES (?)", (EraDate(2019, 4, 30),))
+        self.assertEqual(self.connection.execute("SELECT wareki_format(d, '%-K%-y年%m月%d日') FROM t").fetchone(),
+                         ("平成31年04月30日",))
+
+
+if __name__ == '__main__':
+    unittest.main()